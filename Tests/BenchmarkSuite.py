@@ -0,0 +1,218 @@
+"""
+A self contained, reproducible benchmark suite (replacing TimeTests.py and NxTimeTests.py, which timed a single run
+of graphs loaded from json files not included in the repository).
+1. the graphs are generated with a fixed seed (see Generators.py): circle, random, grid and power law graphs of
+   10 .. 1,000,000 nodes.
+2. each case runs warmup times untimed, then repeat times timed, and is reported by the median, 90th percentile,
+   min and max of the runs. the shortest path cases time a fixed (seeded) set of pairs per run.
+3. with --memory the peak memory of each case (and the memory held by each graph) is measured with tracemalloc, in a
+   separate run since tracing slows the code down.
+4. with --output the results are written as JSON, and --compare reports the ratio of each median to the one of a
+   previous JSON output, failing (exit code 1) if a case got slower than --threshold times.
+5. with --networkx the same cases are run on NetworkX too (if it is installed).
+usage (from the repository's root): python -m Tests.BenchmarkSuite --sizes 1000 10000 --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from src.GraphAlgo import GraphAlgo
+from Tests.Generators import GENERATORS
+
+SIZES = [10, 100, 1000, 10000, 100000]
+PAIRS = 20
+
+
+def _pairs(g, count: int = PAIRS, seed: int = 1) -> list:
+    rnd = random.Random(seed)
+    keys = list(g.get_all_v())
+    return [(rnd.choice(keys), rnd.choice(keys)) for _ in range(count)]
+
+
+def our_cases(g, tmp_dir: str, cases=None) -> dict:
+    """
+    Returns {case name: a function running the case once} for the graph g on this project's implementation.
+    """
+    ga = GraphAlgo(g, cache_size=0)
+    pairs = _pairs(g)
+    first = next(iter(g.get_all_v()))
+    file_name = os.path.join(tmp_dir, "graph.json")
+    loader = GraphAlgo()
+    if not cases or "load_from_json" in cases:
+        ga.save_to_json(file_name)
+    return {
+        "shortest_path": lambda: [ga.shortest_path(a, b) for a, b in pairs],
+        "shortest_path_bidirectional": lambda: [ga.shortest_path(a, b, method="bidirectional") for a, b in pairs],
+        "connected_components": ga.connected_components,
+        "connected_component": lambda: ga.connected_component(first),
+        "save_to_json": lambda: ga.save_to_json(file_name),
+        "load_from_json": lambda: loader.load_from_json(file_name),
+    }
+
+
+def networkx_cases(g) -> dict:
+    """
+    Returns the cases which NetworkX supports, run on a NetworkX copy of g, or {} if NetworkX is not installed.
+    """
+    try:
+        import networkx as nx
+    except ImportError:
+        return {}
+    gnx = nx.DiGraph()
+    gnx.add_nodes_from(g.get_all_v())
+    gnx.add_weighted_edges_from((e["src"], e["dest"], e["w"]) for e in g.edges)
+    pairs = _pairs(g)
+
+    def shortest_path(search):
+        ans = []
+        for a, b in pairs:
+            try:
+                ans.append(search(gnx, a, b))
+            except nx.NetworkXNoPath:
+                ans.append(None)
+        return ans
+
+    return {
+        "shortest_path": lambda: shortest_path(nx.single_source_dijkstra),
+        "shortest_path_bidirectional": lambda: shortest_path(nx.bidirectional_dijkstra),
+        "connected_components": lambda: list(nx.strongly_connected_components(gnx)),
+    }
+
+
+def measure(func, repeat: int, warmup: int) -> dict:
+    """
+    Runs func warmup times, then repeat times timed.
+    @return: {"median", "p90", "min", "max", "runs"} of the timed runs, in seconds
+    """
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    p90 = statistics.quantiles(times, n=10, method="inclusive")[-1] if len(times) > 1 else times[0]
+    return {"median": statistics.median(times), "p90": p90, "min": min(times), "max": max(times), "runs": repeat}
+
+
+def peak_memory(func) -> int:
+    """
+    Returns the peak memory (in bytes) allocated while func runs once.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def graph_memory(generate, v: int):
+    """
+    Generates a graph under tracemalloc, returning the graph and the memory it holds (in bytes).
+    """
+    tracemalloc.start()
+    try:
+        g = generate(v)
+        return g, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, generators, cases=None, repeat: int = 5, warmup: int = 1, memory: bool = False,
+        networkx: bool = False, out=sys.stdout) -> list:
+    """
+    Runs the benchmarks and prints a line per result.
+    @return: The list of the results, one dict per (generator, size, implementation, case)
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in generators:
+            for v in sizes:
+                start = time.perf_counter()
+                if memory:
+                    g, held = graph_memory(GENERATORS[name], v)
+                else:
+                    g, held = GENERATORS[name](v), None
+                generated = time.perf_counter() - start
+                print(f"{name} |V| = {g.v_size()}, |E| = {g.e_size()} (generated in {generated:.3f}s"
+                      + (f", {held / max(1, g.e_size()):.0f} bytes/edge)" if held is not None else ")"), file=out)
+                impls = [("ours", our_cases(g, tmp_dir, cases))]
+                if networkx:
+                    impls.append(("networkx", networkx_cases(g)))
+                    if not impls[-1][1]:
+                        print("    networkx is not installed, skipped", file=out)
+                for impl, funcs in impls:
+                    for case, func in funcs.items():
+                        if cases and case not in cases:
+                            continue
+                        result = {"generator": name, "nodes": g.v_size(), "edges": g.e_size(), "impl": impl,
+                                  "case": case}
+                        result.update(measure(func, repeat, warmup))
+                        if memory:
+                            result["peak_memory"] = peak_memory(func)
+                            result["graph_memory"] = held
+                        results.append(result)
+                        print(f"    {impl:8} {case:28} median = {result['median']:.6f}  p90 = {result['p90']:.6f}"
+                              + (f"  peak = {result['peak_memory'] / 2 ** 20:.1f}MB" if memory else ""), file=out)
+                del g
+    return results
+
+
+def compare(results: list, baseline: list, threshold: float, out=sys.stdout) -> bool:
+    """
+    Prints the ratio of each median to the median of the same result in baseline.
+    @return: True if no case is slower than threshold times its baseline
+    """
+    key = lambda r: (r["generator"], r["nodes"], r["impl"], r["case"])
+    old = {key(r): r for r in baseline}
+    ok = True
+    for r in results:
+        b = old.get(key(r))
+        if b is None or b["median"] <= 0:
+            continue
+        ratio = r["median"] / b["median"]
+        slower = ratio > threshold
+        ok = ok and not slower
+        print(f"{r['generator']} {r['nodes']} {r['impl']} {r['case']}: {ratio:.2f}x" + (" SLOWER" if slower else ""),
+              file=out)
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Graph benchmarks on seeded synthetic graphs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="numbers of nodes (up to 1000000)")
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--cases", nargs="+", help="run only these cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--memory", action="store_true", help="measure the peak memory of each case")
+    parser.add_argument("--networkx", action="store_true", help="run the same cases on NetworkX too")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="a JSON file written by --output, to compare the results with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="the slowdown ratio --compare fails on")
+    args = parser.parse_args(argv)
+    results = run(args.sizes, args.generators, args.cases, args.repeat, args.warmup, args.memory, args.networkx)
+    if args.output:
+        meta = {"date": datetime.now(timezone.utc).isoformat(), "python": platform.python_version(),
+                "platform": platform.platform(), "cpus": os.cpu_count(), "args": vars(args)}
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=4)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if not compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
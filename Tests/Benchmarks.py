@@ -0,0 +1,705 @@
+"""
+Benchmarks comparing the current implementations against the previous ones, on synthetic graphs of the same sizes as
+the Circle graphs of the original TimeTests (|V| = 10 .. 30,000, 8 out edges per node).
+the graphs are generated with a fixed seed (see Generators.py) so every run works on the same input.
+for repeated, statistically summarized runs with JSON output see BenchmarkSuite.py.
+"""
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from math import inf
+
+from src.Center import center_point
+from src.DFS import depth_first_search
+from src.DiGraph import DiGraph
+from src.Dijkstra import dijkstra, bidirectional_dijkstra, astar, position_heuristic, safe_scale
+from src.GraphAlgo import GraphAlgo
+from src.GraphPlot import plot
+from src.Instrumentation import Profiler
+from src.SCCIndex import SCCIndex
+from Tests.Generators import circle_graph, grid_graph, blocks_graph
+
+SIZES = [10, 100, 1000, 10000, 20000, 30000]
+
+
+def legacy_shortest_path(g: DiGraph, id1: int, id2: int) -> (float, list):
+    """
+    The previous shortest path implementation - a FIFO list queue (label correcting), kept for comparison.
+    """
+    if id1 not in g.nodes or id2 not in g.nodes:
+        return inf, []
+    if id1 == id2:
+        return 0, [id1]
+    dists = {id1: 0}
+    parents = {}
+    q = [g.nodes.get(id1), ]
+    while len(q) > 0:
+        n = q.pop(0)
+        for i in g.all_out_edges_of_node(n.key):
+            curr_dist = dists[n.key] + n.get_edge(i)
+            if i not in dists or curr_dist < dists[i]:
+                dists[i] = curr_dist
+                parents[i] = n.key
+                q.append(g.nodes[i])
+    if id2 not in dists:
+        return inf, []
+    path = []
+    itr = id2
+    while itr != id1:
+        path.insert(0, itr)
+        itr = parents[itr]
+    path.insert(0, id1)
+    return dists[id2], path
+
+
+def write_json(g: DiGraph, file_name: str) -> None:
+    """
+    Writes g in the JSON format of the Circle graph files (each edge once, indent=4).
+    """
+    saved = {"Edges": list(g.edges),
+             "Nodes": [{"pos": ",".join(map(str, n.pos)), "id": n.key} for n in g.get_all_v().values()]}
+    with open(file_name, "w") as f:
+        json.dump(saved, indent=4, fp=f)
+
+
+def legacy_load_from_json(file_name: str) -> DiGraph:
+    """
+    The previous loader - json.load of the whole document, then add_node and add_edge one by one.
+    """
+    new_graph = DiGraph()
+    with open(file_name, "r") as f:
+        loaded = json.load(f)
+        for i in loaded.get("Nodes"):
+            post = None
+            if i.get("pos") is not None:
+                pos = i.get("pos").split(sep=",")
+                post = (float(pos[0]), float(pos[1]), float(pos[2]))
+            new_graph.add_node(i.get("id"), post)
+        for i in loaded.get("Edges"):
+            new_graph.add_edge(i.get("src"), i.get("dest"), i.get("w"))
+    return new_graph
+
+
+def legacy_save_to_json(g: DiGraph, file_name: str) -> None:
+    """
+    The previous writer - builds the whole document (each edge twice, from its src and dest) and dumps it.
+    """
+    saved = {"Edges": [], "Nodes": []}
+    for i in g.nodes.values():
+        key = i.key
+        saved["Nodes"].append({"pos": ",".join(map(str, i.pos)), "id": key})
+        for src, w in g.all_in_edges_of_node(key).items():
+            saved["Edges"].append({"src": src, "w": w, "dest": key})
+        for dest, w in g.all_out_edges_of_node(key).items():
+            saved["Edges"].append({"src": key, "w": w, "dest": dest})
+    with open(file_name, "w") as f:
+        json.dump(saved, indent=4, fp=f)
+
+
+def measure(func) -> (float, float):
+    """
+    Runs func twice - once for its time, once (traced) for its peak memory.
+    @return: (seconds, peak MB)
+    """
+    start = time.perf_counter()
+    func()
+    end = time.perf_counter()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return end - start, peak / 2 ** 20
+
+
+def bench_load():
+    print("Load from JSON (seconds / peak MB):")
+    with tempfile.TemporaryDirectory() as d:
+        for v in SIZES:
+            file_name = os.path.join(d, f"G_{v}.json")
+            write_json(circle_graph(v), file_name)
+            old_t, old_m = measure(lambda: legacy_load_from_json(file_name))
+            new_t, new_m = measure(lambda: GraphAlgo().load_from_json(file_name))
+            print(f"|V| = {v}: legacy = {old_t:.4f}s / {old_m:.1f}MB, streaming = {new_t:.4f}s / {new_m:.1f}MB")
+    print()
+
+
+def bench_save():
+    print("Save to JSON (seconds / peak MB / file MB):")
+    with tempfile.TemporaryDirectory() as d:
+        file_name = os.path.join(d, "G.json")
+        for v in SIZES:
+            g = circle_graph(v)
+            ga = GraphAlgo(g)
+            results = []
+            for name, func in (("legacy", lambda: legacy_save_to_json(g, file_name)),
+                               ("streaming", lambda: ga.save_to_json(file_name)),
+                               ("compact", lambda: ga.save_to_json(file_name, compact=True))):
+                t, m = measure(func)
+                results.append(f"{name} = {t:.4f}s / {m:.1f}MB / {os.path.getsize(file_name) / 2 ** 20:.1f}MB")
+            print(f"|V| = {v}: " + ", ".join(results))
+    print()
+
+
+def bench_binary():
+    print("Load JSON vs binary vs memory mapped binary (seconds / file MB):")
+    with tempfile.TemporaryDirectory() as d:
+        json_name = os.path.join(d, "G.json")
+        bin_name = os.path.join(d, "G.bin")
+        for v in SIZES:
+            ga = GraphAlgo(circle_graph(v))
+            ga.save_to_json(json_name, compact=True)
+            ga.save_to_binary(bin_name)
+            results = []
+            for name, func in (("json", lambda: GraphAlgo().load_from_json(json_name)),
+                               ("binary", lambda: GraphAlgo().load_from_binary(bin_name)),
+                               ("mmap", lambda: GraphAlgo().load_from_binary(bin_name, frozen=True))):
+                start = time.perf_counter()
+                func()
+                results.append(f"{name} = {time.perf_counter() - start:.4f}s")
+            sizes = f"{os.path.getsize(json_name) / 2 ** 20:.1f}MB / {os.path.getsize(bin_name) / 2 ** 20:.1f}MB"
+            print(f"|V| = {v}: " + ", ".join(results) + f", files = {sizes}")
+    print()
+
+
+def legacy_connected_components(g: DiGraph) -> list:
+    """
+    The previous Tarjan DFS - rescans the out edges of a node each time it returns to the top of the stack.
+    """
+    low_link = {}
+    id_dict = {}
+    scc_set = set()
+    scc_list = []
+    itr = 0
+    for root in g.get_all_v():
+        if root in scc_set:
+            continue
+        scc = {}
+        s = [root, ]
+        while s:
+            n = s[-1]
+            flag = True
+            if n not in id_dict:
+                id_dict[n] = itr
+                low_link[n] = itr
+                scc[itr] = [n, ]
+                itr = itr + 1
+            for neighbor in g.all_out_edges_of_node(n):
+                if neighbor not in id_dict:
+                    flag = False
+                    s.append(neighbor)
+                    break
+            if flag:
+                min_link = low_link[n]
+                for neighbor in g.all_out_edges_of_node(n):
+                    if neighbor not in scc_set and low_link[n] > low_link[neighbor]:
+                        low_link[n] = low_link[neighbor]
+                curr = low_link[n]
+                if curr != id_dict[n]:
+                    scc.setdefault(curr, []).extend(scc[min_link])
+                    for key in scc[min_link]:
+                        low_link[key] = low_link[n]
+                else:
+                    scc_list.append(scc[low_link[n]])
+                    scc_set.update(scc[low_link[n]])
+                s.pop()
+    return scc_list
+
+
+def bench_connected_components():
+    print("Connected Components (legacy DFS vs single pass Tarjan):")
+    for v in SIZES:
+        g = circle_graph(v)
+        start = time.perf_counter()
+        legacy_connected_components(g)
+        mid = time.perf_counter()
+        GraphAlgo(g).connected_components()
+        end = time.perf_counter()
+        print(f"|V| = {v}, |E| = {g.e_size()}: legacy = {mid - start:.6f}, tarjan = {end - mid:.6f}")
+    print("Connected Components on a star (one hub of degree |V|-1, in both directions):")
+    for v in (1000, 3000, 5000):
+        g = DiGraph()
+        for i in range(v):
+            g.add_node(i)
+            g.add_edge(0, i, 1)
+            g.add_edge(i, 0, 1)
+        start = time.perf_counter()
+        legacy_connected_components(g)
+        mid = time.perf_counter()
+        GraphAlgo(g).connected_components()
+        end = time.perf_counter()
+        print(f"|V| = {v}, |E| = {g.e_size()}: legacy = {mid - start:.6f}, tarjan = {end - mid:.6f}")
+    print()
+
+
+def bench_connected_component():
+    print("Connected Component(0) (full Tarjan vs forward/backward search):")
+    for v in SIZES:
+        g = circle_graph(v)
+        for i in range(0, v, 2):
+            g.remove_edge(i, (i + 1) % v)
+        start = time.perf_counter()
+        low_link, ids, scc_set, scc_list = {}, {}, set(), []
+        depth_first_search(g, 0, low_link, ids, scc_list, scc_set, 0)
+        mid = time.perf_counter()
+        ga = GraphAlgo(g)
+        size = len(ga.connected_component(0))
+        end = time.perf_counter()
+        ga.connected_components()
+        ga.connected_component(1)
+        cached_start = time.perf_counter()
+        ga.connected_component(v - 1)
+        cached = time.perf_counter() - cached_start
+        print(f"|V| = {v}, |SCC(0)| = {size}: tarjan = {mid - start:.6f}, search = {end - mid:.6f}, "
+              f"from cached components = {cached:.6f}")
+    print()
+
+
+def bench_scc_index():
+    print("SCC after each batch of 10 mutations, 100 batches (recompute vs SCCIndex):")
+    for v in SIZES[2:]:
+        results = []
+        for incremental in (False, True):
+            rnd = random.Random(2)
+            g = blocks_graph(v)
+            start = time.perf_counter()
+            index = SCCIndex(g) if incremental else None
+            for _ in range(100):
+                for _ in range(10):
+                    i = rnd.randrange(v)
+                    if rnd.random() < 0.5:
+                        g.add_edge(i, min(v - 1, i + rnd.randrange(1, 50)), 1)
+                    else:
+                        g.remove_edge(i, i - 1)
+                if incremental:
+                    len(index)
+                else:
+                    len(GraphAlgo(g).connected_components())
+            results.append(time.perf_counter() - start)
+        print(f"|V| = {v}: recompute = {results[0]:.4f}, incremental = {results[1]:.4f}")
+    print()
+
+
+def bench_scc_index_growth():
+    print("Adding nodes under an SCCIndex (add_node / add_nodes vs building the index after, best of 3):")
+
+    def best_of(run) -> float:
+        times = []
+        for _ in range(3):
+            g = DiGraph()
+            start = time.perf_counter()
+            run(g)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    first = None
+    for v in (5000, 10000, 20000):
+        single = best_of(lambda g: (SCCIndex(g), [g.add_node(i) for i in range(v)]))
+        bulk = best_of(lambda g: (SCCIndex(g), g.add_nodes(range(v))))
+        build = best_of(lambda g: (g.add_nodes(range(v)), SCCIndex(g)))
+        adds = max(single, bulk)
+        if first is None:
+            first = (v, adds, build)
+        # O(1) adds cost about as much as one build, and grow with |V| like it (a scan per add grows 4 times faster)
+        print(f"|V| = {v}: add_node = {single:.4f}, add_nodes = {bulk:.4f}, build = {build:.4f}, "
+              f"adds / build = {adds / build:.2f}, growth since |V| = {first[0]}: adds x{adds / first[1]:.1f}, "
+              f"build x{build / first[2]:.1f}")
+    print()
+
+
+def bench_shortest_path():
+    print("Shortest Path (legacy FIFO queue vs binary heap):")
+    for v in SIZES:
+        g = circle_graph(v)
+        ga = GraphAlgo(g)
+        dest = int(v * 0.8)
+        start = time.perf_counter()
+        old = legacy_shortest_path(g, 0, dest)
+        mid = time.perf_counter()
+        new = ga.shortest_path(0, dest)
+        end = time.perf_counter()
+        assert abs(old[0] - new[0]) < 1e-9
+        print(f"|V| = {v}, |E| = {g.e_size()}: legacy = {mid - start:.6f}, heap = {end - mid:.6f}")
+    print()
+
+
+def bench_bidirectional():
+    print("Shortest Path (dijkstra vs bidirectional, settled nodes):")
+    for v in SIZES:
+        g = circle_graph(v)
+        rnd = random.Random(2)
+        pairs = [(rnd.randrange(v), rnd.randrange(v)) for _ in range(20)]
+        times = []
+        settled = []
+        for search in (dijkstra, bidirectional_dijkstra):
+            stats = {}
+            start = time.perf_counter()
+            for a, b in pairs:
+                search(g, a, b, stats)
+            times.append(time.perf_counter() - start)
+            settled.append(stats["settled"] / len(pairs))
+        print(f"|V| = {v}, |E| = {g.e_size()}: dijkstra = {times[0]:.6f} ({settled[0]:.0f} settled), "
+              f"bidirectional = {times[1]:.6f} ({settled[1]:.0f} settled)")
+    print()
+
+
+def bench_astar():
+    print("Shortest Path on grid graphs (dijkstra vs A* with euclidean heuristic, settled nodes):")
+    for v in SIZES:
+        g = grid_graph(v)
+        v = g.v_size()
+        rnd = random.Random(2)
+        pairs = [(rnd.randrange(v), rnd.randrange(v)) for _ in range(20)]
+        start = time.perf_counter()
+        scale = safe_scale(g)
+        scale_time = time.perf_counter() - start
+        times = []
+        settled = []
+        for search in (lambda a, b, stats: dijkstra(g, a, b, stats),
+                       lambda a, b, stats: astar(g, a, b, position_heuristic(g, b, scale=scale), stats)):
+            stats = {}
+            start = time.perf_counter()
+            for a, b in pairs:
+                search(a, b, stats)
+            times.append(time.perf_counter() - start)
+            settled.append(stats["settled"] / len(pairs))
+        print(f"|V| = {v}, |E| = {g.e_size()}: dijkstra = {times[0]:.6f} ({settled[0]:.0f} settled), "
+              f"astar = {times[1]:.6f} ({settled[1]:.0f} settled), scale = {scale:.3f} in {scale_time:.6f}")
+    print()
+
+
+def bench_distance_matrix():
+    print(f"Distance Matrix 50 x 50 (looping shortest_path vs distance_matrix, {os.cpu_count()} cores):")
+    for v in (1000, 10000):
+        g = circle_graph(v)
+        rnd = random.Random(3)
+        sources = rnd.sample(range(v), 50)
+        targets = rnd.sample(range(v), 50)
+        ga = GraphAlgo(g, cache_size=0)
+        start = time.perf_counter()
+        loop = [[ga.shortest_path(s, t)[0] for t in targets] for s in sources]
+        times = [time.perf_counter() - start]
+        for workers in (1, 2, 4):
+            start = time.perf_counter()
+            assert ga.distance_matrix(sources, targets, workers) == loop
+            times.append(time.perf_counter() - start)
+        print(f"|V| = {v}, |E| = {g.e_size()}: loop = {times[0]:.6f}, workers=1 = {times[1]:.6f}, "
+              f"workers=2 = {times[2]:.6f}, workers=4 = {times[3]:.6f}")
+    print()
+
+
+def bench_all_pairs():
+    print("All Pairs Shortest Paths (looping shortest_path, estimated from 1000 pairs, vs all_pairs_shortest_paths):")
+    for v in (100, 1000, 2000):
+        g = circle_graph(v)
+        ga = GraphAlgo(g, cache_size=0)
+        rnd = random.Random(4)
+        pairs = [(rnd.randrange(v), rnd.randrange(v)) for _ in range(1000)]
+        start = time.perf_counter()
+        for a, b in pairs:
+            ga.shortest_path(a, b)
+        loop = (time.perf_counter() - start) * v * v / len(pairs)
+        times = []
+        for dense_limit in (v, 0):
+            start = time.perf_counter()
+            ga.all_pairs_shortest_paths(dense_limit=dense_limit)
+            times.append(time.perf_counter() - start)
+        print(f"|V| = {v}, |E| = {g.e_size()}: loop = {loop:.6f}, floyd warshall = {times[0]:.6f}, "
+              f"dijkstra = {times[1]:.6f}")
+    print()
+
+
+def bench_center_tsp():
+    print("Center and TSP (naive shortest_path loops, estimated, vs center_point / tsp of 50 cities):")
+    for v in (1000, 10000):
+        g = circle_graph(v)
+        ga = GraphAlgo(g, cache_size=0)
+        # the naive center runs a full search from every node, the naive tsp calls shortest_path for every 2 cities
+        start = time.perf_counter()
+        for src in range(10):
+            dijkstra(g, src)
+        naive_center = (time.perf_counter() - start) * v / 10
+        cities = random.Random(5).sample(range(v), 50)
+        start = time.perf_counter()
+        for a in cities[:5]:
+            for b in cities:
+                ga.shortest_path(a, b)
+        naive_tsp = (time.perf_counter() - start) * 10
+        stats = {}
+        start = time.perf_counter()
+        center_point(g, stats)
+        center = time.perf_counter() - start
+        start = time.perf_counter()
+        path, cost = ga.tsp(cities)
+        tsp = time.perf_counter() - start
+        print(f"|V| = {v}, |E| = {g.e_size()}: naive center = {naive_center:.6f}, "
+              f"center_point = {center:.6f} ({stats['searches']} searches), naive tsp distances = {naive_tsp:.6f}, "
+              f"tsp = {tsp:.6f} (cost {cost:.3f})")
+    print()
+
+
+def bench_bulk():
+    print("Bulk Mutations (add_node/add_edge/remove_node calls vs add_nodes/add_edges/remove_nodes):")
+    for v in (10000, 30000, 100000):
+        rnd = random.Random(1)
+        positions = [(rnd.uniform(35.0, 35.3), rnd.uniform(32.09, 32.11), 0.0) for _ in range(v)]
+        edges = [(i, rnd.randrange(v), rnd.uniform(1.0, 2.0)) for i in range(v) for _ in range(8)]
+        doomed = list(range(0, v, 10))
+        start = time.perf_counter()
+        g = DiGraph()
+        for i, pos in enumerate(positions):
+            g.add_node(i, pos)
+        for id1, id2, w in edges:
+            g.add_edge(id1, id2, w)
+        mid = time.perf_counter()
+        for i in doomed:
+            g.remove_node(i)
+        single = (mid - start, time.perf_counter() - mid)
+        start = time.perf_counter()
+        g = DiGraph()
+        g.add_nodes(range(v), positions)
+        g.add_edges(edges)
+        mid = time.perf_counter()
+        g.remove_nodes(doomed)
+        bulk = (mid - start, time.perf_counter() - mid)
+        print(f"|V| = {v}, |E| = {len(edges)}: build = {single[0]:.6f} vs {bulk[0]:.6f}, "
+              f"remove 10% = {single[1]:.6f} vs {bulk[1]:.6f}")
+    print()
+
+
+def legacy_plot(g: DiGraph, file_name: str) -> None:
+    """
+    The previous plot_graph - an annotate per node and an arrow annotation per edge - rendered to a file on an off
+    screen figure, kept for comparison.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(10, 8))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    x_values = []
+    y_values = []
+    for i in g.nodes.values():
+        pos = i.pos
+        x_values.append(pos[0])
+        y_values.append(pos[1])
+        ax.annotate(text=f"{i.key}", xy=(pos[0] + 0.0002, pos[1] + 0.0002),
+                    xytext=(pos[0] - 0.0002, pos[1] + 0.0002), color='darkcyan')
+    for i in g.edges:
+        src = g.nodes.get(i.get("src"))
+        dest = g.nodes.get(i.get("dest"))
+        ax.annotate("", xy=(dest.pos[0], dest.pos[1]), xytext=(src.pos[0], src.pos[1]),
+                    arrowprops=dict(edgecolor='olive', facecolor='black', arrowstyle='-|>'))
+    ax.plot(x_values, y_values, ".", color='red')
+    fig.savefig(file_name, dpi=100)
+
+
+def bench_plot():
+    print("Plot Graph to PNG (annotation per node and edge vs batched artists):")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "graph.png")
+        for v in (10, 100, 1000, 10000, 100000):
+            g = circle_graph(v)
+            legacy = None
+            if v <= 1000:
+                start = time.perf_counter()
+                legacy_plot(g, file_name)
+                legacy = time.perf_counter() - start
+            start = time.perf_counter()
+            plot(g, file_name)
+            end = time.perf_counter()
+            print(f"|V| = {v}, |E| = {g.e_size()}: "
+                  + (f"{legacy:.6f} vs " if legacy is not None else "(legacy skipped) ") + f"{end - start:.6f}")
+    print()
+
+
+def bench_viewport():
+    print("Viewport (100 boxes of 1% of the area: linear scan vs nodes_in_box, then full plot vs zoomed in plot):")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "graph.png")
+        for name, g in (("grid", grid_graph(100000)), ("circle", circle_graph(100000))):
+            xs = [n.pos[0] for n in g.nodes.values()]
+            ys = [n.pos[1] for n in g.nodes.values()]
+            w = (max(xs) - min(xs)) / 10
+            h = (max(ys) - min(ys)) / 10
+            rnd = random.Random(7)
+            boxes = []
+            for _ in range(100):
+                x = rnd.uniform(min(xs), max(xs) - w)
+                y = rnd.uniform(min(ys), max(ys) - h)
+                boxes.append((x, y, x + w, y + h))
+            start = time.perf_counter()
+            for xmin, ymin, xmax, ymax in boxes:
+                [k for k, n in g.nodes.items() if xmin <= n.pos[0] <= xmax and ymin <= n.pos[1] <= ymax]
+            scan = time.perf_counter() - start
+            start = time.perf_counter()
+            g.spatial_index()
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            for box in boxes:
+                g.nodes_in_box(*box)
+            query = time.perf_counter() - start
+            start = time.perf_counter()
+            plot(g, file_name)
+            full = time.perf_counter() - start
+            start = time.perf_counter()
+            plot(g, file_name, bbox=boxes[0])
+            zoomed = time.perf_counter() - start
+            print(f"{name} |V| = {g.v_size()}, |E| = {g.e_size()}: scan = {scan:.6f} vs index = {query:.6f} "
+                  f"(built in {build:.6f}), plot = {full:.6f} vs {zoomed:.6f}")
+    print()
+
+
+def bench_snap():
+    print("Snap to the nearest node (queries per second: linear scan vs nearest_nodes vs nearest_nodes_batch):")
+    for name, g in (("grid", grid_graph(100000)), ("circle", circle_graph(100000))):
+        xs = [n.pos[0] for n in g.nodes.values()]
+        ys = [n.pos[1] for n in g.nodes.values()]
+        rnd = random.Random(8)
+        queries = [(rnd.uniform(min(xs), max(xs)), rnd.uniform(min(ys), max(ys))) for _ in range(10000)]
+        start = time.perf_counter()
+        for x, y in queries[:20]:
+            min(g.get_all_v(), key=lambda k: (g.nodes[k].pos[0] - x) ** 2 + (g.nodes[k].pos[1] - y) ** 2)
+        scan = 20 / (time.perf_counter() - start)
+        start = time.perf_counter()
+        g.spatial_index()
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        for x, y in queries:
+            g.nearest_nodes(x, y)
+        single = len(queries) / (time.perf_counter() - start)
+        g.nearest_nodes_batch(queries[:1])
+        start = time.perf_counter()
+        g.nearest_nodes_batch(queries)
+        batch = len(queries) / (time.perf_counter() - start)
+        start = time.perf_counter()
+        g.nearest_nodes_batch(queries, 10)
+        batch10 = len(queries) / (time.perf_counter() - start)
+        print(f"{name} |V| = {g.v_size()}: scan = {scan:.0f}/s, nearest = {single:.0f}/s, batch = {batch:.0f}/s, "
+              f"batch k=10 = {batch10:.0f}/s (index built in {build:.6f})")
+    print()
+
+
+def bench_snapshot():
+    print("Snapshots (copy.deepcopy vs DiGraph.snapshot: time and memory, then 1000 edge changes after each):")
+    import copy
+    for v in (1000, 10000, 30000, 100000):
+        g = circle_graph(v)
+        rnd = random.Random(9)
+        changes = [(rnd.randrange(v), rnd.randrange(v)) for _ in range(1000)]
+
+        def mutate():
+            start = time.perf_counter()
+            for a, b in changes:
+                if not g.add_edge(a, b, 1.0):
+                    g.remove_edge(a, b)
+            return time.perf_counter() - start
+
+        base = mutate()
+        results = []
+        for take in (copy.deepcopy, DiGraph.snapshot):
+            # the garbage of the previous copy would be collected during this one
+            gc.collect()
+            start = time.perf_counter()
+            view = take(g)
+            elapsed = time.perf_counter() - start
+            changed = mutate()
+            del view
+            # measured again under tracemalloc, which slows the copy down
+            tracemalloc.start()
+            view = take(g)
+            held = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del view
+            results.append((elapsed, held, changed))
+        print(f"|V| = {v}, |E| = {g.e_size()}: deepcopy = {results[0][0]:.6f} ({results[0][1] / 2 ** 20:.1f}MB), "
+              f"snapshot = {results[1][0]:.6f} ({results[1][1] / 2 ** 20:.1f}MB), changes = {base:.6f} "
+              f"(after deepcopy {results[0][2]:.6f}, after snapshot {results[1][2]:.6f})")
+    print()
+
+
+def bench_instrumentation():
+    print("Instrumentation overhead (200 shortest_path and 5 connected_components calls, not attached vs attached):")
+    for v in (1000, 10000):
+        g = circle_graph(v)
+        rnd = random.Random(6)
+        pairs = [(rnd.randrange(v), rnd.randrange(v)) for _ in range(200)]
+        times = []
+        for attached in (False, True):
+            ga = GraphAlgo(g, cache_size=0)
+            profiler = Profiler()
+            if attached:
+                profiler.attach(ga)
+            start = time.perf_counter()
+            for a, b in pairs:
+                ga.shortest_path(a, b)
+            for _ in range(5):
+                ga.connected_components()
+            times.append(time.perf_counter() - start)
+            profiler.detach()
+        print(f"|V| = {v}, |E| = {g.e_size()}: off = {times[0]:.6f}, on = {times[1]:.6f}")
+    print()
+
+
+def bench_remove_nodes():
+    print("Remove Node (every 30th node):")
+    for v in SIZES:
+        g = circle_graph(v)
+        e = g.e_size()
+        start = time.perf_counter()
+        for i in range(0, v, 30):
+            g.remove_node(i)
+        end = time.perf_counter()
+        print(f"|V| = {v}, |E| = {e}: {end - start:.6f}")
+    print()
+
+
+def bench_memory():
+    print("Memory (bytes per node / bytes per edge):")
+    for v in SIZES:
+        rnd = random.Random(1)
+        tracemalloc.start()
+        g = DiGraph()
+        for i in range(v):
+            g.add_node(i, (rnd.uniform(35.0, 35.3), rnd.uniform(32.09, 32.11), 0.0))
+        nodes_mem = tracemalloc.get_traced_memory()[0]
+        for i in range(v):
+            for j in range(1, 9):
+                g.add_edge(i, (i + j * 37) % v, rnd.uniform(1.0, 2.0))
+        edges_mem = tracemalloc.get_traced_memory()[0] - nodes_mem
+        tracemalloc.stop()
+        print(f"|V| = {v}, |E| = {g.e_size()}: node = {nodes_mem / v:.0f}, edge = {edges_mem / g.e_size():.0f}")
+    print()
+
+
+def main():
+    print("Benchmarks started.\n\n")
+    bench_shortest_path()
+    bench_bidirectional()
+    bench_astar()
+    bench_distance_matrix()
+    bench_all_pairs()
+    bench_center_tsp()
+    bench_instrumentation()
+    bench_plot()
+    bench_viewport()
+    bench_snap()
+    bench_snapshot()
+    bench_connected_components()
+    bench_connected_component()
+    bench_scc_index()
+    bench_scc_index_growth()
+    bench_remove_nodes()
+    bench_bulk()
+    bench_memory()
+    bench_load()
+    bench_save()
+    bench_binary()
+    print("Benchmarks ended.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Seeded generators of synthetic graphs for the benchmarks (BenchmarkSuite.py, Benchmarks.py) - the same arguments
+always generate the same graph, so runs on different machines or versions work on the same input.
+the edges are generated as a list first and inserted with one DiGraph.add_edges call, so graphs of 1M nodes can be
+generated in reasonable time.
+"""
+import random
+from math import dist, isqrt
+
+from src.DiGraph import DiGraph
+
+
+def _random_positions(rnd: random.Random, v: int) -> list:
+    return [(rnd.uniform(35.0, 35.3), rnd.uniform(32.09, 32.11), 0.0) for _ in range(v)]
+
+
+def _graph(positions: list, edges: list) -> DiGraph:
+    g = DiGraph()
+    g.add_nodes(range(len(positions)), positions)
+    g.add_edges(edges)
+    return g
+
+
+def circle_graph(v: int, out_degree: int = 8, seed: int = 1) -> DiGraph:
+    """
+    Creates a graph similar to the Circle graphs of the original TimeTests: the nodes are connected in a circle
+    (i -> i+1), and each node gets more out edges to random nodes until it has out_degree out edges.
+    """
+    rnd = random.Random(seed)
+    positions = _random_positions(rnd, v)
+    edges = []
+    for i in range(v):
+        out = {(i + 1) % v}
+        edges.append((i, (i + 1) % v, rnd.uniform(1.0, 2.0)))
+        while len(out) < min(out_degree, v - 1):
+            dest = rnd.randrange(v)
+            w = rnd.uniform(1.0, 2.0)
+            if dest != i and dest not in out:
+                out.add(dest)
+                edges.append((i, dest, w))
+    return _graph(positions, edges)
+
+
+def random_graph(v: int, out_degree: int = 8, seed: int = 1) -> DiGraph:
+    """
+    Creates a random (Erdos-Renyi like) graph of v * out_degree edges between uniformly chosen nodes.
+    unlike circle_graph it is usually not strongly connected.
+    """
+    rnd = random.Random(seed)
+    positions = _random_positions(rnd, v)
+    e = min(v * out_degree, v * (v - 1))
+    seen = set()
+    edges = []
+    while len(edges) < e:
+        src = rnd.randrange(v)
+        dest = rnd.randrange(v)
+        if src != dest and (src, dest) not in seen:
+            seen.add((src, dest))
+            edges.append((src, dest, rnd.uniform(1.0, 2.0)))
+    return _graph(positions, edges)
+
+
+def grid_graph(v: int, seed: int = 1) -> DiGraph:
+    """
+    Creates a spatial graph: the nodes are on a (jittered) square grid of isqrt(v)^2 nodes, each one connected both
+    ways to its 4 neighbors on the grid, and the weight of each edge is the distance between its nodes times a random
+    1..1.5 factor.
+    """
+    rnd = random.Random(seed)
+    side = isqrt(v)
+    n = side * side
+    positions = [(i % side + rnd.uniform(-0.3, 0.3), i // side + rnd.uniform(-0.3, 0.3), 0.0) for i in range(n)]
+    edges = []
+    for i in range(n):
+        for j in (i + 1 if (i + 1) % side else None, i + side if i + side < n else None):
+            if j is not None:
+                d = dist(positions[i], positions[j])
+                edges.append((i, j, d * rnd.uniform(1.0, 1.5)))
+                edges.append((j, i, d * rnd.uniform(1.0, 1.5)))
+    return _graph(positions, edges)
+
+
+def power_law_graph(v: int, m: int = 4, seed: int = 1) -> DiGraph:
+    """
+    Creates a scale free graph by preferential attachment (Barabasi-Albert): each new node connects to m existing
+    nodes chosen with probability proportional to their degree, so a few hubs get most of the edges.
+    each connection is an edge from the new node, and half of them get an edge back as well.
+    """
+    rnd = random.Random(seed)
+    positions = _random_positions(rnd, v)
+    m = max(1, min(m, v - 1))
+    edges = []
+    # every node appears in ends once per edge it touches, so a uniform choice from it is proportional to degree
+    ends = list(range(min(m, v)))
+    for i in range(m, v):
+        targets = set()
+        while len(targets) < m:
+            targets.add(rnd.choice(ends))
+        for t in sorted(targets):
+            edges.append((i, t, rnd.uniform(1.0, 2.0)))
+            ends.append(t)
+            ends.append(i)
+            if rnd.random() < 0.5:
+                edges.append((t, i, rnd.uniform(1.0, 2.0)))
+    return _graph(positions, edges)
+
+
+def blocks_graph(v: int, block: int = 100, seed: int = 1) -> DiGraph:
+    """
+    Creates a graph of v/block strongly connected blocks (bidirectional chains), chained one after the other.
+    """
+    rnd = random.Random(seed)
+    positions = []
+    edges = []
+    for i in range(v):
+        positions.append((rnd.uniform(35.0, 35.3), rnd.uniform(32.09, 32.11), 0.0))
+        w = rnd.uniform(1.0, 2.0)
+        if i > 0:
+            edges.append((i - 1, i, w))
+        if i % block != 0:
+            edges.append((i, i - 1, rnd.uniform(1.0, 2.0)))
+    return _graph(positions, edges)
+
+
+GENERATORS = {"circle": circle_graph, "random": random_graph, "grid": grid_graph, "power_law": power_law_graph}
@@ -0,0 +1,181 @@
+"""
+A load generator for the query server (src/GraphServer.py): concurrent clients, each on its own keep-alive connection,
+send a seeded mix of reads (shortest paths between pairs drawn from a small pool, so identical queries overlap and get
+batched or cached, and connected components) and writes (adding or removing random edges).
+by default a server is started in a separate process (so the clients don't share its GIL) on a generated graph (see
+Generators.py), or --port targets a server already running.
+usage (from the repository's root): python -m Tests.LoadGenerator --size 10000 --clients 16 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.GraphAlgo import GraphAlgo
+from Tests.Generators import GENERATORS
+
+
+class HttpClient:
+    """
+    A minimal asyncio HTTP/1.1 client holding one keep-alive connection, for JSON requests.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method: str, path: str, body: dict = None) -> (int, dict):
+        """
+        Sends a request (connecting first if needed) and returns the status and the JSON payload of the response.
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(body).encode() if body is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(data)}\r\n\r\n"
+                          .encode("latin-1") + data)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            header = await self.reader.readline()
+            if header in (b"\r\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.writer = None
+
+
+async def run_load(host: str, port: int, keys: list, clients: int = 8, requests: int = 100,
+                   write_ratio: float = 0.05, pairs: int = 50, seed: int = 1) -> dict:
+    """
+    Runs clients concurrent clients of requests requests each against the server.
+    @param keys: the node keys to query
+    @param write_ratio: the fraction of the requests which are writes
+    @param pairs: the size of the pool of (src, dest) pairs the shortest path queries are drawn from
+    @return: {"requests", "errors", "seconds", "throughput", and the p50, p90, p99 and max latencies in ms}
+    """
+    rnd = random.Random(seed)
+    pool = [(rnd.choice(keys), rnd.choice(keys)) for _ in range(pairs)]
+    latencies = []
+    errors = 0
+
+    async def client(i: int) -> None:
+        nonlocal errors
+        c = HttpClient(host, port)
+        r = random.Random(seed * 1000 + i)
+        try:
+            for _ in range(requests):
+                x = r.random()
+                if x < write_ratio:
+                    a, b = r.choice(keys), r.choice(keys)
+                    if r.random() < 0.5:
+                        request = ("POST", "/add_edge", {"src": a, "dest": b, "w": r.uniform(1.0, 2.0)})
+                    else:
+                        request = ("POST", "/remove_edge", {"src": a, "dest": b})
+                elif x < write_ratio + (1 - write_ratio) * 0.1:
+                    request = ("GET", f"/connected_component?id={r.choice(keys)}", None)
+                else:
+                    a, b = r.choice(pool)
+                    request = ("GET", f"/shortest_path?src={a}&dest={b}", None)
+                start = time.perf_counter()
+                status, _ = await c.request(*request)
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            await c.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    n = len(latencies)
+    return {"requests": n, "errors": errors, "seconds": seconds, "throughput": n / seconds,
+            "p50_ms": 1000 * latencies[n // 2], "p90_ms": 1000 * latencies[int(n * 0.9)],
+            "p99_ms": 1000 * latencies[int(n * 0.99)], "max_ms": 1000 * latencies[-1]}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server_process(file_name: str, port: int, workers: int) -> subprocess.Popen:
+    """
+    Starts python -m src.GraphServer on the graph file, and waits until it accepts connections.
+    """
+    process = subprocess.Popen([sys.executable, "-m", "src.GraphServer", file_name, "--port", str(port),
+                                "--workers", str(workers)], stdout=subprocess.DEVNULL)
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("the server didn't start")
+
+
+async def _report(port: int, keys: list, args) -> None:
+    result = await run_load("127.0.0.1", port, keys, args.clients, args.requests, args.write_ratio, args.pairs,
+                            args.seed)
+    print(f"{result['requests']} requests ({result['errors']} errors) in {result['seconds']:.3f}s: "
+          f"{result['throughput']:.0f} requests/s, p50 = {result['p50_ms']:.2f}ms, p90 = {result['p90_ms']:.2f}ms, "
+          f"p99 = {result['p99_ms']:.2f}ms, max = {result['max_ms']:.2f}ms")
+    c = HttpClient("127.0.0.1", port)
+    _, stats = await c.request("GET", "/stats")
+    await c.close()
+    print(f"server: batched = {stats['batched']}, cached = {stats['cached']}, mc = {stats['mc']}")
+    for path, s in sorted(stats["paths"].items()):
+        print(f"    {path:24} {s['requests']:7} requests, p50 = {s.get('p50_ms', 0):.2f}ms, "
+              f"p99 = {s.get('p99_ms', 0):.2f}ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the graph query server.")
+    parser.add_argument("--port", type=int, help="the port of a running server (else one is started)")
+    parser.add_argument("--generator", default="circle", choices=list(GENERATORS))
+    parser.add_argument("--size", type=int, default=10000, help="the number of nodes of the generated graph")
+    parser.add_argument("--workers", type=int, default=4, help="reader threads of the started server")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    parser.add_argument("--pairs", type=int, default=50, help="distinct shortest path queries")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    g = GENERATORS[args.generator](args.size)
+    keys = list(g.get_all_v())
+    if args.port is not None:
+        asyncio.run(_report(args.port, keys, args))
+        return 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "graph.json")
+        GraphAlgo(g).save_to_json(file_name, compact=True)
+        port = _free_port()
+        process = start_server_process(file_name, port, args.workers)
+        try:
+            asyncio.run(_report(port, keys, args))
+        finally:
+            process.terminate()
+            process.wait()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
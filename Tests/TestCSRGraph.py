@@ -0,0 +1,65 @@
+import pickle
+from math import inf
+from unittest import TestCase
+
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+
+
+class TestCSRGraph(TestCase):
+
+    def graph(self) -> DiGraph:
+        g = DiGraph()
+        for i in range(1000):
+            g.add_node(i * 7, (float(i), float(i % 10), 0.0))
+            g.add_edge((i - 1) * 7, i * 7, 1)
+            if i % 100 != 0:
+                g.add_edge(i * 7, (i - 1) * 7, 2)
+        return g
+
+    def test_freeze(self):
+        g = self.graph()
+        csr = g.freeze()
+        self.assertEqual(g.v_size(), csr.v_size())
+        self.assertEqual(g.e_size(), csr.e_size())
+        self.assertEqual(g.get_mc(), csr.get_mc())
+        for k in g.get_all_v():
+            self.assertEqual(g.all_out_edges_of_node(k), csr.all_out_edges_of_node(k))
+            self.assertEqual(g.all_in_edges_of_node(k), csr.all_in_edges_of_node(k))
+            self.assertEqual(g.get_all_v()[k].pos, csr.get_pos(k))
+        self.assertIsNone(csr.all_out_edges_of_node(1))
+        g.add_edge(0, 14, 1)
+        self.assertEqual(g.e_size() - 1, csr.e_size())
+        # positions of other lengths (such as "x,y" in a json file) keep the 3 floats per node stride
+        g = DiGraph()
+        for i, pos in enumerate([(1.0, 2.0), (3.0, 4.0, 5.0), (6.0, 7.0, 8.0, 9.0), (10.0, 11.0)]):
+            g.add_node(i, pos)
+        csr = g.freeze()
+        self.assertEqual([(1.0, 2.0, 0.0), (3.0, 4.0, 5.0), (6.0, 7.0, 8.0), (10.0, 11.0, 0.0)],
+                         [csr.get_pos(i) for i in range(4)])
+
+    def test_immutable(self):
+        csr = self.graph().freeze()
+        self.assertFalse(csr.add_node(1))
+        self.assertFalse(csr.add_edge(0, 14, 1))
+        self.assertFalse(csr.remove_edge(0, 7))
+        self.assertFalse(csr.remove_node(0))
+        self.assertEqual(1000, csr.v_size())
+
+    def test_pickle(self):
+        csr = self.graph().freeze()
+        loaded = pickle.loads(pickle.dumps(csr))
+        self.assertEqual(csr.all_out_edges_of_node(70), loaded.all_out_edges_of_node(70))
+        self.assertEqual(csr.index, loaded.index)
+
+    def test_algorithms(self):
+        g = self.graph()
+        ga = GraphAlgo(g)
+        ga_csr = GraphAlgo(g.freeze())
+        self.assertEqual(ga.shortest_path(0, 999 * 7), ga_csr.shortest_path(0, 999 * 7))
+        self.assertEqual(ga.shortest_path(700, 0), ga_csr.shortest_path(700, 0))
+        self.assertEqual((inf, []), ga_csr.shortest_path(0, 1))
+        self.assertEqual(ga.shortest_path_tree(0).dists, ga_csr.shortest_path_tree(0).dists)
+        self.assertEqual(sorted(map(sorted, ga.connected_components())),
+                         sorted(map(sorted, ga_csr.connected_components())))
+        self.assertEqual(10, len(ga_csr.connected_components()))
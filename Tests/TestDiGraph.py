@@ -1,5 +1,5 @@
 from unittest import TestCase
-from src.DiGraph import DiGraph
+from src.DiGraph import DiGraph, Node
 
 
 class TestDiGraph(TestCase):
@@ -102,3 +102,106 @@ class TestDiGraph(TestCase):
         g.add_edge(0, 9, 1)
         g.remove_edge(9, 0)
         self.assertEqual(g.e_size(), 9)
+
+    def test_edges(self):
+        g = DiGraph()
+        for i in range(10):
+            g.add_node(i)
+            g.add_edge(0, i, i)
+        self.assertEqual(9, len(g.edges))
+        self.assertIn({"src": 0, "w": 3, "dest": 3}, g.edges)
+        self.assertNotIn({"src": 0, "w": 4, "dest": 3}, g.edges)
+        self.assertIn((0, 5), g.edges)
+        g.remove_edge(0, 5)
+        self.assertNotIn((0, 5), g.edges)
+        g.remove_node(0)
+        self.assertEqual([], list(g.edges))
+        g.add_edge(1, 2, 1.5)
+        self.assertEqual([{"src": 1, "w": 1.5, "dest": 2}], list(g.edges))
+        # the former edges parameter keeps its place, and is ignored
+        self.assertEqual((0, 7), (DiGraph({}, None, 0, 7).e_size(), DiGraph({}, None, 0, 7).get_mc()))
+        with self.assertWarns(DeprecationWarning):
+            g = DiGraph({}, [{"src": 1, "w": 1.5, "dest": 2}], 0, 7)
+        self.assertEqual([], list(g.edges))
+
+    def test_node_slots(self):
+        n = Node(0, (1.0, 2.0, 0.0))
+        self.assertFalse(hasattr(n, "__dict__"))
+        with self.assertRaises(AttributeError):
+            n.weight = 1
+        self.assertEqual((1.0, 2.0, 0.0), n.pos)
+
+    def test_bulk(self):
+        g = DiGraph()
+        self.assertEqual(5, g.add_nodes(range(5), [(float(i), 0.0, 0.0) for i in range(5)]))
+        self.assertEqual(1, g.get_mc())
+        self.assertEqual(1, g.add_nodes([4, 5, 5]))
+        self.assertEqual((3.0, 0.0, 0.0), g.get_all_v()[3].pos)
+        # the positions must be parallel to the ids, nothing is added otherwise
+        for ids, positions in ((range(10, 15), [(0.0, 0.0, 0.0)]), ([10], []), (iter([10, 11]), iter([None]))):
+            with self.assertRaises(ValueError):
+                g.add_nodes(ids, positions)
+        self.assertEqual((6, 2), (g.v_size(), g.get_mc()))
+        # self loops, duplicates, negative weights and missing nodes are skipped like add_edge does
+        edges = [(0, 1, 1.0), (1, 2, 2.0), (2, 0, 3.0), (0, 1, 9.0), (3, 3, 1.0), (3, 4, -1.0), (4, 7, 1.0),
+                 (4, 5, 0.5), (5, 0, 1.0)]
+        self.assertEqual(5, g.add_edges(edges))
+        self.assertEqual(5, g.e_size())
+        self.assertEqual(3, g.get_mc())
+        self.assertEqual({1: 1.0}, g.all_out_edges_of_node(0))
+        self.assertEqual(0, g.add_edges([]))
+        nan = float("nan")
+        self.assertFalse(g.add_edge(1, 3, nan))
+        self.assertEqual(0, g.add_edges([(1, 3, nan), (3, 1, -nan)]))
+        self.assertEqual(0, g.add_edges([(1, 9, None)]))
+        self.assertEqual(3, g.get_mc())
+        self.assertEqual(2, g.remove_nodes([0, 5, 9, 0]))
+        self.assertEqual(4, g.get_mc())
+        self.assertEqual(1, g.e_size())
+        self.assertEqual({}, g.all_in_edges_of_node(1))
+        self.assertEqual(sum(len(g.all_out_edges_of_node(k)) for k in g.get_all_v()), g.e_size())
+
+    def test_bulk_arrays(self):
+        import numpy as np
+        g = DiGraph()
+        g.add_nodes(np.arange(4), np.zeros((4, 3)))
+        self.assertEqual(4, g.add_edges(np.array([[0, 1, 1.5], [1, 2, 2.5], [2, 3, 3.5], [3, 0, 0.5]])))
+        self.assertEqual({1: 1.5}, g.all_out_edges_of_node(0))
+        self.assertIs(int, type(next(iter(g.all_out_edges_of_node(0)))))
+        self.assertEqual(1, g.remove_nodes(np.array([2])))
+        self.assertEqual(2, g.e_size())
+
+    def test_snapshot(self):
+        import copy
+        g = DiGraph()
+        g.add_nodes(range(10))
+        g.add_edges((i, (i + 1) % 10, 1.0) for i in range(10))
+        snap = g.snapshot()
+        self.assertIs(snap, g.snapshot())
+        g.add_edge(0, 5, 2.0)
+        g.remove_edge(1, 2)
+        g.remove_node(3)
+        g.add_node(10)
+        g.add_edges([(10, 0, 1.0), (4, 6, 1.0)])
+        g.remove_nodes([7])
+        g.add_nodes([11])
+        # the snapshot still shows the graph as it was
+        self.assertEqual((10, 10, 2), (snap.v_size(), snap.e_size(), snap.get_mc()))
+        self.assertEqual({1: 1.0}, snap.all_out_edges_of_node(0))
+        self.assertEqual({1: 1.0}, snap.all_in_edges_of_node(2))
+        self.assertEqual({4: 1.0}, snap.all_out_edges_of_node(3))
+        self.assertEqual(10, len(list(snap.edges)))
+        self.assertFalse(snap.add_edge(0, 2, 1.0) or snap.add_node(20) or snap.remove_node(0) or snap.remove_edge(0, 1))
+        self.assertIsNot(snap, g.snapshot())
+        self.assertEqual({1: 1.0, 5: 2.0}, g.snapshot().all_out_edges_of_node(0))
+        self.assertEqual(sum(len(g.all_out_edges_of_node(k)) for k in g.get_all_v()), g.e_size())
+        self.assertEqual(sum(len(g.all_in_edges_of_node(k)) for k in g.get_all_v()), g.e_size())
+        # a deep copy is independent of the original's snapshots and epochs: it doesn't share the last snapshot, and
+        # its changes reach neither the original nor that snapshot
+        snap = g.snapshot()
+        other = copy.deepcopy(g)
+        self.assertIsNot(snap, other.snapshot())
+        other.add_edge(0, 2, 1.0)
+        self.assertNotIn(2, g.all_out_edges_of_node(0))
+        self.assertNotIn(2, snap.all_out_edges_of_node(0))
+        self.assertIs(snap, g.snapshot())
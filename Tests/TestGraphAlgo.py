@@ -1,8 +1,17 @@
+import itertools
+import json
+import math
+import os
+import random
+import tempfile
+from io import StringIO
 from math import inf
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from src.DiGraph import DiGraph
+from src.Dijkstra import safe_scale
 from src.GraphAlgo import GraphAlgo
+from src.JsonStream import iter_json_items
 
 
 class TestGraphAlgo(TestCase):
@@ -23,6 +32,50 @@ class TestGraphAlgo(TestCase):
         ga_equal.load_from_json("C:/Users/Adi Dahari/Desktop/OOP-_Ex3/data/A0")
         self.assertEqual(ga.get_graph().__str__(), ga_equal.get_graph().__str__())
 
+    def test_load_from_json_stream(self):
+        doc = {"Edges": [{"src": 0, "w": 1.25, "dest": 1}, {"src": 1, "w": 2, "dest": 0},
+                         {"src": 1, "w": 3.5, "dest": 2}, {"src": 2, "w": 1, "dest": 2}],
+               "Nodes": [{"pos": "35.1,32.1,0.0", "id": 0}, {"pos": "35.2,32.2,0.0", "id": 1}, {"id": 2}]}
+        text = json.dumps(doc, indent=4)
+        for chunk_size in (1, 7, 1 << 16):
+            items = list(iter_json_items(StringIO(text), chunk_size))
+            self.assertEqual([("Edges", e) for e in doc["Edges"]] + [("Nodes", n) for n in doc["Nodes"]], items)
+        self.assertEqual([("a", 1), ("b", [])], list(iter_json_items(StringIO('{"a": 1, "b": [[]]}'))))
+        nested = {"x": [{"a": {"b": "}"}}, {"c": [1, {}]}, 2], "y": [1, 2.5, "]"], "z": []}
+        for chunk_size in (1, 5, 1 << 16):
+            items = list(iter_json_items(StringIO(json.dumps(nested)), chunk_size))
+            self.assertEqual([(k, i) for k, v in nested.items() for i in v], items)
+        with tempfile.TemporaryDirectory() as d:
+            file_name = os.path.join(d, "g.json")
+            with open(file_name, "w") as f:
+                f.write(text)
+            ga = GraphAlgo()
+            self.assertTrue(ga.load_from_json(file_name))
+            g = ga.get_graph()
+            self.assertEqual(3, g.v_size())
+            self.assertEqual(3, g.e_size())
+            self.assertEqual({0: 2, 2: 3.5}, g.all_out_edges_of_node(1))
+            self.assertEqual((35.2, 32.2, 0.0), g.get_all_v()[1].pos)
+            self.assertFalse(ga.load_from_json(os.path.join(d, "NoSuchFile")))
+            self.assertEqual(g, ga.get_graph())
+            # keys which are not ints, or missing (None), are loaded as they are
+            with open(file_name, "w") as f:
+                json.dump({"Edges": [{"src": 0, "w": 1, "dest": 1}, {"src": "a", "w": 2, "dest": 0},
+                                     {"src": 1, "w": 1, "dest": 2 ** 70}, {"w": 1, "dest": 0}],
+                           "Nodes": [{"id": 0}, {"id": 1}, {"id": "a"}, {"id": 2 ** 70}, {}]}, f)
+            self.assertTrue(ga.load_from_json(file_name))
+            other = ga.get_graph()
+            self.assertEqual(5, other.v_size())
+            self.assertEqual({"a": 2, None: 1}, other.all_in_edges_of_node(0))
+            self.assertEqual({2 ** 70: 1}, other.all_out_edges_of_node(1))
+            # a bad file fails without changing the graph
+            for bad in ('{"Edges": [{"src": 0, "dest": 1}], "Nodes": [{"id": 0}, {"id": 1}]}',
+                        '{"Edges": [], "Nodes": [{"id": 0, "pos": [1, 2, 3]}]}', '{"Edges": [1]}', '{"Edges": ['):
+                with open(file_name, "w") as f:
+                    f.write(bad)
+                self.assertFalse(ga.load_from_json(file_name))
+                self.assertIs(other, ga.get_graph())
+
     def test_save_to_json(self):
         ga4 = GraphAlgo()
         ga4.load_from_json("C:/Users/Adi Dahari/Desktop/OOP-_Ex3/data/A0")
@@ -32,6 +85,85 @@ class TestGraphAlgo(TestCase):
         ga4_loaded.load_from_json("C:/Users/Adi Dahari/Desktop/OOP-_Ex3/data/A0_testsave1")
         self.assertEqual(ga4.get_graph().__str__(), ga4_loaded.get_graph().__str__())
 
+    def test_save_to_json_stream(self):
+        g = DiGraph()
+        for i in range(100):
+            g.add_node(i, (35.0 + i / 1000, 32.1, 0.0))
+            g.add_edge(i - 1, i, i / 7)
+            g.add_edge(i, 0, 2)
+        ga = GraphAlgo(g)
+        with tempfile.TemporaryDirectory() as d:
+            for compact in (False, True):
+                file_name = os.path.join(d, f"g_{compact}.json")
+                self.assertTrue(ga.save_to_json(file_name, compact))
+                with open(file_name) as f:
+                    saved = json.load(f)
+                self.assertEqual(g.e_size(), len(saved["Edges"]))
+                loaded = GraphAlgo()
+                self.assertTrue(loaded.load_from_json(file_name))
+                for k, n in g.get_all_v().items():
+                    self.assertEqual(n.pos, loaded.get_graph().get_all_v()[k].pos)
+                    self.assertEqual(g.all_out_edges_of_node(k), loaded.get_graph().all_out_edges_of_node(k))
+            self.assertLess(os.path.getsize(os.path.join(d, "g_True.json")),
+                            os.path.getsize(os.path.join(d, "g_False.json")))
+            self.assertFalse(ga.save_to_json(os.path.join(d, "no", "such", "dir")))
+            # keys which are not ints are written quoted, and load back as they were
+            g = DiGraph()
+            for key in ("a", 'b"c', 1, "1"):
+                g.add_node(key, (1.0, 2.0, 0.0))
+            g.add_edge("a", 'b"c', 1.5)
+            g.add_edge('b"c', 1, 2)
+            g.add_edge(1, "1", 3)
+            file_name = os.path.join(d, "keys.json")
+            for compact in (False, True):
+                self.assertTrue(GraphAlgo(g).save_to_json(file_name, compact))
+                loaded = GraphAlgo()
+                self.assertTrue(loaded.load_from_json(file_name))
+                self.assertEqual(set(g.get_all_v()), set(loaded.get_graph().get_all_v()))
+                for k in g.get_all_v():
+                    self.assertEqual(g.all_out_edges_of_node(k), loaded.get_graph().all_out_edges_of_node(k))
+
+    def test_binary(self):
+        g = DiGraph()
+        for i in range(200):
+            g.add_node(i * 3, (35.0 + i / 1000, 32.1 - i / 3000, 0.0))
+            g.add_edge((i - 1) * 3, i * 3, i / 7)
+            g.add_edge(i * 3, 0, 2.5)
+        ga = GraphAlgo(g)
+        with tempfile.TemporaryDirectory() as d:
+            self.assertTrue(ga.save_to_binary(os.path.join(d, "g.bin")))
+            self.assertTrue(ga.save_to_json(os.path.join(d, "g.json")))
+            for frozen in (False, True):
+                loaded = GraphAlgo()
+                self.assertTrue(loaded.load_from_binary(os.path.join(d, "g.bin"), frozen))
+                lg = loaded.get_graph()
+                self.assertEqual(g.v_size(), lg.v_size())
+                self.assertEqual(g.e_size(), lg.e_size())
+                for k in g.get_all_v():
+                    self.assertEqual(g.all_out_edges_of_node(k), lg.all_out_edges_of_node(k))
+                    self.assertEqual(g.all_in_edges_of_node(k), lg.all_in_edges_of_node(k))
+                self.assertEqual(ga.shortest_path(3, 0), loaded.shortest_path(3, 0))
+                self.assertEqual(ga.shortest_path(0, 597), loaded.shortest_path(0, 597))
+                self.assertEqual(len(ga.connected_components()), len(loaded.connected_components()))
+                self.assertTrue(loaded.save_to_json(os.path.join(d, f"g_{frozen}.json")))
+                with open(os.path.join(d, "g.json")) as f1, open(os.path.join(d, f"g_{frozen}.json")) as f2:
+                    self.assertEqual(f1.read(), f2.read())
+            self.assertFalse(loaded.load_from_binary(os.path.join(d, "g.json")))
+            self.assertFalse(loaded.load_from_binary(os.path.join(d, "NoSuchFile")))
+            self.assertEqual(lg, loaded.get_graph())
+            # the format holds 64 bit int keys only: other keys fail cleanly, and nothing is written
+            for key in ("a", 2 ** 70, None):
+                other = DiGraph()
+                other.add_node(0)
+                other.add_node(key)
+                other.add_edge(0, key, 1)
+                self.assertFalse(GraphAlgo(other).save_to_binary(os.path.join(d, "bad.bin")))
+                self.assertFalse(os.path.exists(os.path.join(d, "bad.bin")))
+                with self.assertRaises(ValueError):
+                    other.freeze()
+            # the worker processes get such a graph unfrozen
+            self.assertEqual([[0, 1], [inf, 0]], GraphAlgo(other).distance_matrix([0, None], [0, None], workers=2))
+
     def test_shortest_path(self):
         g2 = DiGraph()
         for i in range(1000):
@@ -61,6 +193,271 @@ class TestGraphAlgo(TestCase):
         self.assertEqual(0, ga3.shortest_path(0, 0)[0])
         self.assertEqual(inf, ga3.shortest_path(0, 4)[0])
 
+    def test_shortest_path_large_keys(self):
+        g = DiGraph()
+        for i in range(1000, 1005):
+            g.add_node(i)
+        g.add_edge(1000, 1001, 1)
+        g.add_edge(1001, 1004, 10)
+        g.add_edge(1000, 1002, 2)
+        g.add_edge(1002, 1003, 2)
+        g.add_edge(1003, 1004, 2)
+        ga = GraphAlgo(g)
+        self.assertEqual((6, [1000, 1002, 1003, 1004]), ga.shortest_path(1000, 1004))
+        self.assertEqual((0, [1003]), ga.shortest_path(1003, 1003))
+        self.assertEqual((inf, []), ga.shortest_path(1004, 1000))
+
+    def test_shortest_path_tree(self):
+        g = DiGraph()
+        for i in range(1000):
+            g.add_node(i)
+            g.add_edge(i - 1, i, 1)
+        g.add_edge(0, 500, 3)
+        ga = GraphAlgo(g)
+        tree = ga.shortest_path_tree(0)
+        for i in (0, 1, 499, 500, 750, 999):
+            self.assertEqual(ga.shortest_path(0, i), (tree.distance_to(i), tree.path_to(i)))
+        self.assertEqual([0, 500, 501], tree.path_to(501))
+        self.assertEqual(inf, tree.distance_to(1000))
+        self.assertEqual([], tree.path_to(1000))
+        self.assertEqual(inf, ga.shortest_path_tree(1000).distance_to(0))
+
+    def test_shortest_path_bidirectional(self):
+        rnd = random.Random(5)
+        for _ in range(20):
+            g = DiGraph()
+            for i in range(50):
+                g.add_node(i)
+            for _ in range(150):
+                g.add_edge(rnd.randrange(50), rnd.randrange(50), rnd.choice((0, 1, rnd.uniform(0.5, 5))))
+            ga = GraphAlgo(g)
+            frozen = GraphAlgo(g.freeze())
+            for _ in range(30):
+                id1, id2 = rnd.randrange(50), rnd.randrange(50)
+                dist, path = ga.shortest_path(id1, id2)
+                for algo in (ga, frozen):
+                    b_dist, b_path = algo.shortest_path(id1, id2, method="bidirectional")
+                    self.assertAlmostEqual(dist, b_dist) if dist != inf else self.assertEqual(inf, b_dist)
+                    if path:
+                        self.assertEqual((id1, id2), (b_path[0], b_path[-1]))
+                        self.assertAlmostEqual(b_dist, sum(g.all_out_edges_of_node(a)[b]
+                                                           for a, b in zip(b_path, b_path[1:])))
+                    else:
+                        self.assertEqual([], b_path)
+        self.assertEqual((0, [3]), ga.shortest_path(3, 3, method="bidirectional"))
+        self.assertEqual((inf, []), ga.shortest_path(3, 50, method="bidirectional"))
+        self.assertRaises(ValueError, ga.shortest_path, 0, 1, "bfs")
+
+    def test_shortest_path_astar(self):
+        rnd = random.Random(7)
+        g = DiGraph()
+        for i in range(300):
+            g.add_node(i, (rnd.uniform(0, 10), rnd.uniform(0, 10), 0.0))
+        for _ in range(1500):
+            id1, id2 = rnd.randrange(300), rnd.randrange(300)
+            if id1 != id2:
+                d = math.dist(g.get_all_v()[id1].pos, g.get_all_v()[id2].pos)
+                g.add_edge(id1, id2, d * rnd.uniform(1, 2))
+        ga = GraphAlgo(g)
+        frozen = GraphAlgo(g.freeze())
+        manhattan = lambda p, q: abs(p[0] - q[0]) + abs(p[1] - q[1])
+        for _ in range(50):
+            id1, id2 = rnd.randrange(300), rnd.randrange(300)
+            dist, path = ga.shortest_path(id1, id2)
+            for ans in (ga.shortest_path(id1, id2, method="astar"), frozen.shortest_path(id1, id2, method="astar"),
+                        ga.shortest_path(id1, id2, method="astar", heuristic=manhattan),
+                        ga.shortest_path(id1, id2, method="astar", scale=0.5),
+                        ga.shortest_path(id1, id2, method="astar", scale=100)):
+                self.assertAlmostEqual(dist, ans[0]) if dist != inf else self.assertEqual((inf, []), ans)
+                if path:
+                    self.assertEqual((id1, id2), (ans[1][0], ans[1][-1]))
+        # a caller's heuristic (a new lambda each time) leaves the cache alone
+        size = ga.cache_info()["size"]
+        for _ in range(3):
+            ga.shortest_path(1, 2, method="astar", heuristic=lambda p, q: 0.0)
+        self.assertEqual(size, ga.cache_info()["size"])
+        # a node without a position falls back to Dijkstra
+        g.get_all_v()[0].pos = None
+        ga = GraphAlgo(g)
+        self.assertEqual(ga.shortest_path(1, 2), ga.shortest_path(1, 2, method="astar"))
+        # and that no scale is safe (None) is cached as well, the edges are not scanned again
+        with mock.patch("src.GraphAlgo.safe_scale", wraps=safe_scale) as scan:
+            ga.shortest_path(3, 4, method="astar")
+            ga.shortest_path(5, 6, method="astar")
+        self.assertEqual(0, scan.call_count)
+
+    def test_distance_matrix(self):
+        rnd = random.Random(3)
+        g = DiGraph()
+        for i in range(60):
+            g.add_node(i)
+        for _ in range(200):
+            g.add_edge(rnd.randrange(60), rnd.randrange(60), rnd.uniform(1, 10))
+        ga = GraphAlgo(g)
+        sources = [0, 5, 5, 17, 59, 60]
+        targets = [1, 5, 30, 0, 61]
+        expected = [[ga.shortest_path(s, t)[0] for t in targets] for s in sources]
+        self.assertEqual(expected, ga.distance_matrix(sources, targets))
+        self.assertEqual(expected, ga.distance_matrix(sources, targets, workers=2))
+        self.assertEqual(expected, GraphAlgo(g.freeze()).distance_matrix(sources, targets, workers=2))
+        self.assertEqual([], ga.distance_matrix([], targets))
+
+    def test_all_pairs_shortest_paths(self):
+        rnd = random.Random(4)
+        g = DiGraph()
+        for i in range(80):
+            g.add_node(i)
+        for _ in range(250):
+            g.add_edge(rnd.randrange(80), rnd.randrange(80), rnd.uniform(1, 10))
+        ga = GraphAlgo(g)
+        dense = ga.all_pairs_shortest_paths(paths=True)
+        sparse = ga.all_pairs_shortest_paths(paths=True, dense_limit=0)
+        self.assertEqual(("floyd_warshall", "dijkstra"), (dense.method, sparse.method))
+        for id1 in range(0, 80, 7):
+            for id2 in range(80):
+                dist, path = ga.shortest_path(id1, id2)
+                for apsp in (dense, sparse):
+                    self.assertAlmostEqual(dist, apsp.distance(id1, id2)) if path else \
+                        self.assertEqual(inf, apsp.distance(id1, id2))
+                    p = apsp.path(id1, id2)
+                    self.assertEqual(bool(path), bool(p))
+                    if p:
+                        self.assertEqual((id1, id2), (p[0], p[-1]))
+                        self.assertAlmostEqual(dist, sum(g.all_out_edges_of_node(a)[b] for a, b in zip(p, p[1:])))
+        self.assertEqual(inf, dense.distance(0, 80))
+        ecc = sparse.eccentricities()
+        for key, e in dense.eccentricities().items():
+            self.assertAlmostEqual(ecc[key], e) if e != inf else self.assertEqual(inf, ecc[key])
+        self.assertRaises(ValueError, ga.all_pairs_shortest_paths().path, 0, 1)
+
+    def test_center_point(self):
+        rnd = random.Random(6)
+        g = DiGraph()
+        for i in range(100):
+            g.add_node(i)
+            g.add_edge(i - 1, i, rnd.uniform(1, 10))
+        g.add_edge(99, 0, 1)
+        for _ in range(200):
+            g.add_edge(rnd.randrange(100), rnd.randrange(100), rnd.uniform(1, 10))
+        ga = GraphAlgo(g)
+        ecc = ga.all_pairs_shortest_paths().eccentricities()
+        key, e = ga.center_point()
+        self.assertAlmostEqual(min(ecc.values()), e)
+        self.assertAlmostEqual(ecc[key], e)
+        g.remove_edge(99, 0)
+        g.add_node(100)
+        self.assertEqual((None, inf), ga.center_point())
+        self.assertEqual((None, inf), GraphAlgo().center_point())
+        # not strongly connected, whichever node the search starts from
+        for edges in ([(0, 1)], [(0, 1), (0, 2)], [(1, 0), (2, 0)]):
+            g = DiGraph()
+            for src, dest in edges:
+                g.add_node(src)
+                g.add_node(dest)
+                g.add_edge(src, dest, 1)
+            self.assertEqual((None, inf), GraphAlgo(g).center_point())
+        g = DiGraph()
+        g.add_node(7)
+        self.assertEqual((7, 0), GraphAlgo(g).center_point())
+
+    def test_tsp(self):
+        rnd = random.Random(8)
+        g = DiGraph()
+        for i in range(30):
+            g.add_node(i)
+            g.add_edge(i - 1, i, rnd.uniform(1, 10))
+        g.add_edge(29, 0, 1)
+        for _ in range(60):
+            g.add_edge(rnd.randrange(30), rnd.randrange(30), rnd.uniform(1, 10))
+        ga = GraphAlgo(g)
+        cities = [3, 17, 25, 8, 12]
+        path, cost = ga.tsp(cities)
+        self.assertTrue(set(cities) <= set(path))
+        self.assertAlmostEqual(cost, sum(g.all_out_edges_of_node(a)[b] for a, b in zip(path, path[1:])))
+        best = min(sum(ga.shortest_path(a, b)[0] for a, b in zip(p, p[1:])) for p in itertools.permutations(cities))
+        self.assertLessEqual(best, cost + 1e-9)
+        self.assertEqual(([5], 0), ga.tsp([5, 5]))
+        self.assertEqual(([], inf), ga.tsp([5, 30]))
+        g.add_node(30)
+        self.assertEqual(([], inf), ga.tsp([5, 30]))
+
+    def test_plot_graph(self):
+        g = DiGraph()
+        for i in range(5, 25):
+            g.add_node(i, (i % 5, i // 5, 0) if i % 3 else None)
+            g.add_edge(i, 5 + (i - 4) % 20, 1)
+        with tempfile.TemporaryDirectory() as d:
+            for k, graph in enumerate((g, g.freeze(), DiGraph())):
+                file_name = os.path.join(d, f"graph{k}.png")
+                GraphAlgo(graph).plot_graph(file_name, label_limit=10, arrow_limit=10)
+                self.assertGreater(os.path.getsize(file_name), 0)
+                for bbox in ((1, 1, 3, 3), (10, 10, 20, 20)):
+                    GraphAlgo(graph).plot_graph(file_name, bbox=bbox, cluster_limit=5)
+                    self.assertGreater(os.path.getsize(file_name), 0)
+
+    def test_snapshot(self):
+        import threading
+        g = DiGraph()
+        g.add_nodes(range(200))
+        g.add_edges((i, (i + 1) % 200, 1.0) for i in range(200))
+        ga = GraphAlgo(g)
+        errors = []
+        done = threading.Event()
+
+        def writer():
+            rnd = random.Random(9)
+            while not done.is_set():
+                a, b = rnd.randrange(200), rnd.randrange(200)
+                if not g.add_edge(a, b, rnd.uniform(0.5, 1.0)):
+                    g.remove_edge(a, b)
+
+        def reader():
+            for _ in range(100):
+                view = ga.snapshot()
+                snap = view.get_graph()
+                out_edges = sum(len(snap.all_out_edges_of_node(k)) for k in snap.get_all_v())
+                in_edges = sum(len(snap.all_in_edges_of_node(k)) for k in snap.get_all_v())
+                dist, path = view.shortest_path(0, 100)
+                if not (out_edges == in_edges == snap.e_size() and snap.get_mc() == view.get_graph().get_mc()
+                        and dist == sum(snap.all_out_edges_of_node(a)[b] for a, b in zip(path, path[1:]))):
+                    errors.append(snap)
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        w = threading.Thread(target=writer)
+        w.start()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        done.set()
+        w.join()
+        self.assertEqual([], errors)
+        self.assertIs(g.get_all_v(), ga.get_graph().get_all_v())
+
+    def test_cache(self):
+        g = DiGraph()
+        for i in range(10):
+            g.add_node(i)
+            g.add_edge(i - 1, i, 1)
+        ga = GraphAlgo(g, cache_size=2)
+        self.assertEqual(9, ga.shortest_path(0, 9)[0])
+        ga.shortest_path(0, 9)[1].clear()
+        self.assertEqual(10, len(ga.shortest_path(0, 9)[1]))
+        self.assertEqual(2, ga.cache_info()["hits"])
+        self.assertEqual(1, ga.cache_info()["misses"])
+        ga.shortest_path(0, 5)
+        ga.connected_components()
+        self.assertEqual(2, ga.cache_info()["size"])
+        ga.shortest_path(0, 9)
+        self.assertEqual(4, ga.cache_info()["misses"])
+        g.add_edge(0, 9, 1)
+        self.assertEqual(1, ga.shortest_path(0, 9)[0])
+        self.assertEqual(1, ga.cache_info()["size"])
+        ga2 = GraphAlgo(g, cache_size=0)
+        ga2.shortest_path(0, 9)
+        ga2.shortest_path(0, 9)
+        self.assertEqual(0, ga2.cache_info()["size"])
+
     def test_connected_component(self):
         g5 = DiGraph()
         for i in range(1000):
@@ -73,6 +470,23 @@ class TestGraphAlgo(TestCase):
         ga5.get_graph().add_edge(100, 99, 1)
         self.assertEqual(len(ga5.connected_component(0)), 200)
 
+    def test_connected_components_random(self):
+        rnd = random.Random(3)
+        g = DiGraph()
+        for i in range(60):
+            g.add_node(i)
+        for _ in range(90):
+            g.add_edge(rnd.randrange(60), rnd.randrange(60), 1)
+        ga = GraphAlgo(g)
+        reach = {i: set(ga.shortest_path_tree(i).dists) for i in range(60)}
+        expected = {frozenset(j for j in range(60) if j in reach[i] and i in reach[j]) for i in range(60)}
+        components = ga.connected_components()
+        self.assertEqual(60, sum(map(len, components)))
+        self.assertEqual(expected, set(map(frozenset, components)))
+        for other in (ga, GraphAlgo(g), GraphAlgo(g.freeze())):
+            for i in range(60):
+                self.assertEqual(set(next(c for c in expected if i in c)), set(other.connected_component(i)))
+
     def test_connected_components(self):
         g6 = DiGraph()
         for i in range(1000):
@@ -0,0 +1,72 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+from src.GraphServer import GraphServer
+from Tests.Generators import circle_graph
+from Tests.LoadGenerator import HttpClient, run_load
+
+
+class TestGraphServer(IsolatedAsyncioTestCase):
+
+    async def serve(self, g) -> HttpClient:
+        self.server = GraphServer(GraphAlgo(g), workers=2)
+        await self.server.start()
+        self.addAsyncCleanup(self.server.close)
+        client = HttpClient("127.0.0.1", self.server.port)
+        self.addAsyncCleanup(client.close)
+        return client
+
+    async def test_queries(self):
+        g = DiGraph()
+        for i in range(10):
+            g.add_node(i)
+            g.add_edge(i - 1, i, 1)
+        c = await self.serve(g)
+        self.assertEqual((200, {"dist": 3, "path": [2, 3, 4, 5]}),
+                         await c.request("GET", "/shortest_path?src=2&dest=5"))
+        self.assertEqual((200, {"dist": None, "path": []}), await c.request("GET", "/shortest_path?src=5&dest=2"))
+        self.assertEqual((200, {"component": [5]}), await c.request("GET", "/connected_component?id=5"))
+        # a write is seen by the next read
+        mc = g.get_mc()
+        self.assertEqual((200, {"ok": True, "mc": mc + 1}),
+                         await c.request("POST", "/add_edge", {"src": 9, "dest": 0, "w": 1}))
+        self.assertEqual((200, {"dist": 7, "path": [5, 6, 7, 8, 9, 0, 1, 2]}),
+                         await c.request("GET", "/shortest_path?src=5&dest=2"))
+        status, ans = await c.request("GET", "/connected_components")
+        self.assertEqual([list(range(10))], [sorted(comp) for comp in ans["components"]])
+        self.assertEqual((200, {"ok": True, "mc": mc + 2}), await c.request("POST", "/remove_node", {"id": 0}))
+        self.assertEqual({"ok": False, "mc": mc + 2}, (await c.request("POST", "/remove_node", {"id": 0}))[1])
+        self.assertEqual(200, (await c.request("POST", "/add_node", {"id": 0, "pos": [1, 2, 0]}))[0])
+        self.assertEqual((1.0, 2.0, 0.0), g.get_all_v()[0].pos)
+        self.assertEqual(400, (await c.request("GET", "/shortest_path?src=1"))[0])
+        self.assertEqual(400, (await c.request("POST", "/add_edge", {"src": "a", "dest": 1, "w": 1}))[0])
+        self.assertEqual(404, (await c.request("GET", "/nothing"))[0])
+        self.assertEqual(405, (await c.request("GET", "/add_edge"))[0])
+        status, stats = await c.request("GET", "/stats")
+        self.assertEqual(10, stats["nodes"])
+        self.assertEqual(4, stats["paths"]["/shortest_path"]["requests"])
+        self.assertEqual(1, stats["paths"]["/shortest_path"]["errors"])
+        self.assertIn("p99_ms", stats["paths"]["/shortest_path"])
+
+    async def test_batching(self):
+        c = await self.serve(circle_graph(3000))
+        clients = [HttpClient("127.0.0.1", self.server.port) for _ in range(10)]
+        answers = await asyncio.gather(*(other.request("GET", "/connected_components") for other in clients))
+        for other in clients:
+            await other.close()
+        self.assertEqual(1, len({str(ans) for ans in answers}))
+        stats = (await c.request("GET", "/stats"))[1]
+        # the query ran once, the other requests joined it (or found its result cached)
+        self.assertEqual(9, stats["batched"] + stats["cached"])
+        self.assertGreater(stats["batched"], 0)
+
+    async def test_load(self):
+        g = circle_graph(500)
+        await self.serve(g)
+        result = await run_load("127.0.0.1", self.server.port, list(g.get_all_v()), clients=4, requests=50,
+                                write_ratio=0.2)
+        self.assertEqual(200, result["requests"])
+        self.assertEqual(0, result["errors"])
+        self.assertEqual(sum(len(g.all_out_edges_of_node(k)) for k in g.get_all_v()), g.e_size())
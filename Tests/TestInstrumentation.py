@@ -0,0 +1,73 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+from src.Instrumentation import Profiler
+
+
+class TestInstrumentation(TestCase):
+
+    def graph(self) -> DiGraph:
+        g = DiGraph()
+        for i in range(100):
+            g.add_node(i)
+            g.add_edge(i - 1, i, 1)
+        g.add_edge(99, 0, 1)
+        return g
+
+    def test_graph_algo(self):
+        ga = GraphAlgo(self.graph())
+        records = []
+        with Profiler(callback=records.append) as profiler:
+            profiler.attach(ga)
+            self.assertEqual((50, list(range(51))), ga.shortest_path(0, 50))
+            ga.shortest_path(0, 50)
+            ga.shortest_path(0, 50, method="bidirectional")
+            ga.connected_components()
+            ga.connected_component(5)
+        self.assertEqual(records, profiler.records)
+        first, second, bidirectional, components, component = records
+        self.assertEqual(("shortest_path", (0, 50), False), (first["method"], first["args"], first["cached"]))
+        self.assertEqual(51, first["settled"])
+        # the search stops when 50 is settled, before scanning its edges
+        self.assertEqual(50, first["relaxed"])
+        self.assertEqual(51, first["pushes"])
+        self.assertTrue(second["cached"])
+        self.assertNotIn("settled", second)
+        self.assertLess(bidirectional["settled"], 60)
+        self.assertEqual(100, components["max_depth"])
+        self.assertEqual(100, components["visited"])
+        # answered from the components found before, without a search
+        self.assertNotIn("visited", component)
+        summary = profiler.summary()
+        self.assertEqual(3, summary["shortest_path"]["calls"])
+        self.assertEqual(51 + bidirectional["settled"], summary["shortest_path"]["settled"])
+        # detached, the object runs its own methods again
+        self.assertNotIn("shortest_path", vars(ga))
+        self.assertIsNone(ga.stats)
+
+    def test_nested_and_io(self):
+        g = self.graph()
+        ga = GraphAlgo(g)
+        profiler = Profiler(keep=True)
+        profiler.attach(ga)
+        profiler.attach(g)
+        g.add_edge(0, 50, 100)
+        g.add_edges([(1, 60, 100), (2, 70, 100)])
+        ga.tsp([10, 20, 30])
+        with tempfile.TemporaryDirectory() as d:
+            file_name = os.path.join(d, "g.json")
+            ga.save_to_json(file_name)
+            ga.load_from_json(file_name)
+        profiler.detach()
+        methods = [r["method"] for r in profiler.records]
+        self.assertEqual(["add_edge", "add_edges", "distance_matrix", "tsp", "save_to_json", "load_from_json"],
+                         methods)
+        matrix, tsp, save, load = profiler.records[2:]
+        self.assertEqual(("list",), matrix["args"][:1])
+        self.assertGreaterEqual(tsp["settled"], matrix["settled"])
+        self.assertEqual((100, 103), (save["nodes"], save["edges"]))
+        self.assertEqual((100, 103), (load["nodes"], load["edges"]))
+        self.assertNotIn("add_edge", vars(g))
@@ -0,0 +1,85 @@
+import random
+from unittest import TestCase
+
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+from src.SCCIndex import SCCIndex
+
+
+class TestSCCIndex(TestCase):
+
+    def assertSameComponents(self, index: SCCIndex, g: DiGraph):
+        expected = set(map(frozenset, GraphAlgo(g).connected_components()))
+        self.assertEqual(expected, set(map(frozenset, index.components())))
+        self.assertEqual(len(expected), len(index))
+        for c in expected:
+            self.assertEqual(1, len({index.component_of(k) for k in c}))
+            self.assertEqual(set(c), set(index.component(next(iter(c)))))
+        for e in g.edges:
+            src = index.component_of(e["src"])
+            dest = index.component_of(e["dest"])
+            if src != dest:
+                self.assertLess(index.ord[src], index.ord[dest])
+        self.assertEqual(len(index), len(set(index.ord.values())))
+
+    def test_blocks(self):
+        g = DiGraph()
+        for i in range(1000):
+            g.add_node(i)
+            g.add_edge(i - 1, i, 1)
+            if i % 100 != 0:
+                g.add_edge(i, i - 1, 1)
+        index = SCCIndex(g)
+        self.assertEqual(10, len(index))
+        g.add_edge(100, 99, 1)
+        self.assertEqual(9, len(index))
+        self.assertEqual(200, len(index.component(0)))
+        g.add_edge(999, 0, 1)
+        self.assertEqual(1, len(index))
+        g.remove_edge(999, 0)
+        self.assertEqual(9, len(index))
+        g.remove_node(550)
+        self.assertEqual(10, len(index))
+        self.assertEqual(50, len(index.component(500)))
+        self.assertEqual([], index.component(550))
+        self.assertIsNone(index.component_of(550))
+        g.add_node(550)
+        self.assertEqual(11, len(index))
+        self.assertSameComponents(index, g)
+
+    def test_random_mutations(self):
+        rnd = random.Random(7)
+        g = DiGraph()
+        for i in range(80):
+            g.add_node(i)
+        for _ in range(100):
+            g.add_edge(rnd.randrange(80), rnd.randrange(80), 1)
+        index = SCCIndex(g)
+        self.assertSameComponents(index, g)
+        for step in range(1000):
+            action = rnd.random()
+            if action < 0.5:
+                g.add_edge(rnd.randrange(90), rnd.randrange(90), 1)
+            elif action < 0.85:
+                edges = list(g.edges)
+                if edges:
+                    e = rnd.choice(edges)
+                    g.remove_edge(e["src"], e["dest"])
+            elif action < 0.93:
+                g.remove_node(rnd.randrange(90))
+            else:
+                g.add_node(rnd.randrange(90))
+            if step % 10 == 0:
+                self.assertSameComponents(index, g)
+        self.assertSameComponents(index, g)
+
+    def test_detach(self):
+        g = DiGraph()
+        for i in range(3):
+            g.add_node(i)
+        index = SCCIndex(g)
+        index.detach()
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 0, 1)
+        self.assertEqual(3, len(index))
+        self.assertEqual([], g.listeners)
@@ -0,0 +1,88 @@
+import math
+import random
+from unittest import TestCase
+
+from src.DiGraph import DiGraph
+from src.SpatialIndex import SpatialIndex
+
+
+class TestSpatialIndex(TestCase):
+
+    def assertSameBox(self, g: DiGraph, box: tuple):
+        xmin, ymin, xmax, ymax = box
+        expected = {k for k, n in g.nodes.items() if xmin <= n.pos[0] <= xmax and ymin <= n.pos[1] <= ymax}
+        found = g.nodes_in_box(*box)
+        self.assertEqual(len(expected), len(found))
+        self.assertEqual(expected, set(found))
+
+    def test_nodes_in_box(self):
+        rnd = random.Random(1)
+        g = DiGraph()
+        for i in range(500):
+            g.add_node(i, (rnd.uniform(0, 100), rnd.uniform(0, 10), 0.0))
+        boxes = [(0, 0, 100, 10), (20, 2, 40, 5), (-50, -50, 500, 500), (50, 5, 50, 5), (200, 0, 300, 10),
+                 (30, 8, 10, 2)]
+        for box in boxes:
+            self.assertSameBox(g, box)
+        # the index follows the changes made on the graph
+        for i in range(500, 3000):
+            g.add_node(i, (rnd.uniform(-100, 200), rnd.uniform(0, 10), 0.0))
+        g.add_nodes(range(3000, 3100), [(150.0, 5.0, 0.0)] * 100)
+        for i in range(0, 3000, 3):
+            g.remove_node(i)
+        g.remove_nodes(range(3000, 3050))
+        for box in boxes:
+            self.assertSameBox(g, box)
+        self.assertEqual(g.v_size(), len(g.spatial_index()))
+        g.remove_nodes(list(g.nodes))
+        self.assertEqual([], g.nodes_in_box(-1000, -1000, 1000, 1000))
+        g.add_node(0, (1.0, 1.0, 0.0))
+        self.assertEqual([0], g.nodes_in_box(0, 0, 2, 2))
+
+    def test_degenerate(self):
+        index = SpatialIndex((i, (5.0, float(i))) for i in range(100))
+        self.assertEqual(set(range(10, 21)), set(index.in_box(0, 10, 10, 20)))
+        index = SpatialIndex((i, (1.0, 1.0)) for i in range(10))
+        self.assertEqual(10, len(index.in_box(1, 1, 1, 1)))
+        self.assertEqual([], SpatialIndex().in_box(0, 0, 1, 1))
+
+    def test_nearest_nodes(self):
+        rnd = random.Random(2)
+        g = DiGraph()
+        g.add_nodes(range(2000), [(rnd.uniform(0, 100), rnd.uniform(0, 10), 0.0) for _ in range(2000)])
+        queries = [(rnd.uniform(-20, 120), rnd.uniform(-5, 15)) for _ in range(100)] + [(1000.0, -1000.0)]
+
+        def expected(x, y, k):
+            return sorted(math.dist((x, y), n.pos[:2]) for n in g.nodes.values())[:k]
+
+        for k in (1, 3, 40):
+            batch = g.nearest_nodes_batch(queries, k)
+            self.assertEqual((len(queries), k), batch.shape)
+            for (x, y), row in zip(queries, batch.tolist()):
+                exp = expected(x, y, k)
+                for found in (g.nearest_nodes(x, y, k), row):
+                    self.assertEqual(k, len(found))
+                    for key, d in zip(found, exp):
+                        self.assertAlmostEqual(d, math.dist((x, y), g.nodes[key].pos[:2]))
+        # the index follows the changes made on the graph
+        closest = g.nearest_nodes(50, 5)[0]
+        g.remove_node(closest)
+        self.assertNotEqual(closest, g.nearest_nodes(50, 5)[0])
+        g.add_node(5000, (50.0, 5.0, 0.0))
+        self.assertEqual([5000], g.nearest_nodes(50, 5))
+        self.assertEqual([[5000]], g.nearest_nodes_batch([(50.0, 5.0)]).tolist())
+        self.assertEqual(2000, len(g.nearest_nodes(0, 0, 5000)))
+        self.assertEqual([], DiGraph().nearest_nodes(0, 0))
+
+    def test_thin(self):
+        # points spread along x only (or exactly on a line) still get a grid of about one cell per point
+        rnd = random.Random(3)
+        for height in (1e-5, 0.0):
+            g = DiGraph()
+            g.add_nodes(range(1000), [(rnd.uniform(0, 1), rnd.uniform(0, height), 0.0) for _ in range(1000)])
+            queries = [(rnd.uniform(0, 1), 0.0) for _ in range(20)]
+            for (x, y), row in zip(queries, g.nearest_nodes_batch(queries, 2).tolist()):
+                self.assertEqual(g.nearest_nodes(x, y, 2), row)
+                exp = min(math.dist((x, y), n.pos[:2]) for n in g.nodes.values())
+                self.assertAlmostEqual(exp, math.dist((x, y), g.nodes[row[0]].pos[:2]))
+            self.assertEqual(1000, len(g.nodes_in_box(0, -1, 1, 1)))
@@ -0,0 +1,159 @@
+"""
+This file holds the all pairs shortest paths of a graph, computed by GraphAlgo.all_pairs_shortest_paths.
+1. graphs of up to dense_limit nodes are solved with the Floyd-Warshall algorithm on a dense |V|x|V| NumPy matrix.
+   the loop over the middle node k stays in Python, but each of its |V| steps relaxes the whole matrix at once
+   (d = min(d, d[:, k] + d[k, :])) in NumPy, so the O(|V|^3) work runs at C speed.
+2. larger graphs (or when NumPy is not installed) run one heap Dijkstra search per node (see Dijkstra.py), which
+   is O(|V|*|E|*log(|V|)) instead of O(|V|^3) and doesn't need the dense matrix.
+the paths are kept optionally: as a successor matrix (the next node on the path from i to j) for Floyd-Warshall,
+and as the parents of each search for Dijkstra.
+"""
+from math import inf
+
+from src.CSRGraph import out_items_of
+from src.Dijkstra import dijkstra, build_path
+
+DENSE_LIMIT = 1000
+
+
+class AllPairsShortestPaths:
+    """
+    This class holds the shortest path distances (and optionally the paths) between all pairs of nodes of a graph.
+    each object contains:
+    1. keys(list): the keys of the nodes, by index. index(dict): the index of each node, by key.
+    2. dist: for Floyd-Warshall, a |V|x|V| NumPy matrix of the distances by index (inf if there is no path).
+       for Dijkstra, a list with a {key: distance} dict per source index.
+    3. succ: the successor matrix (Floyd-Warshall) or the list of the parents dicts (Dijkstra), None if paths were
+       not kept.
+    4. method(str): "floyd_warshall" or "dijkstra".
+    """
+
+    def __init__(self, keys: list, dist, succ=None, method: str = "floyd_warshall"):
+        self.keys = keys
+        self.index = {k: i for i, k in enumerate(keys)}
+        self.dist = dist
+        self.succ = succ
+        self.method = method
+
+    def __str__(self):
+        """
+        Override method for string representation of the all pairs shortest paths.
+        """
+        return f"AllPairsShortestPaths: |V|={len(self.keys)} , method={self.method}"
+
+    def __repr__(self):
+        """
+        Override method for string representation of the all pairs shortest paths.
+        """
+        return str(self)
+
+    def __contains__(self, key):
+        """
+        Override method to check if a node is covered by the table.
+        """
+        return key in self.index
+
+    def distance(self, id1, id2) -> float:
+        """
+        Returns the distance of the shortest path from id1 to id2, inf if there is no path or a node is missing.
+        """
+        if id1 not in self.index or id2 not in self.index:
+            return inf
+        if self.method == "dijkstra":
+            return self.dist[self.index[id1]].get(id2, inf)
+        return float(self.dist[self.index[id1], self.index[id2]])
+
+    def path(self, id1, id2) -> list:
+        """
+        Returns the list of the nodes on the shortest path from id1 to id2, [] if there is no path.
+        Raises ValueError if the paths were not kept.
+        """
+        if self.succ is None:
+            raise ValueError("the paths were not kept, use paths=True")
+        if self.distance(id1, id2) == inf:
+            return []
+        if self.method == "dijkstra":
+            return build_path(self.succ[self.index[id1]], id1, id2)
+        i = self.index[id1]
+        j = self.index[id2]
+        ans = [id1]
+        while i != j:
+            i = int(self.succ[i, j])
+            ans.append(self.keys[i])
+        return ans
+
+    def eccentricities(self) -> dict:
+        """
+        Returns {key: the distance from the node to the node farthest from it}, inf if some node is unreachable.
+        """
+        if self.method == "dijkstra":
+            n = len(self.keys)
+            return {k: max(d.values()) if len(d) == n else inf for k, d in zip(self.keys, self.dist)}
+        return dict(zip(self.keys, self.dist.max(axis=1).tolist())) if self.keys else {}
+
+
+def all_pairs_shortest_paths(g, paths: bool = False, dense_limit: int = DENSE_LIMIT) -> AllPairsShortestPaths:
+    """
+    Computes the shortest paths between all pairs of nodes of g.
+    @param g: The graph (any GraphInterface implementation)
+    @param paths: if True the paths are kept too (a successor matrix doubles the memory of Floyd-Warshall)
+    @param dense_limit: graphs with more nodes than this run Dijkstra from every node instead of Floyd-Warshall
+    @return: An AllPairsShortestPaths object
+    """
+    keys = list(g.get_all_v())
+    if len(keys) <= dense_limit:
+        try:
+            return _floyd_warshall(g, keys, paths)
+        except ImportError:
+            pass
+    dist = []
+    succ = [] if paths else None
+    for key in keys:
+        dists, parents = dijkstra(g, key)
+        dist.append(dists)
+        if paths:
+            succ.append(parents)
+    return AllPairsShortestPaths(keys, dist, succ, "dijkstra")
+
+
+def _floyd_warshall(g, keys: list, paths: bool) -> AllPairsShortestPaths:
+    import numpy as np
+    n = len(keys)
+    index = {k: i for i, k in enumerate(keys)}
+    out_items = out_items_of(g)
+    rows = []
+    cols = []
+    weights = []
+    for i, k in enumerate(keys):
+        for neighbor, w in out_items(k):
+            rows.append(i)
+            cols.append(index[neighbor])
+            weights.append(w)
+    d = np.full((n, n), inf)
+    d[rows, cols] = weights
+    np.fill_diagonal(d, 0.0)
+    succ = None
+    if paths:
+        succ = np.full((n, n), -1, dtype=np.int32 if n < 2 ** 31 else np.int64)
+        succ[rows, cols] = cols
+        np.fill_diagonal(succ, np.arange(n))
+    buf = np.empty_like(d)
+    for k in range(n):
+        col = d[:, k]
+        # only the rows which reach k can improve through it. when most rows do, relaxing the whole matrix in place
+        # is cheaper than gathering them (the other rows add inf and stay as they are)
+        reach = np.flatnonzero(col < inf)
+        if 2 * len(reach) >= n:
+            # step k doesn't change row k or column k, so the matrix can be updated while it is read
+            cand = np.add(col[:, None], d[k], out=buf)
+            if succ is not None:
+                better = cand < d
+                succ[better] = np.broadcast_to(succ[:, k, None], (n, n))[better]
+            np.minimum(d, cand, out=d)
+        elif len(reach) > 0:
+            cand = col[reach, None] + d[k]
+            if succ is not None:
+                better = cand < d[reach]
+                succ[reach] = np.where(better, succ[reach, k, None], succ[reach])
+            d[reach] = np.minimum(d[reach], cand)
+    return AllPairsShortestPaths(keys, d, succ, "floyd_warshall")
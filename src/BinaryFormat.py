@@ -0,0 +1,88 @@
+"""
+This file holds the binary on-disk format of a graph, written by GraphAlgo.save_to_binary and read by
+GraphAlgo.load_from_binary. the file is a flat dump of a CSRGraph (see CSRGraph.py), all numbers little endian:
+1. header: magic b"DWG1", version (uint32), |V| (int64), |E| (int64), mc (int64) - 32 bytes.
+2. keys: int64[|V|], pos: float64[3*|V|] (x,y,z of each node).
+3. offsets: int64[|V|+1], targets: int32[|E|], weights: float64[|E|] - the out edges.
+4. r_offsets: int64[|V|+1], r_sources: int32[|E|], r_weights: float64[|E|] - the in edges.
+each array starts on an 8 bytes boundary (int32 arrays are padded), so the file can be memory mapped and its arrays
+used in place through memoryview casts - loading a mapped file copies nothing but the key to index dict.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from src.CSRGraph import CSRGraph
+
+MAGIC = b"DWG1"
+VERSION = 1
+HEADER = struct.Struct("<4sIqqq")
+# (attribute, array typecode, number of items as a function of |V| and |E|)
+LAYOUT = (("keys", "q", lambda n, m: n), ("pos", "d", lambda n, m: 3 * n),
+          ("offsets", "q", lambda n, m: n + 1), ("targets", "i", lambda n, m: m), ("weights", "d", lambda n, m: m),
+          ("r_offsets", "q", lambda n, m: n + 1), ("r_sources", "i", lambda n, m: m),
+          ("r_weights", "d", lambda n, m: m))
+LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+
+def save_binary(g, file_name: str) -> None:
+    """
+    Writes the graph g to file_name in the binary format.
+    @param g: a CSRGraph, or any GraphInterface implementation (which is frozen to a CSRGraph first)
+    @param file_name: The path to the out file
+    """
+    if not isinstance(g, CSRGraph):
+        g = CSRGraph.from_graph(g)
+    with open(file_name, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, g.v_size(), g.e_size(), g.get_mc()))
+        for name, code, _ in LAYOUT:
+            a = getattr(g, name)
+            if not isinstance(a, array) or a.typecode != code or not LITTLE_ENDIAN:
+                a = array(code, a)
+                if not LITTLE_ENDIAN:
+                    a.byteswap()
+            data = a.tobytes()
+            f.write(data)
+            f.write(bytes(_padding(len(data))))
+
+
+def load_binary(file_name: str, use_mmap: bool = True) -> CSRGraph:
+    """
+    Reads a graph in the binary format.
+    @param file_name: The path to the file
+    @param use_mmap: if True the file is memory mapped and the arrays of the returned graph are views of it (no copy),
+    otherwise (or on big endian machines) the arrays are read into memory.
+    @return: A CSRGraph of the graph in the file
+    Raises ValueError if the file is not in the binary format, IOError if it can't be read.
+    """
+    with open(file_name, "rb") as f:
+        if use_mmap and LITTLE_ENDIAN:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            data = memoryview(f.read())
+    if len(data) < HEADER.size:
+        raise ValueError(f"{file_name} is not a graph binary file")
+    magic, version, n, m, mc = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{file_name} is not a graph binary file (version {VERSION})")
+    arrays = []
+    offset = HEADER.size
+    for name, code, count in LAYOUT:
+        size = array(code).itemsize * count(n, m)
+        if offset + size > len(data):
+            raise ValueError(f"{file_name} is truncated")
+        part = data[offset:offset + size]
+        if use_mmap and LITTLE_ENDIAN:
+            part = part.cast(code)
+        else:
+            part = array(code, part.tobytes())
+            if not LITTLE_ENDIAN:
+                part.byteswap()
+        arrays.append(part)
+        offset += size + _padding(size)
+    return CSRGraph(*arrays, mc=mc)
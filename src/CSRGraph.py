@@ -0,0 +1,266 @@
+from array import array
+
+from src.GraphInterface import GraphInterface
+
+
+class CSRGraph(GraphInterface):
+    """
+    This class is an immutable, compact snapshot of a directed weighted graph in Compressed Sparse Row (CSR) format.
+    it is created by DiGraph.freeze() and is meant for read heavy algorithms (GraphAlgo accepts it as its graph).
+    the nodes are numbered 0..n-1 (their index) and each edge is stored once per direction in flat arrays:
+    1. keys(array): the key of each node, by index. index(dict): the index of each node, by key.
+    2. pos(array): the positions of the nodes, 3 floats (x,y,z) per node (shorter positions are padded with 0).
+    3. offsets(array): the out edges of node i are at offsets[i]..offsets[i+1]-1 of targets and weights.
+    4. targets(array): the index of the dest node of each out edge. weights(array): the weight of each out edge.
+    5. r_offsets, r_sources, r_weights: the same for the in edges (a reverse CSR).
+    6. mc(int): the mc of the graph at the time it was frozen.
+    the arrays can be any sequence supporting indexing and slicing (array.array, memoryview, NumPy arrays).
+    """
+
+    def __init__(self, keys, pos, offsets, targets, weights, r_offsets, r_sources, r_weights, mc: int = 0):
+        """
+        This is the constructor of the snapshot, usually called by from_graph or by DiGraph.freeze().
+        """
+        self.keys = keys
+        self.index = {k: i for i, k in enumerate(keys)}
+        self.pos = pos
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.r_offsets = r_offsets
+        self.r_sources = r_sources
+        self.r_weights = r_weights
+        self.mc = mc
+
+    @classmethod
+    def from_graph(cls, g: GraphInterface):
+        """
+        Builds a CSR snapshot of any GraphInterface implementation.
+        @param g: The graph to freeze
+        @return: A new CSRGraph holding the same nodes and edges
+        @raise ValueError: if a key is not an int of 64 bits (the keys are stored in a flat array)
+        """
+        try:
+            keys = array("q", g.get_all_v())
+        except (TypeError, OverflowError):
+            bad = next(k for k in g.get_all_v() if type(k) is not int or not -2 ** 63 <= k < 2 ** 63)
+            raise ValueError(f"a CSRGraph needs 64 bit int keys, got {bad!r}") from None
+        index = {k: i for i, k in enumerate(keys)}
+        pos = array("d")
+        offsets = array("q", [0])
+        targets = array("i")
+        weights = array("d")
+        r_offsets = array("q", [0])
+        r_sources = array("i")
+        r_weights = array("d")
+        get_pos = pos_of(g)
+        for k in keys:
+            p = get_pos(k)
+            if p is None:
+                p = (0.0, 0.0, 0.0)
+            elif len(p) != 3:
+                # the array holds exactly 3 floats per node: 2D positions get z = 0, longer ones are cut
+                p = (tuple(p) + (0.0, 0.0, 0.0))[:3]
+            pos.extend(p)
+            out_edges = g.all_out_edges_of_node(k)
+            targets.extend(index[d] for d in out_edges)
+            weights.extend(out_edges.values())
+            offsets.append(len(targets))
+            in_edges = g.all_in_edges_of_node(k)
+            r_sources.extend(index[s] for s in in_edges)
+            r_weights.extend(in_edges.values())
+            r_offsets.append(len(r_sources))
+        return cls(keys, pos, offsets, targets, weights, r_offsets, r_sources, r_weights, g.get_mc())
+
+    def __getstate__(self):
+        """
+        Override method for pickling, the arrays are copied so snapshots backed by memory maps can be pickled too.
+        """
+        state = dict(self.__dict__)
+        state.pop("index")
+        for name, code in (("keys", "q"), ("pos", "d"), ("offsets", "q"), ("targets", "i"), ("weights", "d"),
+                           ("r_offsets", "q"), ("r_sources", "i"), ("r_weights", "d")):
+            if not isinstance(state[name], array):
+                state[name] = array(code, state[name])
+        return state
+
+    def __setstate__(self, state):
+        """
+        Override method for unpickling, rebuilds the key to index mapping.
+        """
+        self.__dict__.update(state)
+        self.index = {k: i for i, k in enumerate(self.keys)}
+
+    def __str__(self):
+        """
+        Override method for string representation of a snapshot.
+        """
+        return f"CSRGraph: |V|={self.v_size()} , |E|={self.e_size()}"
+
+    def __repr__(self):
+        """
+        Override method for string representation of a snapshot.
+        """
+        return str(self)
+
+    def __len__(self):
+        """
+        Override method to define a snapshot's size by it's number of nodes.
+        """
+        return len(self.keys)
+
+    def v_size(self) -> int:
+        """
+        Returns the number of vertices in this graph
+        @return: The number of vertices in this graph
+        """
+        return len(self.keys)
+
+    def e_size(self) -> int:
+        """
+        Returns the number of edges in this graph
+        @return: The number of edges in this graph
+        """
+        return len(self.targets)
+
+    def get_all_v(self) -> dict:
+        """return a dictionary of all the nodes in the Graph, each node is represented using a pair
+         (node_id, node_index)
+        """
+        return self.index
+
+    def get_pos(self, id1: int) -> tuple:
+        """
+        Returns the position (x,y,z) of the node id1.
+        """
+        i = self.index[id1] * 3
+        return self.pos[i], self.pos[i + 1], self.pos[i + 2]
+
+    def out_items(self, id1: int):
+        """
+        Returns an iterator over the (dest key, weight) pairs of the out edges of node id1, read off the arrays.
+        """
+        i = self.index[id1]
+        lo = self.offsets[i]
+        hi = self.offsets[i + 1]
+        return zip(map(self.keys.__getitem__, self.targets[lo:hi]), self.weights[lo:hi])
+
+    def out_keys(self, id1: int):
+        """
+        Returns an iterator over the keys of the out neighbors of node id1.
+        """
+        i = self.index[id1]
+        return map(self.keys.__getitem__, self.targets[self.offsets[i]:self.offsets[i + 1]])
+
+    def in_items(self, id1: int):
+        """
+        Returns an iterator over the (src key, weight) pairs of the in edges of node id1, read off the arrays.
+        """
+        i = self.index[id1]
+        lo = self.r_offsets[i]
+        hi = self.r_offsets[i + 1]
+        return zip(map(self.keys.__getitem__, self.r_sources[lo:hi]), self.r_weights[lo:hi])
+
+    def in_keys(self, id1: int):
+        """
+        Returns an iterator over the keys of the in neighbors of node id1.
+        """
+        i = self.index[id1]
+        return map(self.keys.__getitem__, self.r_sources[self.r_offsets[i]:self.r_offsets[i + 1]])
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        """return a dictionary of all the nodes connected to (into) node_id ,
+        each node is represented using a pair (other_node_id, weight)
+         """
+        if id1 in self.index:
+            return dict(self.in_items(id1))
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        """return a dictionary of all the nodes connected from node_id , each node is represented using a pair
+        (other_node_id, weight)
+        """
+        if id1 in self.index:
+            return dict(self.out_items(id1))
+
+    def get_mc(self) -> int:
+        """
+        Returns the mc of the graph at the time this snapshot was taken, a snapshot never changes.
+        """
+        return self.mc
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """
+        A snapshot is immutable, always returns False.
+        """
+        return False
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        """
+        A snapshot is immutable, always returns False.
+        """
+        return False
+
+    def remove_node(self, node_id: int) -> bool:
+        """
+        A snapshot is immutable, always returns False.
+        """
+        return False
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        """
+        A snapshot is immutable, always returns False.
+        """
+        return False
+
+
+def out_items_of(g):
+    """
+    Returns a function mapping a node key to an iterable of its (dest key, weight) out edges.
+    CSR snapshots are read directly off their arrays, any other graph through all_out_edges_of_node.
+    """
+    if isinstance(g, CSRGraph):
+        return g.out_items
+    out_edges = g.all_out_edges_of_node
+    return lambda n: out_edges(n).items()
+
+
+def in_items_of(g):
+    """
+    Returns a function mapping a node key to an iterable of its (src key, weight) in edges.
+    CSR snapshots are read directly off their arrays, any other graph through all_in_edges_of_node.
+    """
+    if isinstance(g, CSRGraph):
+        return g.in_items
+    in_edges = g.all_in_edges_of_node
+    return lambda n: in_edges(n).items()
+
+
+def pos_of(g):
+    """
+    Returns a function mapping a node key to its position (x,y,z), or None if the node has no position.
+    CSR snapshots are read off their pos array, any other graph through the pos of the nodes of get_all_v.
+    """
+    if isinstance(g, CSRGraph):
+        return g.get_pos
+    nodes = g.get_all_v()
+    return lambda n: getattr(nodes[n], "pos", None)
+
+
+def out_keys_of(g):
+    """
+    Returns a function mapping a node key to an iterable of the keys of its out neighbors.
+    """
+    if isinstance(g, CSRGraph):
+        return g.out_keys
+    out_edges = g.all_out_edges_of_node
+    return lambda n: out_edges(n).keys()
+
+
+def in_keys_of(g):
+    """
+    Returns a function mapping a node key to an iterable of the keys of its in neighbors.
+    """
+    if isinstance(g, CSRGraph):
+        return g.in_keys
+    in_edges = g.all_in_edges_of_node
+    return lambda n: in_edges(n).keys()
@@ -0,0 +1,67 @@
+"""
+This file holds the search for the center of a graph: the node whose eccentricity (its distance to the node farthest
+from it) is the lowest, used by GraphAlgo.center_point.
+computing every eccentricity costs a full Dijkstra search per node. instead, lower bounds of the eccentricities are
+kept, and nodes are only searched while their bound is below the best eccentricity found so far:
+0. a forward and a backward search from any node check that the graph is strongly connected (otherwise there is no
+   center, every node has an infinite eccentricity). they also give that node's eccentricity and the first bounds.
+1. the candidate with the lowest bound is searched forward. the search stops once it passes the best eccentricity
+   (the node can't be the center then), otherwise it gives the node's exact eccentricity.
+2. the farthest node found by that search is searched backward (over the in edges), which gives the distance from every
+   node to it - a lower bound of each node's eccentricity. far nodes make high bounds, which rule out most candidates
+   after a few rounds.
+"""
+from heapq import heapify, heappush, heappop
+from math import inf
+
+from src.Dijkstra import dijkstra
+
+
+def center_point(g, stats: dict = None) -> (int, float):
+    """
+    Finds the center of the graph g.
+    @param g: The graph (any GraphInterface implementation)
+    @param stats: Optional dict, the number of Dijkstra searches run is added to stats["searches"] and their counters
+    (see Dijkstra.py) to the rest of it
+    @return: The key of the center and its eccentricity, or (None, inf) if the graph is empty or not strongly connected
+    """
+    nodes = g.get_all_v()
+    n = len(nodes)
+    if n == 0:
+        return None, inf
+    center = next(iter(nodes))
+    dists, _ = dijkstra(g, center, stats=stats)
+    r_dists, _ = dijkstra(g, center, stats=stats, reverse=True)
+    searches = 2
+    if len(dists) < n or len(r_dists) < n:
+        # some node can't be reached from center or can't reach it, the graph is not strongly connected
+        if stats is not None:
+            stats["searches"] = stats.get("searches", 0) + searches
+        return None, inf
+    best = max(dists.values())
+    lower = dict(r_dists)
+    lower[center] = inf
+    q = [(d, key) for key, d in lower.items() if d < best]
+    heapify(q)
+    while q:
+        bound, v = heappop(q)
+        if bound >= best:
+            break
+        if bound < lower[v]:
+            # the bound was raised since it was pushed
+            heappush(q, (lower[v], v))
+            continue
+        dists, _ = dijkstra(g, v, stats=stats, limit=best)
+        if len(dists) == n and max(dists.values()) < best:
+            best = max(dists.values())
+            center = v
+        far = max(dists, key=dists.__getitem__)
+        r_dists, _ = dijkstra(g, far, stats=stats, reverse=True)
+        searches += 2
+        for key, d in r_dists.items():
+            if d > lower[key]:
+                lower[key] = d
+        lower[v] = inf
+    if stats is not None:
+        stats["searches"] = stats.get("searches", 0) + searches
+    return center, best
@@ -1,45 +1,91 @@
 """
-This file holds an iterative implementation of the Depth First Search algorithm,
-as all of the provided parameters are of the outer wrapping method based on Tarjan.
-each call of this method is called with the updated elements' such as the id list and scc list, for doing a kind of
-iterative callbacks to match the idea of the recursive algorithm.
+This file holds an iterative implementation of the Depth First Search algorithm of Tarjan's SCC algorithm,
+as all of the provided parameters are of the outer wrapping method based on Tarjan (the connected components methods
+of GraphAlgo), which calls it once for each node not yet assigned to a component.
+the recursion is replaced by an explicit stack of (node, neighbors iterator) frames. each frame keeps its own iterator,
+so when the search returns to a node it continues from the next neighbor instead of scanning its out edges again -
+every edge is looked at once and a whole search costs O(V+E).
+a second stack (the component stack) holds the visited nodes which weren't assigned to a component yet. a node is
+the root of a component when its low link equals its own id, and then the component is popped off that stack.
+the components are collected as lists of node keys, so the search runs on any GraphInterface (including CSRGraph).
 """
+from src.CSRGraph import out_keys_of
 
 
-def depth_first_search(g, n, low_link, id_dict, scc_list, scc_set, itr):
-    nodes = g.get_all_v()
-    scc = {}
-    s = [n, ]
+def depth_first_search(g, n, low_link, id_dict, scc_list, scc_set, itr, within=None, stats: dict = None):
+    """
+    Runs Tarjan's depth first search from node n.
+    @param g: The graph to search on
+    @param n: The key of the node to start from (must not be visited yet)
+    @param low_link: {key: the lowest id reachable from the node's subtree through nodes not yet in a component}
+    @param id_dict: {key: the order in which the node was visited}
+    @param scc_list: the list of components found so far, the components found by this search are appended to it
+    @param scc_set: the set of nodes already assigned to a component
+    @param itr: the next free id
+    @param within: optional set of keys, if given the search is restricted to the subgraph induced by these nodes
+    @param stats: optional dict, if given stats["max_depth"] is raised to the deepest frame stack of the search and
+    stats["visited"] counts the nodes visited
+    @return: the next free id after this search
+    """
+    out_keys = out_keys_of(g)
+    if within is not None:
+        out_keys = _restricted(out_keys, within)
+    stack = [n]
+    id_dict[n] = itr
+    low_link[n] = itr
+    itr = itr + 1
+    s = [(n, iter(out_keys(n)))]
+    push_frame = s.append
+    if stats is not None:
+        push_frame = _deepest(stats, s)
+        stats["visited"] = stats.get("visited", 0) + 1
     while s:
-        n = s[-1]
-        flag = True
-        if n not in id_dict:
-            id_dict[n] = itr
-            low_link[n] = itr
-            scc[itr] = [nodes[n], ]
-            itr = itr + 1
-        out_edges = g.all_out_edges_of_node(n)
-        for neighbor in out_edges:
+        n, neighbors = s[-1]
+        for neighbor in neighbors:
             if neighbor not in id_dict:
-                flag = False
-                s.append(neighbor)
+                id_dict[neighbor] = itr
+                low_link[neighbor] = itr
+                itr = itr + 1
+                stack.append(neighbor)
+                push_frame((neighbor, iter(out_keys(neighbor))))
                 break
-        if flag:
-            min_link = low_link[n]
-            for neighbor in g.all_out_edges_of_node(n):
-                if neighbor not in scc_set:
-                    if low_link[n] > low_link[neighbor]:
-                        low_link[n] = low_link[neighbor]
-            curr = low_link[n]
-            if curr is not id_dict[n]:
-                if curr not in scc:
-                    scc[curr] = []
-                scc[curr].extend(scc[min_link])
-                for i in scc[min_link]:
-                    key = i.key
-                    low_link[key] = low_link[n]
-            else:
-                scc_list.append(scc[low_link[n]])
-                for i in scc[low_link[n]]:
-                    scc_set.update([i.key])
+            if neighbor not in scc_set and id_dict[neighbor] < low_link[n]:
+                low_link[n] = id_dict[neighbor]
+        else:
             s.pop()
+            if s:
+                parent = s[-1][0]
+                if low_link[n] < low_link[parent]:
+                    low_link[parent] = low_link[n]
+            if low_link[n] == id_dict[n]:
+                scc = []
+                while True:
+                    key = stack.pop()
+                    scc_set.add(key)
+                    scc.append(key)
+                    if key == n:
+                        break
+                scc_list.append(scc)
+    return itr
+
+
+def _deepest(stats: dict, s: list):
+    """
+    Returns a version of s.append which also keeps stats["max_depth"] (and stats["visited"]) up to date.
+    """
+    stats["max_depth"] = max(stats.get("max_depth", 0), len(s))
+
+    def push_frame(frame):
+        s.append(frame)
+        stats["visited"] += 1
+        if len(s) > stats["max_depth"]:
+            stats["max_depth"] = len(s)
+
+    return push_frame
+
+
+def _restricted(out_keys, within):
+    """
+    Wraps an out neighbors function so it only yields the neighbors in the set within.
+    """
+    return lambda key: filter(within.__contains__, out_keys(key))
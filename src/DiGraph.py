@@ -1,7 +1,13 @@
 import random
+import time
+import warnings
+from array import array
+from itertools import repeat
 from typing import Tuple
 
+from src.CSRGraph import CSRGraph
 from src.GraphInterface import GraphInterface
+from src.SpatialIndex import SpatialIndex
 
 
 class Node:
@@ -12,9 +18,13 @@ class Node:
     2. pos: a Tuple representing a 3D position (x,y,z)
     3. e_in: a dict containing all edges going into this node. {src(int): weight(float)}
     4. e_out: a dict containing all edges going out of this node. {dest(int): weight(float)}
+    5. epoch: the epoch of the graph when the node was created or copied (see DiGraph.snapshot).
+    the attributes are declared in __slots__, so a node carries no per-instance __dict__.
     """
 
-    def __init__(self, key: int, pos: Tuple = None, edges_in: dict = None, edges_out: dict = None):
+    __slots__ = ("key", "pos", "e_in", "e_out", "epoch")
+
+    def __init__(self, key: int, pos: Tuple = None, edges_in: dict = None, edges_out: dict = None, epoch: int = 0):
         """
         This is the constructor of the node.
         each node contains:
@@ -26,6 +36,7 @@ class Node:
         4. e_out(dict): a dictionary containing all out edges of this node.
            each edge is formatted: {<dest key>: <weight>}
            if out edges not provided initializing an empty dict.
+        5. epoch(int): the epoch of the graph the node belongs to, default: 0.
         """
         self.key = key
         if pos is None:
@@ -39,6 +50,7 @@ class Node:
             self.e_out = {}
         else:
             self.e_out = edges_out
+        self.epoch = epoch
 
     def __str__(self):
         """
@@ -68,14 +80,177 @@ class Node:
         return self.e_out[other_key]
 
 
+class EdgeView:
+    """
+    This class is a read only view of all the edges in a graph.
+    it holds no edges of its own - the edges are read from the nodes' e_out dicts, which already index each edge by
+    its src and dest keys. that way removing an edge or a node only touches the dicts of the nodes involved.
+    iterating over the view yields each edge as: {"src": <src key>, "w": <weight>, "dest": <dest key>}.
+    """
+
+    def __init__(self, graph):
+        """
+        This is the constructor of the view.
+        graph: the DiGraph whose edges are viewed.
+        """
+        self.graph = graph
+
+    def __len__(self):
+        """
+        Override method to define the view's size by the number of edges in graph.
+        """
+        return self.graph.e_size()
+
+    def __iter__(self):
+        """
+        Override method for iterating over the edges, each edge is yielded as a {"src", "w", "dest"} dict.
+        """
+        for n in self.graph.nodes.values():
+            src = n.key
+            for dest, w in n.e_out.items():
+                yield {"src": src, "w": w, "dest": dest}
+
+    def __contains__(self, e):
+        """
+        Override method for checking if an edge is in graph in O(1).
+        the edge can be given as a {"src", "w", "dest"} dict (the weight must match) or as a (src, dest) tuple.
+        """
+        if isinstance(e, dict):
+            n = self.graph.nodes.get(e.get("src"))
+            return n is not None and e.get("dest") in n.e_out and n.e_out[e.get("dest")] == e.get("w")
+        src, dest = e
+        n = self.graph.nodes.get(src)
+        return n is not None and dest in n.e_out
+
+    def __repr__(self):
+        """
+        Override method for string representation of the view.
+        """
+        return f"EdgeView: |E|={len(self)}"
+
+
+class GraphSnapshot(GraphInterface):
+    """
+    This class is a read only, consistent view of a DiGraph at the time it was taken (see DiGraph.snapshot).
+    it shares the nodes (and their edges dicts) with the graph: the graph never writes to a node it shares with a
+    snapshot, but replaces the node with a copy first (copy on write), so the view doesn't change while the graph does.
+    each snapshot contains:
+    1. nodes(dict): the nodes of the graph, mapped by their keys. edges(EdgeView): a view of all its edges.
+    2. ec(int), mc(int): the number of edges and the mc of the graph at the time the snapshot was taken.
+    """
+
+    def __init__(self, nodes: dict, ec: int, mc: int):
+        """
+        This is the constructor of the snapshot, called by DiGraph.snapshot().
+        """
+        self.nodes = nodes
+        self.edges = EdgeView(self)
+        self.ec = ec
+        self.mc = mc
+
+    def __str__(self):
+        """
+        Override method for string representation of a snapshot.
+        """
+        return f"GraphSnapshot: |V|={self.v_size()} , |E|={self.e_size()} , mc={self.mc}"
+
+    def __repr__(self):
+        """
+        Override method for string representation of a snapshot.
+        """
+        return str(self)
+
+    def __len__(self):
+        """
+        Override method to define a snapshot's size by it's number of nodes.
+        """
+        return len(self.nodes)
+
+    def v_size(self) -> int:
+        """
+        Returns the number of vertices in the snapshot.
+        """
+        return len(self.nodes)
+
+    def e_size(self) -> int:
+        """
+        Returns the number of edges in the snapshot.
+        """
+        return self.ec
+
+    def get_all_v(self) -> dict:
+        """
+        Returns the dict of the nodes in the snapshot, mapped by their keys.
+        """
+        return self.nodes
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        """
+        Returns {src key: weight} of the in edges of the node, None if the node is not in the snapshot.
+        """
+        n = self.nodes.get(id1)
+        if n is not None:
+            return n.e_in
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        """
+        Returns {dest key: weight} of the out edges of the node, None if the node is not in the snapshot.
+        """
+        n = self.nodes.get(id1)
+        if n is not None:
+            return n.e_out
+
+    def get_mc(self) -> int:
+        """
+        Returns the mc of the graph at the time the snapshot was taken.
+        """
+        return self.mc
+
+    def freeze(self) -> CSRGraph:
+        """
+        Creates an immutable CSR snapshot of this view (see DiGraph.freeze).
+        """
+        return CSRGraph.from_graph(self)
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """
+        A snapshot is read only, always returns False.
+        """
+        return False
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        """
+        A snapshot is read only, always returns False.
+        """
+        return False
+
+    def remove_node(self, node_id: int) -> bool:
+        """
+        A snapshot is read only, always returns False.
+        """
+        return False
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        """
+        A snapshot is read only, always returns False.
+        """
+        return False
+
+
 class DiGraph(GraphInterface):
     """
     This class is an implementation of GraphInterface.
     each Directed Weighted Graph contains:
     1. nodes(dict): a dictionary contains all nodes in graph, mapped by their keys.
-    2. edges(edges): a list contains all edges in graph. each edge is represented: {<src key>, <weight>, <dest key>}.
+    2. edges(EdgeView): a view of all edges in graph, backed by the nodes' e_out dicts.
+       each edge is represented: {<src key>, <weight>, <dest key>}.
     3. ec(int): counting the number of edges in graph.
     4. mc(int): counting the changes being made on graph.
+    5. listeners(list): objects notified of every change made on graph (see add_listener).
+    6. spatial(SpatialIndex): a grid index of the nodes positions, built by the first nodes_in_box or nearest_nodes
+       call and kept up to date by every node added or removed since (None until then).
+    7. epoch(int): counts the snapshots taken (see snapshot), nodes of an older epoch may be shared with a snapshot.
+    8. writes(int): counts the changes started and finished, so it is odd while a change is applied (see snapshot).
     """
 
     def __init__(self, nodes: dict = None, edges: list = None, ec: int = 0, mc: int = 0):
@@ -83,20 +258,26 @@ class DiGraph(GraphInterface):
         This is the graph constructor.
         each graph initialized:
         1. nodes: dict, default: empty dict.
-        2. edges: list, default: empty list.
+        2. edges: deprecated and ignored, the edges are a view of the given nodes' e_out dicts. kept in its place so
+           callers passing ec and mc by position still work.
         3. ec: int, default: 0.
         4. mc: int, default: 0.
         """
+        if edges is not None:
+            warnings.warn("DiGraph(edges=...) is ignored, the edges are read from the nodes", DeprecationWarning,
+                          stacklevel=2)
         if nodes is None:
             self.nodes = {}
         else:
             self.nodes = nodes
-        if edges is None:
-            self.edges = []
-        else:
-            self.edges = edges
+        self.edges = EdgeView(self)
         self.ec = ec
         self.mc = mc
+        self.listeners = []
+        self.spatial = None
+        self.epoch = 0
+        self.writes = 0
+        self.last_snapshot = None
 
     def __str__(self):
         """
@@ -116,6 +297,14 @@ class DiGraph(GraphInterface):
         """
         return len(self.nodes)
 
+    def __getstate__(self):
+        """
+        Override method for pickling (and copy.deepcopy), the last snapshot is left out.
+        """
+        state = self.__dict__.copy()
+        state["last_snapshot"] = None
+        return state
+
     def v_size(self) -> int:
         """
         Returns the number of vertices in this graph
@@ -160,6 +349,118 @@ class DiGraph(GraphInterface):
         """
         return self.mc
 
+    @classmethod
+    def from_csr(cls, csr: CSRGraph):
+        """
+        Creates a new (mutable) graph holding the nodes and edges of a CSR snapshot.
+        @param csr: The snapshot to copy
+        @return: A new DiGraph
+        """
+        g = cls()
+        keys = csr.keys
+        g.add_nodes(keys, map(csr.get_pos, keys))
+        srcs = array("q")
+        for i in range(len(keys)):
+            srcs.extend(keys[i] for _ in range(csr.offsets[i + 1] - csr.offsets[i]))
+        g.add_edges(zip(srcs, map(keys.__getitem__, csr.targets), csr.weights))
+        return g
+
+    def freeze(self) -> CSRGraph:
+        """
+        Creates an immutable, compact CSR (Compressed Sparse Row) snapshot of this graph.
+        the snapshot stores the edges in flat arrays (and a reverse copy for the in edges), and can be given to
+        GraphAlgo for read heavy algorithms. later changes to this graph are not reflected in the snapshot.
+        @return: A CSRGraph of the current state of this graph
+        @raise ValueError: if a key is not an int of 64 bits
+        """
+        return CSRGraph.from_graph(self)
+
+    def spatial_index(self) -> SpatialIndex:
+        """
+        Returns the spatial index of the nodes positions, building it on the first call.
+        from then on every node added to or removed from this graph updates the index as well.
+        """
+        if self.spatial is None:
+            self.spatial = SpatialIndex.from_graph(self)
+        return self.spatial
+
+    def nodes_in_box(self, xmin: float, ymin: float, xmax: float, ymax: float) -> list:
+        """
+        Returns the keys of the nodes whose (x, y) position is inside the given box (borders included).
+        the query runs on the spatial index (see spatial_index), visiting only the grid cells overlapping the box.
+        @return: A list of node keys, in no specific order
+        """
+        return self.spatial_index().in_box(xmin, ymin, xmax, ymax)
+
+    def nearest_nodes(self, x: float, y: float, k: int = 1) -> list:
+        """
+        Returns the k nodes closest to the point (x, y) by euclidean distance, such as to snap raw coordinates to a
+        node. the search runs on the spatial index (see spatial_index), visiting the cells around the point only.
+        for the distances too, use spatial_index().nearest(x, y, k).
+        @return: A list of node keys, the closest first (fewer than k if the graph has fewer nodes)
+        """
+        return [key for key, _ in self.spatial_index().nearest(x, y, k)]
+
+    def nearest_nodes_batch(self, points, k: int = 1):
+        """
+        Returns the k nodes closest to each of many points, computed with NumPy for all the points at once.
+        for the distances too, use spatial_index().nearest_batch(points, k).
+        @param points: a Qx2 array (or a list of (x, y) pairs) of query points
+        @return: A Qxk NumPy array of node keys, the closest first in each row (k is at most the number of nodes)
+        """
+        return self.spatial_index().nearest_batch(points, k)[0]
+
+    def snapshot(self) -> GraphSnapshot:
+        """
+        Returns a consistent, read only view of the current state of this graph, which later changes don't affect.
+        taking a snapshot copies only the nodes dict (not the nodes or edges), and starts a new epoch: the first change
+        to each node afterwards copies that node (and its edges dicts) into the graph, leaving the old one to the
+        snapshot. so readers (such as other threads) can run algorithms on a snapshot while a writer keeps changing
+        the graph. taking a snapshot again before any change returns the same snapshot.
+        the changes are not locked (a lock per change would slow every add_edge down): like a seqlock, writes is odd
+        while a change is applied, and a copy made while it was odd, or during which it changed, is taken again.
+        changes from several threads at once are not supported (they must be serialized by the caller).
+        @return: A GraphSnapshot of the current state of this graph
+        """
+        while True:
+            writes = self.writes
+            if writes % 2 == 0:
+                last = self.last_snapshot
+                if last is not None and last.mc == self.mc:
+                    return last
+                snap = GraphSnapshot(dict(self.nodes), self.ec, self.mc)
+                self.epoch += 1
+                if self.writes == writes:
+                    self.last_snapshot = snap
+                    return snap
+            # a change is being applied by another thread, let it finish
+            time.sleep(0)
+
+    def _own(self, n: Node) -> Node:
+        """
+        Returns a node which may be changed in place: a node which may be shared with a snapshot (of an older epoch)
+        is replaced in the graph by a copy first.
+        """
+        if n.epoch == self.epoch:
+            return n
+        copy = Node(n.key, n.pos, dict(n.e_in), dict(n.e_out), self.epoch)
+        self.nodes[n.key] = copy
+        return copy
+
+    def add_listener(self, listener) -> None:
+        """
+        Registers a listener to be notified after every successful change made on this graph.
+        a listener implements the methods: node_added(key), node_removed(key), edge_added(src, dest, weight)
+        and edge_removed(src, dest). removing a node notifies node_removed only (not the removal of its edges).
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        """
+        Unregisters a listener added by add_listener.
+        """
+        self.listeners.remove(listener)
+
     def add_edge(self, id1: int, id2: int, weight: float) -> bool:
         """
         Adds an edge to the graph.
@@ -171,17 +472,161 @@ class DiGraph(GraphInterface):
         """
         if id1 == id2:
             return False
-        n1 = self.nodes.get(id1)
-        n2 = self.nodes.get(id2)
-        if (n1 is not None) and (n2 is not None) and (n1.e_out.get(id2) is None) and (weight >= 0):
-            n1.e_out[id2] = weight
-            n2.e_in[id1] = weight
-            e = {"src": id1, "w": weight, "dest": id2}
-            self.edges.append(e)
-            self.ec += 1
-            self.mc += 1
-            return True
-        return False
+        self.writes += 1
+        try:
+            n1 = self.nodes.get(id1)
+            n2 = self.nodes.get(id2)
+            if (n1 is not None) and (n2 is not None) and (n1.e_out.get(id2) is None) and (weight >= 0):
+                epoch = self.epoch
+                if n1.epoch != epoch:
+                    n1 = self._own(n1)
+                if n2.epoch != epoch:
+                    n2 = self._own(n2)
+                n1.e_out[id2] = weight
+                n2.e_in[id1] = weight
+                self.ec += 1
+                self.mc += 1
+                for listener in self.listeners:
+                    listener.edge_added(id1, id2, weight)
+                return True
+            return False
+        finally:
+            self.writes += 1
+
+    def add_edges(self, edges) -> int:
+        """
+        Adds many edges in one call.
+        each edge is validated exactly like add_edge does (no self loops, duplicates, negative weights or missing
+        nodes, which are skipped), but the lookups are bound once for the whole batch, and mc is increased once.
+        @param edges: an iterable of (src, dest, weight) triples, or a |E|x3 array (such as a NumPy array)
+        @return: The number of edges added
+        """
+        if getattr(edges, "ndim", 1) == 2:
+            # a 2D array: the columns are converted at once (keys back to ints)
+            cols = edges.T
+            edges = zip(cols[0].astype("int64").tolist(), cols[1].astype("int64").tolist(), cols[2].tolist())
+        self.writes += 1
+        try:
+            nodes = self.nodes
+            listeners = self.listeners
+            epoch = self.epoch
+            added = 0
+            n1 = None
+            for id1, id2, weight in edges:
+                if id1 == id2:
+                    continue
+                # consecutive edges usually share their src (the loaders and from_csr give them grouped by src)
+                if n1 is None or n1.key != id1:
+                    n1 = nodes.get(id1)
+                    if n1 is None:
+                        continue
+                e_out = n1.e_out
+                n2 = nodes.get(id2)
+                # checked last and as "not >= 0" like add_edge, so NaN weights are skipped too
+                if n2 is None or id2 in e_out or not weight >= 0:
+                    continue
+                if n1.epoch != epoch:
+                    n1 = self._own(n1)
+                    e_out = n1.e_out
+                if n2.epoch != epoch:
+                    n2 = self._own(n2)
+                e_out[id2] = weight
+                n2.e_in[id1] = weight
+                added += 1
+                if listeners:
+                    for listener in listeners:
+                        listener.edge_added(id1, id2, weight)
+            if added:
+                self.ec += added
+                self.mc += 1
+            return added
+        finally:
+            self.writes += 1
+
+    def add_nodes(self, node_ids, positions=None) -> int:
+        """
+        Adds many nodes in one call, mc is increased once for the whole batch.
+        @param node_ids: an iterable (or array) of node ids, ids already in the graph are skipped
+        @param positions: optional iterable (or |V|x3 array) of the positions of the nodes, parallel to node_ids.
+        a missing (None) position is randomized like add_node does.
+        @return: The number of nodes added
+        @raise ValueError: if positions and node_ids differ in length (no node is added then)
+        """
+        if hasattr(node_ids, "tolist"):
+            node_ids = node_ids.tolist()
+        if positions is None:
+            positions = repeat(None)
+        else:
+            if hasattr(positions, "tolist"):
+                positions = list(map(tuple, positions.tolist()))
+            elif not hasattr(positions, "__len__"):
+                positions = list(positions)
+            if not hasattr(node_ids, "__len__"):
+                node_ids = list(node_ids)
+            if len(node_ids) != len(positions):
+                raise ValueError(f"{len(node_ids)} node ids but {len(positions)} positions")
+        self.writes += 1
+        try:
+            nodes = self.nodes
+            listeners = self.listeners
+            spatial = self.spatial
+            epoch = self.epoch
+            added = 0
+            for node_id, pos in zip(node_ids, positions):
+                if node_id in nodes:
+                    continue
+                n = Node(node_id, pos, epoch=epoch)
+                nodes[node_id] = n
+                if spatial is not None:
+                    spatial.add(node_id, n.pos)
+                added += 1
+                for listener in listeners:
+                    listener.node_added(node_id)
+            if added:
+                self.mc += 1
+            return added
+        finally:
+            self.writes += 1
+
+    def remove_nodes(self, node_ids) -> int:
+        """
+        Removes many nodes (and their edges) in one call, mc is increased once for the whole batch.
+        @param node_ids: an iterable (or array) of node ids, ids not in the graph are skipped
+        @return: The number of nodes removed
+        """
+        if hasattr(node_ids, "tolist"):
+            node_ids = node_ids.tolist()
+        self.writes += 1
+        try:
+            nodes = self.nodes
+            listeners = self.listeners
+            epoch = self.epoch
+            removed = 0
+            for node_id in node_ids:
+                n = nodes.pop(node_id, None)
+                if n is None:
+                    continue
+                for i in n.e_in:
+                    other = nodes[i]
+                    if other.epoch != epoch:
+                        other = self._own(other)
+                    del other.e_out[node_id]
+                for j in n.e_out:
+                    other = nodes[j]
+                    if other.epoch != epoch:
+                        other = self._own(other)
+                    del other.e_in[node_id]
+                self.ec -= len(n.e_in) + len(n.e_out)
+                if self.spatial is not None:
+                    self.spatial.remove(node_id)
+                removed += 1
+                for listener in listeners:
+                    listener.node_removed(node_id)
+            if removed:
+                self.mc += 1
+            return removed
+        finally:
+            self.writes += 1
 
     def add_node(self, node_id: int, pos: tuple = None) -> bool:
         """
@@ -191,12 +636,20 @@ class DiGraph(GraphInterface):
         @return: True if the node was added successfully, False o.w.
         Note: if the node id already exists the node will not be added
         """
-        if node_id in self.nodes:
-            return False
-        n = Node(node_id, pos)
-        self.nodes[node_id] = n
-        self.mc += 1
-        return True
+        self.writes += 1
+        try:
+            if node_id in self.nodes:
+                return False
+            n = Node(node_id, pos, epoch=self.epoch)
+            self.nodes[node_id] = n
+            if self.spatial is not None:
+                self.spatial.add(node_id, n.pos)
+            self.mc += 1
+            for listener in self.listeners:
+                listener.node_added(node_id)
+            return True
+        finally:
+            self.writes += 1
 
     def remove_node(self, node_id: int) -> bool:
         """
@@ -205,28 +658,31 @@ class DiGraph(GraphInterface):
         @return: True if the node was removed successfully, False o.w.
         Note: if the node id does not exists the function will do nothing
         """
-        if node_id not in self.nodes:
-            return False
-        n = self.nodes[node_id]
-        edges_in = n.e_in
-        edges_out = n.e_out
-        for i in edges_in:
-            self.nodes[i].e_out.pop(node_id)
-            self.ec -= 1
+        self.writes += 1
+        try:
+            if node_id not in self.nodes:
+                return False
+            n = self.nodes[node_id]
+            edges_in = n.e_in
+            edges_out = n.e_out
+            # the removed node itself is left as it is, only its neighbors are changed
+            for i in edges_in:
+                self._own(self.nodes[i]).e_out.pop(node_id)
+                self.ec -= 1
 
-        for j in edges_out:
-            self.nodes[j].e_in.pop(node_id)
-            self.ec -= 1
+            for j in edges_out:
+                self._own(self.nodes[j]).e_in.pop(node_id)
+                self.ec -= 1
 
-        delete = []
-        for k in self.edges:
-            if (k['src'] is node_id) or (k['dest'] is node_id):
-                delete.append(k)
-        for i in delete:
-            self.edges.remove(i)
-        self.nodes.pop(node_id)
-        self.mc += 1
-        return True
+            self.nodes.pop(node_id)
+            if self.spatial is not None:
+                self.spatial.remove(node_id)
+            self.mc += 1
+            for listener in self.listeners:
+                listener.node_removed(node_id)
+            return True
+        finally:
+            self.writes += 1
 
     def remove_edge(self, node_id1: int, node_id2: int) -> bool:
         """
@@ -236,14 +692,19 @@ class DiGraph(GraphInterface):
         @return: True if the edge was removed successfully, False o.w.
         Note: If such an edge does not exists the function will do nothing
         """
-        n1 = self.nodes.get(node_id1)
-        n2 = self.nodes.get(node_id2)
-        e = {'src': node_id1, 'w': n1.e_out.get(node_id2), 'dest': node_id2}
-        if not self.edges.__contains__(e):
-            return False
-        n1.e_out.pop(node_id2)
-        n2.e_in.pop(node_id1)
-        self.edges.remove(e)
-        self.ec -= 1
-        self.mc += 1
-        return True
+        self.writes += 1
+        try:
+            n1 = self.nodes.get(node_id1)
+            if n1 is None or node_id2 not in n1.e_out:
+                return False
+            n1 = self._own(n1)
+            n2 = self._own(self.nodes.get(node_id2))
+            n1.e_out.pop(node_id2)
+            n2.e_in.pop(node_id1)
+            self.ec -= 1
+            self.mc += 1
+            for listener in self.listeners:
+                listener.edge_removed(node_id1, node_id2)
+            return True
+        finally:
+            self.writes += 1
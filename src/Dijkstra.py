@@ -0,0 +1,292 @@
+"""
+This file holds a binary heap implementation of Dijkstra's algorithm, used by GraphAlgo for its shortest path queries.
+the priority queue is a heapq list of (distance, key) pairs. instead of a decrease-key operation a node is pushed again
+whenever its distance improves, and the older (stale) entries are skipped when they're popped.
+that way each node is settled (popped with its final distance) exactly once, and each pop costs O(log(n)) instead of
+the O(n) of popping the head of a plain list.
+the searches can report their work through an optional stats dict, they add to it:
+1. "settled": the number of nodes settled.
+2. "relaxed": the number of edges scanned from the settled nodes.
+3. "pushes": the number of entries pushed into the queue.
+the counters are kept by wrapping the neighbors function and heappush only when a stats dict is given, so a search
+without one runs the plain loop.
+"""
+from heapq import heappush, heappop
+from math import inf, dist
+
+from src.CSRGraph import out_items_of, in_items_of, pos_of
+
+
+def _counted(stats: dict, items, pushes: int = 1):
+    """
+    Returns counting versions of a neighbors function and of heappush, which add to stats["relaxed"] and
+    stats["pushes"]. the queue's first entry is not pushed through heappush, so pushes is counted up front.
+    """
+    for key in ("settled", "relaxed", "pushes"):
+        stats.setdefault(key, 0)
+    stats["pushes"] += pushes
+
+    def counted_items(n):
+        ans = list(items(n))
+        stats["relaxed"] += len(ans)
+        return ans
+
+    def counted_push(q, entry):
+        stats["pushes"] += 1
+        heappush(q, entry)
+
+    return counted_items, counted_push
+
+
+def dijkstra(g, src, dest=None, stats: dict = None, targets=None, limit: float = inf, reverse: bool = False):
+    """
+    Runs Dijkstra's algorithm on graph g starting from the node src.
+    @param g: The graph to search on (a GraphInterface implementation)
+    @param src: The key of the start node
+    @param dest: Optional key of a target node, if given the search stops as soon as dest is settled
+    @param stats: Optional dict the search adds its counters to
+    @param targets: Optional iterable of keys, if given the search stops as soon as all of them are settled
+    @param limit: the search stops before settling a node farther than limit
+    @param reverse: if True the search runs over the in edges, finding the distances from every node to src
+    @return: (dists, parents) - dists maps each reached node to its distance from src,
+    parents maps each reached node (except src) to the key of the node preceding it on the shortest path.
+    Note: when dest (or targets, or limit) is given, only the distances of settled nodes (and dest) are final.
+    """
+    out_items = in_items_of(g) if reverse else out_items_of(g)
+    push = heappush
+    if stats is not None:
+        out_items, push = _counted(stats, out_items)
+    remaining = set(targets) if targets is not None else None
+    dists = {src: 0}
+    parents = {}
+    settled = set()
+    q = [(0, src)]
+    while q:
+        d, n = heappop(q)
+        if n in settled:
+            continue
+        if d > limit:
+            break
+        settled.add(n)
+        if n == dest:
+            break
+        if remaining is not None:
+            remaining.discard(n)
+            if not remaining:
+                break
+        for neighbor, w in out_items(n):
+            curr_dist = d + w
+            if neighbor not in settled and curr_dist < dists.get(neighbor, inf):
+                dists[neighbor] = curr_dist
+                parents[neighbor] = n
+                push(q, (curr_dist, neighbor))
+    if stats is not None:
+        stats["settled"] += len(settled)
+    return dists, parents
+
+
+def bidirectional_dijkstra(g, src, dest, stats: dict = None) -> (float, list):
+    """
+    Finds the shortest path from src to dest by running 2 Dijkstra searches which meet in the middle:
+    a forward search from src over the out edges and a backward search from dest over the in edges.
+    each step advances the side whose queue has the lower top distance. whenever an edge reaches a node which the
+    other side already reached, the path through that node is a candidate, and the searches stop once the sum of the
+    tops of both queues can't beat the best candidate.
+    @param g: The graph to search on
+    @param src: The key of the start node
+    @param dest: The key of the end node
+    @param stats: Optional dict the search adds its counters to
+    @return: The distance of the path and the list of the nodes on it, or (inf, []) if there is no path.
+    """
+    if src == dest:
+        return 0, [src]
+    items = (out_items_of(g), in_items_of(g))
+    push = heappush
+    if stats is not None:
+        out_items, push = _counted(stats, items[0])
+        in_items, _ = _counted(stats, items[1], pushes=1)
+        items = (out_items, in_items)
+    dists = ({src: 0}, {dest: 0})
+    parents = ({}, {})
+    settled = (set(), set())
+    queues = ([(0, src)], [(0, dest)])
+    best = inf
+    meet = None
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        q = queues[side]
+        d, n = heappop(q)
+        if n in settled[side]:
+            continue
+        settled[side].add(n)
+        side_dists = dists[side]
+        side_parents = parents[side]
+        other_dists = dists[1 - side]
+        for neighbor, w in items[side](n):
+            curr_dist = d + w
+            if neighbor not in settled[side] and curr_dist < side_dists.get(neighbor, inf):
+                side_dists[neighbor] = curr_dist
+                side_parents[neighbor] = n
+                push(q, (curr_dist, neighbor))
+            if neighbor in other_dists and neighbor in side_dists:
+                candidate = side_dists[neighbor] + other_dists[neighbor]
+                if candidate < best:
+                    best = candidate
+                    meet = neighbor
+    if stats is not None:
+        stats["settled"] += len(settled[0]) + len(settled[1])
+    if meet is None:
+        return inf, []
+    path = build_path(parents[0], src, meet)
+    itr = meet
+    while itr != dest:
+        itr = parents[1][itr]
+        path.append(itr)
+    return best, path
+
+
+def astar(g, src, dest, heuristic, stats: dict = None) -> (float, list):
+    """
+    Finds the shortest path from src to dest with the A* algorithm: Dijkstra's search where the queue is ordered by
+    the distance from src plus heuristic(node), an estimate of the distance left to dest. the heuristic must be
+    consistent (never more than the weight of an edge plus the estimate at its dest), then every node is still settled
+    once with its final distance, and nodes leading away from dest are settled late or never.
+    @param g: The graph to search on
+    @param src: The key of the start node
+    @param dest: The key of the end node
+    @param heuristic: a function mapping a node key to a lower bound of its distance to dest
+    @param stats: Optional dict the search adds its counters to
+    @return: The distance of the path and the list of the nodes on it, or (inf, []) if there is no path.
+    """
+    out_items = out_items_of(g)
+    push = heappush
+    if stats is not None:
+        out_items, push = _counted(stats, out_items)
+    dists = {src: 0}
+    parents = {}
+    settled = set()
+    q = [(heuristic(src), 0, src)]
+    while q:
+        _, d, n = heappop(q)
+        if n in settled:
+            continue
+        settled.add(n)
+        if n == dest:
+            break
+        for neighbor, w in out_items(n):
+            curr_dist = d + w
+            if neighbor not in settled and curr_dist < dists.get(neighbor, inf):
+                dists[neighbor] = curr_dist
+                parents[neighbor] = n
+                push(q, (curr_dist + heuristic(neighbor), curr_dist, neighbor))
+    if stats is not None:
+        stats["settled"] += len(settled)
+    if dest not in settled:
+        return inf, []
+    return dists[dest], build_path(parents, src, dest)
+
+
+def position_heuristic(g, dest, metric=dist, scale: float = 1.0):
+    """
+    Returns the A* heuristic scale * metric(pos of node, pos of dest), from the positions of the nodes.
+    @param metric: a function of 2 positions (x,y,z), the euclidean distance by default
+    """
+    get_pos = pos_of(g)
+    target = get_pos(dest)
+    return lambda n: scale * metric(get_pos(n), target)
+
+
+def safe_scale(g, metric=dist):
+    """
+    Computes the largest scale for which position_heuristic is consistent on g: the minimum over the edges of
+    weight / metric(pos of src, pos of dest). the result is shrunk by a relative 1e-9 to absorb rounding errors.
+    @return: The scale, or None if some node has no position (then the heuristic can't be used).
+    """
+    get_pos = pos_of(g)
+    out_items = out_items_of(g)
+    ans = inf
+    for n in g.get_all_v():
+        p = get_pos(n)
+        if p is None:
+            return None
+        for neighbor, w in out_items(n):
+            d = metric(p, get_pos(neighbor))
+            if d > 0 and w < ans * d:
+                ans = w / d
+    return ans * (1 - 1e-9) if ans < inf else inf
+
+
+def build_path(parents: dict, src, dest) -> list:
+    """
+    Rebuilds the path from src to dest out of the parents dict of a search.
+    the keys are collected backwards (from dest) and reversed once, so it costs O(path length).
+    @return: the list of keys on the path, starting at src and ending at dest.
+    """
+    path = [dest]
+    itr = dest
+    while itr != src:
+        itr = parents[itr]
+        path.append(itr)
+    path.reverse()
+    return path
+
+
+class ShortestPathTree:
+    """
+    This class represents the result of a full single source search (a shortest path tree).
+    it holds the distances and the parents of all nodes reachable from the source, so many destinations can be
+    queried out of a single search.
+    """
+
+    def __init__(self, src, dists: dict = None, parents: dict = None):
+        """
+        This is the constructor of the tree.
+        1. src: the key of the source node.
+        2. dists(dict): {key: distance from src}, default: empty dict (src is not in the graph).
+        3. parents(dict): {key: key of the previous node on the shortest path}, default: empty dict.
+        """
+        self.src = src
+        if dists is None:
+            dists = {}
+        self.dists = dists
+        if parents is None:
+            parents = {}
+        self.parents = parents
+
+    def __str__(self):
+        """
+        Override method for string representation of a tree.
+        """
+        return f"ShortestPathTree: src={self.src} , |reached|={len(self.dists)}"
+
+    def __repr__(self):
+        """
+        Override method for string representation of a tree.
+        """
+        return str(self)
+
+    def __contains__(self, key):
+        """
+        Override method for checking if a node is reachable from the source.
+        """
+        return key in self.dists
+
+    def distance_to(self, key) -> float:
+        """
+        Returns the distance of the shortest path from the source to the given node in O(1).
+        @param key: The destination node id
+        @return: The distance, or inf if the node isn't reachable (or doesn't exist)
+        """
+        return self.dists.get(key, inf)
+
+    def path_to(self, key) -> list:
+        """
+        Returns the shortest path from the source to the given node in O(path length).
+        @param key: The destination node id
+        @return: The list of the nodes ids that the path goes through, or [] if the node isn't reachable
+        """
+        if key not in self.dists:
+            return []
+        return build_path(self.parents, self.src, key)
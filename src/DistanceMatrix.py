@@ -0,0 +1,72 @@
+"""
+This file holds the many-to-many shortest path distances used by GraphAlgo.distance_matrix.
+one single source Dijkstra search runs per unique source (stopping once all the targets are settled), and the
+searches can be spread over a pool of worker processes. the workers don't get the graph with every task: the pool's
+initializer hands each worker a CSRGraph snapshot once (see CSRGraph.py), which is inherited as is by forked workers
+and pickled as a few flat arrays otherwise, and every task only carries a source key.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from math import inf
+
+from src.CSRGraph import CSRGraph
+from src.Dijkstra import dijkstra
+
+_graph = None
+_targets = None
+
+
+def _init_worker(g, targets) -> None:
+    """
+    Stores the graph snapshot and the targets in the worker process.
+    """
+    global _graph, _targets
+    _graph = g
+    _targets = targets
+
+
+def _row(src) -> list:
+    """
+    Returns the distances from src to each of the targets, in the worker process.
+    """
+    return distances_from(_graph, src, _targets)
+
+
+def distances_from(g, src, targets, stats: dict = None) -> list:
+    """
+    Returns the list of the distances from src to each key in targets (inf if a target is unreachable or missing).
+    """
+    nodes = g.get_all_v()
+    if src not in nodes:
+        return [inf] * len(targets)
+    dists, _ = dijkstra(g, src, stats=stats, targets=[t for t in targets if t in nodes])
+    return [dists.get(t, inf) for t in targets]
+
+
+def distance_matrix(g, sources, targets, workers: int = 1, stats: dict = None) -> list:
+    """
+    Computes the shortest path distances from each of the sources to each of the targets.
+    @param g: The graph (any GraphInterface implementation)
+    @param sources: The keys of the origins (repeated keys are searched once)
+    @param targets: The keys of the destinations
+    @param workers: The number of worker processes, 1 runs all the searches in this process
+    @param stats: Optional dict the searches add their counters to (see Dijkstra.py), when run in this process
+    @return: A list with a row per source, each row a list of the distances to the targets (in the given orders)
+    """
+    sources = list(sources)
+    targets = list(targets)
+    unique = list(dict.fromkeys(sources))
+    if workers <= 1 or len(unique) <= 1:
+        rows = [distances_from(g, src, targets, stats) for src in unique]
+    else:
+        if not isinstance(g, CSRGraph):
+            try:
+                g = CSRGraph.from_graph(g)
+            except ValueError:
+                # keys which are not ints can't be frozen, the workers get the graph as it is
+                pass
+        chunk_size = max(1, len(unique) // (workers * 4))
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(g, targets)) as pool:
+            rows = list(pool.map(_row, unique, chunksize=chunk_size))
+    by_source = dict(zip(unique, rows))
+    # repeated sources get copies of the row, so the rows of the result are independent lists
+    return [list(by_source[src]) for src in sources]
@@ -1,11 +1,25 @@
 import json
-from math import inf
+from array import array
+from math import inf, dist
 from typing import List
-from matplotlib import pyplot as plt
+from src.APSP import all_pairs_shortest_paths, AllPairsShortestPaths, DENSE_LIMIT
+from src.BinaryFormat import save_binary, load_binary
+from src.CSRGraph import pos_of, out_keys_of, in_keys_of
 from src.DiGraph import DiGraph
 from src.GraphAlgoInterface import GraphAlgoInterface
 from src.GraphInterface import GraphInterface
+from src.GraphPlot import plot, LABEL_LIMIT, ARROW_LIMIT, CLUSTER_LIMIT
+from src.Center import center_point
 from src.DFS import depth_first_search
+from src.DistanceMatrix import distance_matrix
+from src.Dijkstra import dijkstra, bidirectional_dijkstra, astar, position_heuristic, safe_scale, build_path, \
+    ShortestPathTree
+from src.JsonStream import iter_json_items
+from src.LRUCache import LRUCache
+from src.TSP import tsp_order
+
+# marks a query missing from the cache, as None is a valid (cached) result
+MISSING = object()
 
 
 class GraphAlgo(GraphAlgoInterface):
@@ -15,117 +29,345 @@ class GraphAlgo(GraphAlgoInterface):
 
     """
 
-    def __init__(self, graph: GraphInterface = None):
+    def __init__(self, graph: GraphInterface = None, cache_size: int = 128):
         """This is the constructor of the class.
-        it has only 1 parameter - a directed weighted graph.
+        it has 2 parameters - a directed weighted graph and the size of the results cache.
+        the graph can also be a frozen CSRGraph snapshot (see DiGraph.freeze()), for read only algorithms.
         if no such graph given, a new graph of the DiGraph implementation is created and initialized.
         else the given graph is initialized as the underlying graph.
+        the results of the queries are memoized in a LRU cache of cache_size results (0 disables it),
+        the cache is cleared whenever the graph's mc changes.
+        stats is None unless the object is instrumented (see Instrumentation.py), then the algorithms add their
+        counters (nodes settled, edges relaxed, queue pushes, DFS depth...) to it.
         """
         if graph is None:
             graph = DiGraph()
         self.g = graph
+        self.cache = LRUCache(cache_size)
+        self.stats = None
+
+    def _cached(self, key: tuple, compute):
+        """
+        Returns the cached result of the query key, or computes (and caches) it if missing.
+        the cache is validated first against the current graph and its mc, so results of older versions are dropped.
+        @param key: the query, a tuple of the method name and its arguments
+        @param compute: a function with no arguments computing the result of the query
+        """
+        self.cache.validate((self.g, self.g.get_mc()))
+        ans = self.cache.get(key, MISSING)
+        if ans is MISSING:
+            ans = compute()
+            self.cache.put(key, ans)
+        return ans
+
+    def cache_info(self) -> dict:
+        """
+        Returns the statistics of the results cache: {"hits", "misses", "size", "maxsize"}.
+        """
+        return self.cache.info()
 
     def get_graph(self) -> GraphInterface:
         """
         return: a shallow copy of the directed graph on which the algorithm works on.
+        the graph is live: for a view which doesn't change while the graph does, see snapshot.
         """
         return self.g
 
+    def snapshot(self):
+        """
+        Returns a new GraphAlgo over a consistent, read only snapshot of the current graph (see DiGraph.snapshot).
+        queries on the returned object are not affected by later changes to the graph, so it can be handed to reader
+        threads while this object's graph keeps changing. taking the snapshot costs a copy of the nodes dict only.
+        a graph without snapshots (such as a frozen CSRGraph, which never changes) is used as it is.
+        @return: A GraphAlgo over the snapshot, with a results cache of the same size as this one
+        """
+        graph = self.g.snapshot() if hasattr(self.g, "snapshot") else self.g
+        return GraphAlgo(graph, self.cache.maxsize)
+
     def load_from_json(self, file_name: str) -> bool:
         """
         Loads a graph from a json file.
+        the file is read incrementally (see JsonStream.py) instead of parsing the whole document at once.
+        the nodes and edges are buffered (the edges in flat arrays, they may appear before the nodes in the file),
+        and inserted with one batch call each (see DiGraph.add_nodes and DiGraph.add_edges). keys which don't fit the
+        arrays (not 64 bit ints, or missing) are kept as they are, the buffers fall back to lists.
         @param file_name: The path to the json file
-        @returns True if the loading was successful, False o.w.
+        @returns True if the loading was successful, False o.w. (the file can't be read or isn't a valid graph file)
         """
         new_graph = DiGraph()
+        keys = array("q")
+        positions = []
+        srcs = array("q")
+        dests = array("q")
+        weights = []
         try:
             with open(file_name, "r") as f:
-                loaded = json.load(f)
-                for i in loaded.get("Nodes"):
-                    id_key = i.get("id")
-                    post = None
-                    if i.get("pos") is not None:
-                        pos = i.get("pos").split(sep=",")
-                        post = (float(pos[0]), float(pos[1]), float(pos[2]))
-                    new_graph.add_node(id_key, post)
-                for i in loaded.get("Edges"):
-                    src = i.get("src")
-                    w = i.get("w")
-                    dest = i.get("dest")
-                    new_graph.add_edge(src, dest, w)
+                for key, i in iter_json_items(f):
+                    if key == "Edges":
+                        src = i.get("src")
+                        dest = i.get("dest")
+                        try:
+                            srcs.append(src)
+                            dests.append(dest)
+                        except (TypeError, OverflowError):
+                            srcs = list(srcs[:len(weights)])
+                            dests = list(dests[:len(weights)])
+                            srcs.append(src)
+                            dests.append(dest)
+                        weights.append(i.get("w"))
+                    elif key == "Nodes":
+                        pos = i.get("pos")
+                        if pos is not None:
+                            pos = tuple(map(float, pos.split(",")))
+                        node_id = i.get("id")
+                        try:
+                            keys.append(node_id)
+                        except (TypeError, OverflowError):
+                            keys = list(keys)
+                            keys.append(node_id)
+                        positions.append(pos)
+            new_graph.add_nodes(keys, positions)
+            new_graph.add_edges(zip(srcs, dests, weights))
             self.g = new_graph
+            self.cache.clear()
+            self._count_graph()
             return True
         except IOError:
             print("Couldn't load graph. No changes made")
             return False
+        except (ValueError, TypeError, AttributeError) as e:
+            # not json, or not a graph (such as a missing weight or a position which isn't a string of numbers)
+            print(f"Couldn't load graph ({e!r}). No changes made")
+            return False
 
-    def save_to_json(self, file_name: str) -> bool:
+    def save_to_json(self, file_name: str, compact: bool = False) -> bool:
         """
         Saves the graph in JSON format to a file
+        the file is written while walking the graph (no copy of the graph is built in memory first),
+        each edge is written once - out of the out edges of its src node. keys and weights are JSON encoded, so keys
+        which are not ints (such as strings) are written quoted and load back as they were.
         @param file_name: The path to the out file
+        @param compact: if True, the JSON is written without indentation or spaces (for machine consumers)
         @return: True if the save was successful, False o.w.
         """
+        encode = json.JSONEncoder().encode
+        if compact:
+            head, sep, tail, end = '{"Edges":[', ',', '],"Nodes":[', ']}'
+            edge_format = '{{"src":{},"w":{},"dest":{}}}'
+            node_format = '{{"pos":{},"id":{}}}'
+        else:
+            head, sep, tail, end = '{\n    "Edges": [\n', ',\n', '\n    ],\n    "Nodes": [\n', '\n    ]\n}'
+            edge_format = '        {{\n            "src": {},\n            "w": {},\n            "dest": {}\n        }}'
+            node_format = '        {{\n            "pos": {},\n            "id": {}\n        }}'
         try:
             with open(file_name, "w") as f:
-                saved = {"Edges": [], "Nodes": []}
-                for i in self.g.nodes.values():
-                    key = i.key
-                    pos = []
-                    for j in i.pos:
-                        pos.append(str(j))
-                    pos_str = f"{pos[0]},{pos[1]},{pos[2]}"
-                    saved["Nodes"].append({"pos": pos_str, "id": key})
-                    for j in self.g.all_in_edges_of_node(key):
-                        src = j
-                        w = self.g.all_in_edges_of_node(key).get(j)
-                        edge = {"src": src, "w": w, "dest": key}
-                        saved["Edges"].append(edge)
-                    for j in self.g.all_out_edges_of_node(key):
-                        dest = j
-                        w = self.g.all_out_edges_of_node(key).get(j)
-                        edge = {"src": key, "w": w, "dest": dest}
-                        saved["Edges"].append(edge)
-                json.dump(saved, indent=4, fp=f)
-                return True
+                nodes = self.g.get_all_v()
+                # int keys (the usual case) are written as they are, any other key JSON encoded
+                plain = all(type(key) is int for key in nodes)
+                f.write(head)
+                first = True
+                for key in nodes:
+                    src = key if plain else encode(key)
+                    for dest, w in self.g.all_out_edges_of_node(key).items():
+                        if not first:
+                            f.write(sep)
+                        f.write(edge_format.format(src, encode(w), dest if plain else encode(dest)))
+                        first = False
+                f.write(tail)
+                first = True
+                get_pos = pos_of(self.g)
+                for key in nodes:
+                    pos_str = ",".join(map(str, get_pos(key)))
+                    if not first:
+                        f.write(sep)
+                    f.write(node_format.format(encode(pos_str), key if plain else encode(key)))
+                    first = False
+                f.write(end)
+            self._count_graph()
+            return True
         except IOError as e:
             print(e)
             return False
 
-    def shortest_path(self, id1: int, id2: int) -> (float, list):
+    def save_to_binary(self, file_name: str) -> bool:
+        """
+        Saves the graph in the binary format (see BinaryFormat.py) to a file.
+        the binary file is a flat dump of the graph's CSR arrays, much smaller and faster to load than JSON.
+        @param file_name: The path to the out file
+        @return: True if the save was successful, False o.w. (also when a key isn't a 64 bit int, which the format
+        can't hold - nothing is written then)
+        """
+        try:
+            save_binary(self.g, file_name)
+            self._count_graph()
+            return True
+        except (IOError, ValueError) as e:
+            print(e)
+            return False
+
+    def load_from_binary(self, file_name: str, frozen: bool = False) -> bool:
+        """
+        Loads a graph from a file in the binary format (see BinaryFormat.py).
+        @param file_name: The path to the file
+        @param frozen: if True the file is memory mapped and the underlying graph becomes a read only CSRGraph whose
+        arrays are views of the file - nothing is copied, so read only algorithms can start right away.
+        otherwise a new DiGraph is built from the file.
+        @returns True if the loading was successful, False o.w.
+        """
+        try:
+            csr = load_binary(file_name, use_mmap=frozen)
+        except (IOError, ValueError) as e:
+            print(f"Couldn't load graph. No changes made ({e})")
+            return False
+        self.g = csr if frozen else DiGraph.from_csr(csr)
+        self.cache.clear()
+        self._count_graph()
+        return True
+
+    def _count_graph(self) -> None:
+        """
+        Adds the size of the graph loaded or saved to the stats of an instrumented call.
+        """
+        if self.stats is not None:
+            self.stats["nodes"] = self.g.v_size()
+            self.stats["edges"] = self.g.e_size()
+
+    def shortest_path(self, id1: int, id2: int, method: str = "dijkstra", heuristic=dist,
+                      scale: float = None) -> (float, list):
         """
         Returns the shortest path from node id1 to node id2 using Dijkstra's Algorithm
+        the search runs on a binary heap (see Dijkstra.py) and stops as soon as id2 is settled.
         @param id1: The start node id
         @param id2: The end node id
+        @param method: "dijkstra" for a forward search from id1, "bidirectional" for 2 searches (forward from id1
+        over the out edges, backward from id2 over the in edges) meeting in the middle, or "astar" for an A* search
+        guided by the positions of the nodes. the last 2 usually settle far fewer nodes on large graphs.
+        @param heuristic: for "astar", a function of 2 positions (x,y,z), the euclidean distance by default.
+        the estimate of the distance left from a node is scale * heuristic(pos of node, pos of id2). only the results
+        of the default heuristic are cached, any other one costs a pass over the edges (for its safe scale) per call.
+        @param scale: for "astar", the scale of the heuristic. by default the largest safe one is computed from the
+        edges (the minimum weight / heuristic ratio, see Dijkstra.safe_scale), and a larger scale is not safe.
+        if the nodes have no positions, or the scale is not safe, "astar" falls back to Dijkstra's Algorithm.
         @return: The distance of the path, a list of the nodes ids that the path goes through.
         If there is no path between id1 and id2, or one of them does not exist the function returns (inf, [])
         """
-        if id1 not in self.g.nodes or id2 not in self.g.nodes:
+        if method not in ("dijkstra", "bidirectional", "astar"):
+            raise ValueError(f"unknown shortest path method: {method}")
+        if method == "astar":
+            if heuristic is not dist:
+                # a caller's heuristic (often a new lambda on every call) would only fill the cache with entries which
+                # are never hit again, so its results are not cached
+                return self._shortest_path(id1, id2, method, heuristic, scale)
+            key = ("shortest_path", id1, id2, method, scale)
+        else:
+            key = ("shortest_path", id1, id2, method)
+        length, path = self._cached(key, lambda: self._shortest_path(id1, id2, method, heuristic, scale))
+        return length, list(path)
+
+    def _shortest_path(self, id1: int, id2: int, method: str, heuristic=dist, scale: float = None) -> (float, list):
+        nodes = self.g.get_all_v()
+        if id1 not in nodes or id2 not in nodes:
             return inf, []
-        if id1 is id2:
+        if id1 == id2:
             return 0, [id1]
-        dists = {}
-        parents = {}
-        start = self.g.nodes.get(id1)
-        dists[id1] = 0
-        q = [start, ]
-        while len(q) > 0:
-            n = q.pop(0)
-            neighs = self.g.all_out_edges_of_node(n.key)
-            for i in neighs:
-                curr_dist = dists[n.key] + n.get_edge(i)
-                if not dists.__contains__(i) or curr_dist < dists[i]:
-                    dists[i] = curr_dist
-                    parents[i] = n.key
-                    q.append(self.g.nodes[i])
-        if not dists.__contains__(id2):
+        if method == "bidirectional":
+            return bidirectional_dijkstra(self.g, id1, id2, self.stats)
+        if method == "astar":
+            scale = self._astar_scale(heuristic, scale)
+            if scale is not None:
+                return astar(self.g, id1, id2, position_heuristic(self.g, id2, heuristic, scale), self.stats)
+        dists, parents = dijkstra(self.g, id1, id2, self.stats)
+        if id2 not in parents:
             return inf, []
-        path = []
-        itr = id2
-        while itr is not id1:
-            path.insert(0, itr)
-            itr = parents[itr]
-        path.insert(0, id1)
-        return dists[id2], path
+        return dists[id2], build_path(parents, id1, id2)
+
+    def _astar_scale(self, heuristic, scale: float = None):
+        """
+        Returns the scale to run A* with, or None if the heuristic can't be used safely on the graph.
+        the largest safe scale costs a pass over all the edges, so for the default heuristic it is cached until the
+        graph changes (other heuristics are not cached, see shortest_path).
+        """
+        if heuristic is dist:
+            safe = self._cached(("astar_scale",), lambda: safe_scale(self.g, heuristic))
+        else:
+            safe = safe_scale(self.g, heuristic)
+        if scale is None:
+            scale = safe
+        if safe is None or not 0 < scale <= safe or scale == inf:
+            return None
+        return scale
+
+    def distance_matrix(self, sources, targets, workers: int = 1) -> List[list]:
+        """
+        Returns the shortest path distances from each of the sources to each of the targets.
+        one Dijkstra search runs per unique source, and with workers > 1 the searches are spread over a pool of
+        worker processes, which get a CSRGraph snapshot of the graph once (see DistanceMatrix.py).
+        @param sources: The ids of the origin nodes
+        @param targets: The ids of the destination nodes
+        @param workers: The number of worker processes (1 runs in this process)
+        @return: A list of rows, row i holds the distances from sources[i] to each of the targets (in order).
+        a distance is inf if there is no path, or one of the nodes does not exist.
+        """
+        return distance_matrix(self.g, sources, targets, workers, self.stats)
+
+    def all_pairs_shortest_paths(self, paths: bool = False, dense_limit: int = DENSE_LIMIT) -> AllPairsShortestPaths:
+        """
+        Computes the shortest paths between all pairs of nodes (see APSP.py).
+        graphs of up to dense_limit nodes are solved by a vectorized NumPy Floyd-Warshall, larger ones (or when NumPy
+        is not installed) by a Dijkstra search from every node.
+        @param paths: if True the paths are kept too, for AllPairsShortestPaths.path
+        @param dense_limit: the largest number of nodes solved by Floyd-Warshall
+        @return: An AllPairsShortestPaths object, answering distance(id1, id2) and path(id1, id2)
+        """
+        return self._cached(("all_pairs_shortest_paths", paths, dense_limit),
+                            lambda: all_pairs_shortest_paths(self.g, paths, dense_limit))
+
+    def center_point(self) -> (int, float):
+        """
+        Finds the center of the graph: the node whose largest distance to any other node is the lowest.
+        the eccentricities are bounded from below by backward searches from far nodes, so only a few nodes get a full
+        search (see Center.py).
+        @return: The id of the center node and its eccentricity, or (None, inf) if the graph is empty or not strongly
+        connected.
+        """
+        return self._cached(("center_point",), lambda: center_point(self.g, self.stats))
+
+    def tsp(self, cities: list, workers: int = 1) -> (list, float):
+        """
+        Finds a short path which visits all the given cities (nodes), in any order.
+        the distances between the cities are computed once with one search per city (see distance_matrix, workers
+        runs them in parallel), then the order is chosen by a greedy + 2-opt heuristic (see TSP.py).
+        @param cities: The ids of the nodes to visit
+        @param workers: The number of worker processes for the distances
+        @return: The list of the nodes on the path (including the nodes passed between the cities) and its length,
+        or ([], inf) if a city does not exist or there is no such path.
+        """
+        cities = list(dict.fromkeys(cities))
+        nodes = self.g.get_all_v()
+        if not cities or any(c not in nodes for c in cities):
+            return [], inf
+        order, cost = tsp_order(self.distance_matrix(cities, cities, workers))
+        if cost == inf:
+            return [], inf
+        path = [cities[order[0]]]
+        for a, b in zip(order, order[1:]):
+            path.extend(self._shortest_path(cities[a], cities[b], "bidirectional")[1][1:])
+        return path, cost
+
+    def shortest_path_tree(self, src: int) -> ShortestPathTree:
+        """
+        Runs a single full Dijkstra search from node src, for answering many destinations of the same origin.
+        @param src: The start node id
+        @return: A ShortestPathTree, which answers distance_to(v) in O(1) and path_to(v) in O(path length).
+        If src does not exist the returned tree has no reachable nodes.
+        """
+        return self._cached(("shortest_path_tree", src), lambda: self._shortest_path_tree(src))
+
+    def _shortest_path_tree(self, src: int) -> ShortestPathTree:
+        if src not in self.g.get_all_v():
+            return ShortestPathTree(src)
+        dists, parents = dijkstra(self.g, src, stats=self.stats)
+        return ShortestPathTree(src, dists, parents)
 
     def connected_component(self, id1: int) -> list:
         """
@@ -134,25 +376,40 @@ class GraphAlgo(GraphAlgoInterface):
         @return: The list of nodes in the SCC
         Notes:
         If the graph is None or id1 is not in the graph, the function should return an empty list [].
-        uses the Tarjan's algorithm on a specific given node.
+        the SCC of id1 is the set of nodes which are both reachable from id1 and can reach id1, so it is computed as
+        the intersection of a forward search (over the out edges) and a backward search (over the in edges) from id1.
+        the cost is bounded by the size of the region reachable from id1.
+        if all the components of the current graph are already cached (by connected_components),
+        the component is taken from them instead.
         """
-        if id1 not in self.g.nodes:
-            return []
-        g = self.g
-        itr = 0
-        low_link = {}
-        ids = {}
-        scc_set = set()
-        scc_list = []
-        ans = []
-        depth_first_search(g, id1, low_link, ids, scc_list, scc_set, itr)
+        return list(self._cached(("connected_component", id1), lambda: self._connected_component(id1)))
 
-        for i in scc_list:
-            curr_list = []
-            for j in i:
-                curr_list.append(j.key)
-            ans.append(curr_list)
-        return ans[0]
+    def _connected_component(self, id1: int) -> list:
+        if id1 not in self.g.get_all_v():
+            return []
+        components = self.cache.peek(("connected_components",))
+        if components is not None:
+            index = self._cached(("component_index",), lambda: {k: c for c in components for k in c})
+            return index[id1]
+        out_keys = out_keys_of(self.g)
+        in_keys = in_keys_of(self.g)
+        forward = {id1}
+        q = [id1]
+        for n in q:
+            for neighbor in out_keys(n):
+                if neighbor not in forward:
+                    forward.add(neighbor)
+                    q.append(neighbor)
+        ans = [id1]
+        backward = {id1}
+        for n in ans:
+            for neighbor in in_keys(n):
+                if neighbor in forward and neighbor not in backward:
+                    backward.add(neighbor)
+                    ans.append(neighbor)
+        if self.stats is not None:
+            self.stats["visited"] = self.stats.get("visited", 0) + len(forward) + len(backward)
+        return ans
 
     def connected_components(self) -> List[list]:
         """
@@ -165,7 +422,8 @@ class GraphAlgo(GraphAlgoInterface):
         to the recursive implementation of Tarjan.
         an iterator (itr) is marking each iteration to the outer elements of tarjan method each iteration.
         at each end of the DFS iterations the scc_list, which holds all the components already found is extended by a
-        new list.
+        new list. each DFS keeps an iterator of neighbors per node on its stack, so every edge is scanned once and
+        the whole method runs in O(V+E).
         the conversion of the recursive method to the iterative one has been done by the ideas explained in the
         following links:
             1. https://www.youtube.com/watch?v=wUgWX0nc4NY&t=376s - William Fiset's youtube video visualizing and
@@ -174,53 +432,38 @@ class GraphAlgo(GraphAlgoInterface):
             2. https://llbit.se/?p=3379 - Jesper Öqvist's blog, a PhD student of Lund University in Sweden, gives an
             example of an iterative implementation of the Tarjan's algorithm.
         """
+        return [list(c) for c in self._cached(("connected_components",), self._connected_components)]
+
+    def _connected_components(self) -> List[list]:
         g = self.g
         itr = 0
         low_link = {}
         ids = {}
         scc_set = set()
         scc_list = []
-        ans = []
         for node in g.get_all_v():
-            if node not in scc_set:
-                depth_first_search(g, node, low_link, ids, scc_list, scc_set, itr)
-
-        for i in scc_list:
-            curr_list = []
-            for j in i:
-                curr_list.append(j.key)
-            ans.append(curr_list)
-        return ans
+            if node not in ids:
+                itr = depth_first_search(g, node, low_link, ids, scc_list, scc_set, itr, stats=self.stats)
+        return scc_list
 
-    def plot_graph(self) -> None:
+    def plot_graph(self, file_name: str = None, label_limit: int = LABEL_LIMIT, arrow_limit: int = ARROW_LIMIT,
+                   bbox: tuple = None, cluster_limit: int = CLUSTER_LIMIT) -> None:
         """
         Plots the graph.
         If the nodes have a position, the nodes will be placed there.
         Otherwise, they will be placed in a random but elegant manner.
         each directed edge is represented as an arrow, which points the dest, starting from src.
         each node is represented as a red dot with it's key above it's location.
+        all the nodes are drawn as one scatter and all the edges as one quiver (or one collection of lines above
+        arrow_limit edges), so large graphs render in seconds (see GraphPlot.py).
+        @param file_name: if given the graph is rendered off screen (no window, works headless) to this image file
+        @param label_limit: the keys are written only if the graph has at most this many nodes
+        @param arrow_limit: the edges are drawn as arrows only if the graph has at most this many edges
+        @param bbox: optional viewport (xmin, ymin, xmax, ymax), only the nodes inside it and their edges are drawn
+        @param cluster_limit: above this many visible nodes, nearby nodes are drawn as one aggregated dot
         @return: None
         """
-        x_values = []
-        y_values = []
-        for i in self.g.nodes.values():
-            pos = i.pos
-            x_values.append(pos[0])
-            y_values.append(pos[1])
-            plt.annotate(text=f"{i.key}", xy=(pos[0] + 0.0002, pos[1] + 0.0002),
-                         xytext=(pos[0] - 0.0002, pos[1] + 0.0002), color='darkcyan')
-        node = self.g.nodes[0]
-        x_values.append(node.pos[0])
-        y_values.append(node.pos[1])
-        for i in self.g.edges:
-            src_key = i.get("src")
-            dest_key = i.get("dest")
-            src = self.g.nodes.get(src_key)
-            dest = self.g.nodes.get(dest_key)
-            plt.annotate("", xy=(dest.pos[0], dest.pos[1]), xytext=(src.pos[0], src.pos[1]),
-                         arrowprops=dict(edgecolor='olive', facecolor='black', arrowstyle='-|>'))
-        plt.plot(x_values, y_values, ".", color='red')
-        plt.show()
+        plot(self.g, file_name, label_limit, arrow_limit, bbox=bbox, cluster_limit=cluster_limit)
 
 
 def main():
@@ -0,0 +1,221 @@
+"""
+This file holds the rendering of a graph, used by GraphAlgo.plot_graph.
+the whole graph is drawn with a few matplotlib artists instead of one per node and one per edge:
+1. the nodes are one scatter of all the positions.
+2. the edges are one quiver (arrows) while there are at most arrow_limit of them, and one LineCollection (plain
+   segments, much cheaper to render) above that.
+3. the keys of the nodes are written only while there are at most label_limit nodes, as thousands of labels are both
+   slow and unreadable.
+the figure can be rendered off screen straight to an image file: the Agg canvas is used directly, so no GUI backend
+(nor pyplot) is needed, and it runs headless.
+the level of detail depends on what is visible:
+1. given a viewport (bbox), only the nodes inside it and the edges with an end inside it are drawn. the nodes are
+   found by the spatial index of a DiGraph (see DiGraph.nodes_in_box), so a zoomed in view of a huge graph costs only
+   what it shows. edges with both ends outside the viewport are not drawn, even if they cross it.
+2. above cluster_limit visible nodes (zoomed out), the nodes are aggregated on a grid of CLUSTER_GRID x CLUSTER_GRID
+   cells: each cell is drawn as one dot at the mean position of its nodes, sized by their number, and the edges as
+   one line per pair of cells they connect, as wide as the log of their number (the heaviest bundle_limit only).
+"""
+import random
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from src.CSRGraph import CSRGraph, pos_of, out_keys_of, in_keys_of
+
+LABEL_LIMIT = 100
+ARROW_LIMIT = 5000
+CLUSTER_LIMIT = 20000
+CLUSTER_GRID = 100
+BUNDLE_LIMIT = 20000
+
+
+def positions(g, keys: list = None) -> (list, np.ndarray):
+    """
+    Returns the keys of the nodes (all of them by default) and a |V|x2 array of their (x, y) positions.
+    nodes without a position are placed randomly (with a fixed seed) inside the bounding box of the others.
+    """
+    if keys is None:
+        keys = list(g.get_all_v())
+    get_pos = pos_of(g)
+    xy = np.full((len(keys), 2), np.nan)
+    for i, k in enumerate(keys):
+        p = get_pos(k)
+        if p is not None:
+            xy[i, 0] = p[0]
+            xy[i, 1] = p[1]
+    missing = np.isnan(xy[:, 0])
+    if missing.any():
+        known = xy[~missing]
+        lo = known.min(axis=0) if len(known) else np.zeros(2)
+        hi = known.max(axis=0) if len(known) else np.ones(2)
+        rnd = random.Random(0)
+        xy[missing] = [[rnd.uniform(lo[0], hi[0]), rnd.uniform(lo[1], hi[1])] for _ in range(int(missing.sum()))]
+    return keys, xy
+
+
+def edge_indices(g, keys: list) -> (np.ndarray, np.ndarray):
+    """
+    Returns 2 arrays holding the src and dest indices (into keys, all the nodes of g) of every edge.
+    """
+    if isinstance(g, CSRGraph):
+        # keys are in index order, the arrays are used as they are
+        offsets = np.asarray(g.offsets, dtype=np.int64)
+        return np.repeat(np.arange(len(keys)), np.diff(offsets)), np.asarray(g.targets, dtype=np.int64)
+    index = {k: i for i, k in enumerate(keys)}
+    out_keys = out_keys_of(g)
+    srcs = []
+    dests = []
+    for i, k in enumerate(keys):
+        targets = [index[d] for d in out_keys(k)]
+        srcs.extend([i] * len(targets))
+        dests.extend(targets)
+    return np.array(srcs, dtype=np.int64), np.array(dests, dtype=np.int64)
+
+
+def in_box(g, bbox: tuple) -> (list, np.ndarray, np.ndarray, np.ndarray, int):
+    """
+    Returns the nodes and edges to draw for the viewport bbox = (xmin, ymin, xmax, ymax): the keys (the nodes inside
+    bbox first, then the other ends of their edges), their positions, the src and dest indices of the edges with
+    at least one end inside bbox, and the number of nodes inside bbox.
+    """
+    xmin, ymin, xmax, ymax = bbox
+    if hasattr(g, "nodes_in_box"):
+        inside = g.nodes_in_box(xmin, ymin, xmax, ymax)
+    else:
+        keys, xy = positions(g)
+        mask = (xy[:, 0] >= xmin) & (xy[:, 0] <= xmax) & (xy[:, 1] >= ymin) & (xy[:, 1] <= ymax)
+        inside = [k for k, m in zip(keys, mask.tolist()) if m]
+    index = {k: i for i, k in enumerate(inside)}
+    keys = list(inside)
+    out_keys = out_keys_of(g)
+    in_keys = in_keys_of(g)
+    srcs = []
+    dests = []
+    for i, k in enumerate(inside):
+        for d in out_keys(k):
+            j = index.get(d)
+            if j is None:
+                j = index[d] = len(keys)
+                keys.append(d)
+            srcs.append(i)
+            dests.append(j)
+        for s in in_keys(k):
+            j = index.get(s)
+            if j is None:
+                j = index[s] = len(keys)
+                keys.append(s)
+            elif j < len(inside):
+                # an edge between 2 nodes inside the box, already added as an out edge
+                continue
+            srcs.append(j)
+            dests.append(i)
+    keys, xy = positions(g, keys)
+    return keys, xy, np.array(srcs, dtype=np.int64), np.array(dests, dtype=np.int64), len(inside)
+
+
+def cluster(xy: np.ndarray, srcs: np.ndarray, dests: np.ndarray, bbox: tuple = None, grid: int = CLUSTER_GRID,
+            bundle_limit: int = BUNDLE_LIMIT) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+    """
+    Aggregates the nodes on a grid x grid of cells over bbox (by default the bounding box of xy), and the edges by the
+    pair of cells they connect (edges inside a cell are dropped).
+    @return: The mean position and the number of nodes of each non empty cell, and the src and dest cells and the
+    number of edges of each bundle (the heaviest bundle_limit bundles)
+    """
+    lo = xy.min(axis=0) if bbox is None else np.array(bbox[:2], dtype=float)
+    hi = xy.max(axis=0) if bbox is None else np.array(bbox[2:], dtype=float)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    cells = np.clip(((xy - lo) / span * grid).astype(np.int64), 0, grid - 1)
+    ids, members, counts = np.unique(cells[:, 0] * grid + cells[:, 1], return_inverse=True, return_counts=True)
+    members = members.reshape(-1)
+    centers = np.zeros((len(ids), 2))
+    np.add.at(centers, members, xy)
+    centers /= counts[:, None]
+    a = members[srcs]
+    b = members[dests]
+    between = a != b
+    pairs, weights = np.unique(a[between] * len(ids) + b[between], return_counts=True)
+    if len(pairs) > bundle_limit:
+        heaviest = np.argpartition(weights, len(pairs) - bundle_limit)[len(pairs) - bundle_limit:]
+        pairs = pairs[heaviest]
+        weights = weights[heaviest]
+    return centers, counts, pairs // len(ids), pairs % len(ids), weights
+
+
+def draw(ax, keys: list, xy: np.ndarray, srcs: np.ndarray, dests: np.ndarray, label_limit: int = LABEL_LIMIT,
+         arrow_limit: int = ARROW_LIMIT) -> None:
+    """
+    Draws nodes (by their positions xy) and edges (given by index arrays) on the matplotlib axes ax.
+    """
+    if len(srcs):
+        start = xy[srcs]
+        delta = xy[dests] - start
+        if len(srcs) <= arrow_limit:
+            ax.quiver(start[:, 0], start[:, 1], delta[:, 0], delta[:, 1], angles="xy", scale_units="xy", scale=1,
+                      color="olive", width=0.002, headwidth=5, headlength=7, headaxislength=6, zorder=1)
+        else:
+            ax.add_collection(LineCollection(np.stack((start, xy[dests]), axis=1), colors="olive", linewidths=0.3,
+                                             alpha=0.5, zorder=1))
+    if len(keys):
+        ax.scatter(xy[:, 0], xy[:, 1], s=12 if len(keys) <= label_limit else 2, color="red", zorder=2)
+        if len(keys) <= label_limit:
+            for k, (x, y) in zip(keys, xy):
+                ax.annotate(f"{k}", xy=(x, y), xytext=(2, 2), textcoords="offset points", color="darkcyan")
+    ax.autoscale_view()
+
+
+def draw_clusters(ax, centers: np.ndarray, counts: np.ndarray, srcs: np.ndarray, dests: np.ndarray,
+                  weights: np.ndarray) -> None:
+    """
+    Draws the cells and bundles made by cluster on the matplotlib axes ax.
+    """
+    if len(srcs):
+        ax.add_collection(LineCollection(np.stack((centers[srcs], centers[dests]), axis=1), colors="olive",
+                                         linewidths=0.2 + 0.4 * np.log2(weights), alpha=0.5, zorder=1))
+    if len(counts):
+        ax.scatter(centers[:, 0], centers[:, 1], s=1 + np.sqrt(counts), color="red", alpha=0.7, zorder=2)
+    ax.autoscale_view()
+
+
+def plot(g, file_name: str = None, label_limit: int = LABEL_LIMIT, arrow_limit: int = ARROW_LIMIT,
+         size: tuple = (10, 8), dpi: int = 100, bbox: tuple = None, cluster_limit: int = CLUSTER_LIMIT) -> None:
+    """
+    Plots the graph g, on screen or to an image file.
+    @param g: The graph (any GraphInterface implementation)
+    @param file_name: if given the plot is rendered off screen and saved to this file (the format is chosen by its
+    extension, such as .png or .svg), otherwise it is shown in a pyplot window
+    @param label_limit: the nodes keys are written only if there are at most this many nodes
+    @param arrow_limit: the edges are drawn as arrows only if there are at most this many edges, else as lines
+    @param size: The size of the figure in inches
+    @param dpi: The resolution of the image file
+    @param bbox: optional viewport (xmin, ymin, xmax, ymax), only the nodes inside it (and their edges) are drawn
+    @param cluster_limit: above this many visible nodes, the nodes and edges are aggregated on a grid (see cluster)
+    """
+    if bbox is None:
+        keys, xy = positions(g)
+        srcs, dests = edge_indices(g, keys)
+        visible = len(keys)
+    else:
+        keys, xy, srcs, dests, visible = in_box(g, bbox)
+    if file_name is not None:
+        fig = Figure(figsize=size)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+    else:
+        from matplotlib import pyplot as plt
+        fig, ax = plt.subplots(figsize=size)
+    if visible > cluster_limit:
+        # zoomed out, the nodes outside the viewport (and their edges) are left out of the clusters
+        inner = (srcs < visible) & (dests < visible)
+        draw_clusters(ax, *cluster(xy[:visible], srcs[inner], dests[inner], bbox))
+    else:
+        draw(ax, keys, xy, srcs, dests, label_limit, arrow_limit)
+    if bbox is not None:
+        ax.set_xlim(bbox[0], bbox[2])
+        ax.set_ylim(bbox[1], bbox[3])
+    if file_name is not None:
+        fig.savefig(file_name, dpi=dpi)
+    else:
+        plt.show()
@@ -0,0 +1,301 @@
+"""
+This file holds a query server over a graph: a small HTTP/1.1 (JSON) server built on asyncio, with the standard library
+only. run it with: python -m src.GraphServer <graph json file> --port 8000
+the concurrency model:
+1. the event loop only parses requests and writes responses, the work runs in thread pools.
+2. writes (POST /add_node, /add_edge, /remove_node, /remove_edge) run one at a time on a single writer thread, in the
+   order they arrived.
+3. reads (GET /shortest_path, /connected_component, /connected_components) run on a pool of reader threads, each on a
+   snapshot of the graph (see DiGraph.snapshot), so a read never sees a half applied write. a new snapshot is taken
+   only when the graph's mc changed since the last one.
+4. identical reads in flight at the same time (same path, parameters and mc) are batched: the query runs once and all
+   the requests get its result. finished results are cached per mc in a LRU cache, touched by the event loop only.
+5. GET /stats returns the number of requests, errors, batched and cached reads, the throughput and the latency
+   percentiles of each path.
+the algorithms are pure Python, so the reader threads share the GIL: they keep the server responsive while a long query
+runs, but don't add CPU throughput.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from math import inf
+from urllib.parse import urlsplit, parse_qsl
+
+from src.GraphAlgo import GraphAlgo
+from src.LRUCache import LRUCache
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+LATENCY_WINDOW = 10000
+
+
+def _number(value):
+    """
+    Returns value as is, or None for inf (which JSON has no literal for).
+    """
+    return None if value == inf else value
+
+
+def _shortest_path(ga: GraphAlgo, params: dict) -> dict:
+    # a single query settles far fewer nodes searching from both ends (see Dijkstra.bidirectional_dijkstra)
+    dist, path = ga.shortest_path(int(params["src"]), int(params["dest"]), params.get("method", "bidirectional"))
+    return {"dist": _number(dist), "path": path}
+
+
+def _connected_component(ga: GraphAlgo, params: dict) -> dict:
+    return {"component": ga.connected_component(int(params["id"]))}
+
+
+def _connected_components(ga: GraphAlgo, params: dict) -> dict:
+    return {"components": ga.connected_components()}
+
+
+def _add_node(g, body: dict) -> bool:
+    pos = body.get("pos")
+    return g.add_node(int(body["id"]), tuple(map(float, pos)) if pos is not None else None)
+
+
+def _add_edge(g, body: dict) -> bool:
+    return g.add_edge(int(body["src"]), int(body["dest"]), float(body["w"]))
+
+
+def _remove_node(g, body: dict) -> bool:
+    return g.remove_node(int(body["id"]))
+
+
+def _remove_edge(g, body: dict) -> bool:
+    return g.remove_edge(int(body["src"]), int(body["dest"]))
+
+
+READS = {"/shortest_path": _shortest_path, "/connected_component": _connected_component,
+         "/connected_components": _connected_components}
+WRITES = {"/add_node": _add_node, "/add_edge": _add_edge, "/remove_node": _remove_node, "/remove_edge": _remove_edge}
+
+
+class GraphServer:
+    """
+    This class is an asyncio HTTP server answering queries over the graph of a GraphAlgo (see the top of this file).
+    each server contains:
+    1. graph: the (live) graph served, written by the writer thread only.
+    2. host, port: the address the server listens on (port 0 picks a free port, set by start).
+    3. readers, writer: the thread pools of the reads and of the writes.
+    4. view: a GraphAlgo over the latest snapshot of the graph.
+    5. inflight(dict): {query: the future of its result} of the reads running now, for batching.
+    6. cache(LRUCache): the results of the reads, validated against the mc of the graph.
+    7. counters(dict): {path: {"requests", "errors"}}, latencies(dict): {path: the last LATENCY_WINDOW latencies}.
+    """
+
+    def __init__(self, ga: GraphAlgo, host: str = "127.0.0.1", port: int = 0, workers: int = 4,
+                 cache_size: int = 1024):
+        """
+        This is the constructor of the server, start must be awaited to start serving.
+        ga: the GraphAlgo whose graph is served (a DiGraph, for writes and snapshots). workers: the number of reader
+        threads. cache_size: the number of read results kept (0 disables the cache).
+        """
+        self.graph = ga.get_graph()
+        self.host = host
+        self.port = port
+        self.readers = ThreadPoolExecutor(workers, thread_name_prefix="graph-reader")
+        self.writer = ThreadPoolExecutor(1, thread_name_prefix="graph-writer")
+        self.view = None
+        self.inflight = {}
+        self.cache = LRUCache(cache_size)
+        self.counters = {}
+        self.latencies = {}
+        self.batched = 0
+        self.cached = 0
+        self.started = None
+        self.server = None
+
+    def __str__(self):
+        """
+        Override method for string representation of a server.
+        """
+        return f"GraphServer: {self.host}:{self.port} , {self.graph}"
+
+    def __repr__(self):
+        """
+        Override method for string representation of a server.
+        """
+        return str(self)
+
+    async def start(self) -> None:
+        """
+        Starts listening (in the running event loop), port is set to the actual port.
+        """
+        self.server = await asyncio.start_server(self._connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.started = time.perf_counter()
+
+    async def close(self) -> None:
+        """
+        Stops listening, waits for the connections to close and shuts the thread pools down.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.readers.shutdown(wait=False)
+        self.writer.shutdown(wait=False)
+
+    def _view(self) -> GraphAlgo:
+        """
+        Returns a GraphAlgo over a snapshot of the current graph, reusing the last one if the graph didn't change.
+        """
+        snap = self.graph.snapshot() if hasattr(self.graph, "snapshot") else self.graph
+        if self.view is None or self.view.g is not snap:
+            # the reader threads share the view, its own cache (not thread safe) is disabled
+            self.view = GraphAlgo(snap, cache_size=0)
+        return self.view
+
+    async def _read(self, path: str, params: dict) -> dict:
+        view = self._view()
+        mc = view.g.get_mc()
+        key = (path, tuple(sorted(params.items())))
+        self.cache.validate(mc)
+        ans = self.cache.get(key)
+        if ans is not None:
+            self.cached += 1
+            return ans
+        key = (mc,) + key
+        future = self.inflight.get(key)
+        if future is not None:
+            self.batched += 1
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().run_in_executor(self.readers, READS[path], view, params)
+        self.inflight[key] = future
+        try:
+            ans = await asyncio.shield(future)
+        finally:
+            del self.inflight[key]
+        if self.cache.tag == mc:
+            # unless the graph changed (and the cache was cleared for a newer mc) meanwhile
+            self.cache.put(key[1:], ans)
+        return ans
+
+    async def _write(self, path: str, body: dict) -> dict:
+        g = self.graph
+        ok = await asyncio.get_running_loop().run_in_executor(self.writer, WRITES[path], g, body)
+        return {"ok": ok, "mc": g.get_mc()}
+
+    def stats(self) -> dict:
+        """
+        Returns the statistics of the server: the totals, and per path the number of requests and errors, and the
+        mean, 50th, 90th and 99th percentile and max latency (in milliseconds) of the last LATENCY_WINDOW requests.
+        """
+        uptime = time.perf_counter() - self.started if self.started is not None else 0.0
+        total = sum(c["requests"] for c in self.counters.values())
+        paths = {}
+        for path, c in self.counters.items():
+            times = sorted(self.latencies[path])
+            paths[path] = dict(c)
+            if times:
+                paths[path].update({"mean_ms": 1000 * sum(times) / len(times),
+                                    "p50_ms": 1000 * times[len(times) // 2],
+                                    "p90_ms": 1000 * times[int(len(times) * 0.9)],
+                                    "p99_ms": 1000 * times[int(len(times) * 0.99)],
+                                    "max_ms": 1000 * times[-1]})
+        return {"uptime": uptime, "requests": total, "throughput": total / uptime if uptime > 0 else 0.0,
+                "batched": self.batched, "cached": self.cached, "inflight": len(self.inflight),
+                "nodes": self.graph.v_size(), "edges": self.graph.e_size(), "mc": self.graph.get_mc(),
+                "paths": paths}
+
+    async def _respond(self, method: str, target: str, body: bytes) -> (int, dict):
+        """
+        Runs one request.
+        @return: The HTTP status and the JSON payload of the response
+        """
+        url = urlsplit(target)
+        path = url.path
+        try:
+            if path == "/stats":
+                return 200, self.stats()
+            if path in READS:
+                if method != "GET":
+                    return 405, {"error": f"{path} takes GET"}
+                return 200, await self._read(path, dict(parse_qsl(url.query)))
+            if path in WRITES:
+                if method != "POST":
+                    return 405, {"error": f"{path} takes POST"}
+                return 200, await self._write(path, json.loads(body or b"{}"))
+            return 404, {"error": f"unknown path {path}"}
+        except (KeyError, ValueError, TypeError) as e:
+            return 400, {"error": f"bad request: {e!r}"}
+        except Exception as e:
+            return 500, {"error": repr(e)}
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves the requests of one connection, kept alive until the client closes it (or asks to).
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                method, target, version = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                start = time.perf_counter()
+                status, payload = await self._respond(method, target, body)
+                path = urlsplit(target).path
+                if path not in READS and path not in WRITES and path != "/stats":
+                    path = "other"
+                counter = self.counters.setdefault(path, {"requests": 0, "errors": 0})
+                counter["requests"] += 1
+                counter["errors"] += status != 200
+                self.latencies.setdefault(path, deque(maxlen=LATENCY_WINDOW)).append(time.perf_counter() - start)
+                data = json.dumps(payload).encode()
+                keep = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                head = f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n" \
+                       f"Content-Length: {len(data)}\r\n"
+                if not keep:
+                    head += "Connection: close\r\n"
+                writer.write((head + "\r\n").encode("latin-1") + data)
+                await writer.drain()
+                if not keep:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(ga: GraphAlgo, host: str = "127.0.0.1", port: int = 8000, workers: int = 4) -> None:
+    """
+    Serves the graph of ga until cancelled.
+    """
+    server = GraphServer(ga, host, port, workers)
+    await server.start()
+    print(f"Serving {server.graph} on http://{server.host}:{server.port}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve graph queries over HTTP.")
+    parser.add_argument("graph", nargs="?", help="a graph json file (empty graph if missing)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4, help="the number of reader threads")
+    args = parser.parse_args(argv)
+    ga = GraphAlgo()
+    if args.graph and not ga.load_from_json(args.graph):
+        return
+    try:
+        asyncio.run(serve(ga, args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+This file holds an opt-in instrumentation layer for GraphAlgo and DiGraph objects.
+a Profiler attached to an object replaces the object's own methods (instance attributes shadowing the class
+methods) with timed wrappers, so objects which are not attached run the plain methods - the layer costs nothing
+unless it is used, and detaching restores the object as it was.
+for each call a record (a dict) is made with the wall time of the call, and for GraphAlgo objects also the work done:
+while a wrapped call runs, the GraphAlgo's stats attribute is a fresh dict which the algorithms add their counters to
+(see Dijkstra.py, DFS.py and Center.py):
+1. settled, relaxed, pushes: the nodes settled, edges scanned and queue pushes of the shortest path searches.
+2. visited, max_depth: the nodes visited by the connected components searches, and the deepest DFS stack.
+3. nodes, edges: the size of the graph loaded or saved.
+4. cached: True if the result came from the cache (then there are no counters).
+"""
+from functools import wraps
+from time import perf_counter
+
+GRAPH_ALGO_METHODS = ("load_from_json", "save_to_json", "load_from_binary", "save_to_binary", "shortest_path",
+                      "shortest_path_tree", "distance_matrix", "all_pairs_shortest_paths", "center_point", "tsp",
+                      "connected_component", "connected_components")
+GRAPH_METHODS = ("add_node", "add_edge", "remove_node", "remove_edge", "add_nodes", "add_edges", "remove_nodes")
+
+
+class Profiler:
+    """
+    This class records the calls made on the objects attached to it.
+    each profiler contains:
+    1. records(list): the records of the calls, oldest first (if keep is True).
+    2. callback: optional function called with each record as soon as the call ends.
+    3. attached(dict): {id of an attached object: (the object, the names of its wrapped methods)}.
+    """
+
+    def __init__(self, callback=None, keep: bool = True):
+        """
+        This is the constructor of the profiler.
+        callback: a function of a record, called after every call. keep: if False the records are only passed to the
+        callback, and not stored.
+        """
+        self.callback = callback
+        self.keep = keep
+        self.records = []
+        self.attached = {}
+
+    def __str__(self):
+        """
+        Override method for string representation of a profiler.
+        """
+        return f"Profiler: {len(self.attached)} objects, {len(self.records)} records"
+
+    def __repr__(self):
+        """
+        Override method for string representation of a profiler.
+        """
+        return str(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.detach()
+
+    def attach(self, obj, methods=None) -> None:
+        """
+        Starts recording the calls of an object.
+        @param obj: A GraphAlgo or DiGraph (or any object with such methods)
+        @param methods: The names of the methods to record, by default all the methods of GRAPH_ALGO_METHODS and
+        GRAPH_METHODS the object has
+        """
+        if id(obj) in self.attached:
+            return
+        if methods is None:
+            methods = [name for name in GRAPH_ALGO_METHODS + GRAPH_METHODS if hasattr(obj, name)]
+        for name in methods:
+            setattr(obj, name, self._wrap(obj, name, getattr(obj, name)))
+        self.attached[id(obj)] = (obj, tuple(methods))
+
+    def detach(self, obj=None) -> None:
+        """
+        Stops recording the calls of obj (or of all the attached objects if obj is None).
+        """
+        for key in [id(obj)] if obj is not None else list(self.attached):
+            obj, methods = self.attached.pop(key)
+            for name in methods:
+                delattr(obj, name)
+
+    def clear(self) -> None:
+        """
+        Drops all the records.
+        """
+        self.records.clear()
+
+    def summary(self) -> dict:
+        """
+        Aggregates the records by method.
+        @return: {method name: {"calls", "time" (total), "mean", "max", and the sum of each counter}}
+        """
+        ans = {}
+        for record in self.records:
+            s = ans.setdefault(record["method"], {"calls": 0, "time": 0.0, "max": 0.0})
+            s["calls"] += 1
+            s["time"] += record["time"]
+            s["max"] = max(s["max"], record["time"])
+            for key, value in record.items():
+                if key == "max_depth":
+                    s[key] = max(s.get(key, 0), value)
+                elif key not in ("method", "args", "time") and isinstance(value, (int, float)):
+                    s[key] = s.get(key, 0) + value
+        for s in ans.values():
+            s["mean"] = s["time"] / s["calls"]
+        return ans
+
+    def _record(self, record: dict) -> None:
+        if self.keep:
+            self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def _wrap(self, obj, name: str, method):
+        """
+        Returns a wrapper of the bound method, recording each of its calls.
+        """
+        profiler = self
+        has_stats = hasattr(obj, "stats")
+        cache = getattr(obj, "cache", None)
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            stats = {}
+            if has_stats:
+                outer = obj.stats
+                obj.stats = stats
+            hits = cache.hits if cache is not None else 0
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                if has_stats:
+                    obj.stats = outer
+                    if outer is not None:
+                        # a call made by another recorded call, its counters belong to the outer call too
+                        _merge(outer, stats)
+                record = {"method": name, "args": tuple(map(_describe, args)), "time": elapsed}
+                if cache is not None:
+                    record["cached"] = cache.hits > hits
+                record.update(stats)
+                profiler._record(record)
+
+        return wrapper
+
+
+def _merge(outer: dict, inner: dict) -> None:
+    for key, value in inner.items():
+        if key == "max_depth":
+            outer[key] = max(outer.get(key, 0), value)
+        else:
+            outer[key] = outer.get(key, 0) + value
+
+
+def _describe(arg):
+    """
+    Returns the argument as is if it is a plain value, else the name of its type (records don't keep big objects).
+    """
+    if arg is None or isinstance(arg, (bool, int, float, str)):
+        return arg
+    return type(arg).__name__
@@ -0,0 +1,160 @@
+"""
+This file holds an incremental (streaming) reader for JSON documents of the form {"key": [item, item, ...], ...},
+such as the graph files read by GraphAlgo.load_from_json.
+the file is read in fixed size chunks and each array item is decoded on its own (with json's C decoder), so only the
+current chunk and the current item are held in memory instead of the whole parse tree of the document.
+"""
+import json
+import re
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+CHUNK_SIZE = 1 << 16
+MARGIN = 1 << 12
+
+
+class JsonStreamReader:
+    """
+    This class reads a JSON document from a text file incrementally.
+    each reader contains:
+    1. f: the file being read.
+    2. buf(str), pos(int): the part of the file read but not yet consumed, and the position in it.
+    3. eof(bool): True once the whole file has been read into buf.
+    """
+
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        """
+        This is the constructor of the reader.
+        f: a file opened for reading in text mode. chunk_size: int, default: 64K characters per read.
+        """
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self) -> bool:
+        """
+        Reads the next chunk of the file into the buffer, dropping the consumed part.
+        @return: True if more data was read, False if the end of the file was reached.
+        """
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def ensure(self, n: int) -> None:
+        """
+        Reads chunks until at least n unconsumed characters are buffered (or the end of the file is reached).
+        """
+        while len(self.buf) - self.pos < n and self.fill():
+            pass
+
+    def peek(self) -> str:
+        """
+        Skips whitespace and returns the next character without consuming it ("" at the end of the file).
+        """
+        while True:
+            buf = self.buf
+            pos = WHITESPACE.match(buf, self.pos).end()
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, c: str) -> None:
+        """
+        Consumes the next (non whitespace) character, which must be c.
+        """
+        if self.peek() != c:
+            raise json.JSONDecodeError(f"Expecting '{c}'", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self):
+        """
+        Decodes and consumes the next JSON value.
+        a value touching the end of the buffer may be truncated (a number or a string cut by the chunk), so in that
+        case more of the file is read and the value is decoded again.
+        """
+        self.peek()
+        while True:
+            try:
+                ans, end = self.decoder.raw_decode(self.buf, self.pos)
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return ans
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.ensure(len(self.buf) - self.pos + self.chunk_size)
+
+    def array_items(self):
+        """
+        Iterates over the items of an array whose "[" was already consumed, and consumes its "]".
+        this is the hot loop of the reader. items which are objects are decoded a buffer at a time: the buffered text
+        up to the last "}" is decoded as one array with a single json.loads call. if that text is not a whole number of
+        items (the "}" is nested, or the items aren't objects) the array falls back to decoding one item at a time.
+        """
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        batch = True
+        while True:
+            items = None
+            if batch:
+                self.ensure(MARGIN)
+                buf = self.buf
+                pos = self.pos
+                cut = buf.rfind("}", pos) + 1
+                try:
+                    items = json.loads("[" + buf[pos:cut] + "]") if cut > pos else None
+                    self.pos = cut
+                except json.JSONDecodeError:
+                    batch = False
+            if items:
+                yield from items
+            else:
+                yield self.value()
+            c = self.peek()
+            self.pos += 1
+            if c == "]":
+                return
+            if c != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buf, self.pos - 1)
+
+    def items(self):
+        """
+        Iterates over a document of the form {"key": value, ...}.
+        values which are arrays are iterated item by item, yielding a (key, item) pair for each item.
+        any other value is yielded once as a (key, value) pair.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            if self.peek() == "[":
+                self.pos += 1
+                for item in self.array_items():
+                    yield key, item
+            else:
+                yield key, self.value()
+            if self.peek() == "}":
+                self.pos += 1
+                return
+            self.expect(",")
+
+
+def iter_json_items(f, chunk_size: int = CHUNK_SIZE):
+    """
+    Iterates over the (key, item) pairs of a {"key": [item, ...], ...} JSON document read incrementally from f.
+    @param f: a file opened for reading in text mode
+    @param chunk_size: the number of characters read at once
+    """
+    return JsonStreamReader(f, chunk_size).items()
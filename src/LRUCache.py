@@ -0,0 +1,85 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    This class represents a bounded Least Recently Used cache, used by GraphAlgo for memoizing query results.
+    each cache contains:
+    1. maxsize(int): the maximal number of results kept, the least recently used result is evicted first.
+    2. data(OrderedDict): the cached results, ordered from the least to the most recently used.
+    3. tag: the version of the data the results were computed on, changing it clears the cache.
+    4. hits(int), misses(int): counters of the lookups made on this cache.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        This is the constructor of the cache.
+        maxsize: int, default: 128. a maxsize of 0 disables caching.
+        """
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.tag = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        """
+        Override method to define a cache's size by the number of results in it.
+        """
+        return len(self.data)
+
+    def __contains__(self, key):
+        """
+        Override method for checking if a key is cached, without counting it as a lookup.
+        """
+        return key in self.data
+
+    def validate(self, tag) -> None:
+        """
+        Clears the cache if the given tag is different than the tag its results were computed on.
+        @param tag: the current version of the data (for example the graph and its mc)
+        """
+        if tag != self.tag:
+            self.data.clear()
+            self.tag = tag
+
+    def peek(self, key, default=None):
+        """
+        Returns the result cached for key without counting a lookup or changing its position.
+        """
+        return self.data.get(key, default)
+
+    def get(self, key, default=None):
+        """
+        Returns the result cached for key and marks it as the most recently used.
+        @return: The cached result, or default if key is not cached
+        """
+        if key in self.data:
+            self.hits += 1
+            self.data.move_to_end(key)
+            return self.data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value) -> None:
+        """
+        Caches value under key, evicting the least recently used result if the cache is full.
+        """
+        if self.maxsize <= 0:
+            return
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Removes all the cached results, the hits and misses counters are kept.
+        """
+        self.data.clear()
+
+    def info(self) -> dict:
+        """
+        Returns the statistics of this cache: {"hits", "misses", "size", "maxsize"}.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.data), "maxsize": self.maxsize}
@@ -0,0 +1,213 @@
+from src.CSRGraph import out_keys_of, in_keys_of
+from src.DFS import depth_first_search
+
+
+class SCCIndex:
+    """
+    This class maintains the Strongly Connected Components (SCC) of a DiGraph incrementally.
+    the index registers itself as a listener of the graph (see DiGraph.add_listener), and updates the components on
+    every change instead of recomputing them all. besides the components it keeps a topological order of the
+    components (ord), so that every edge between 2 components goes from a lower ord to a higher one:
+    1. adding an edge u->v which agrees with the order changes nothing, in O(1).
+       otherwise the affected region (the components ordered between v's and u's) is searched forward from v and
+       backward from u, as in the Pearce-Kelly dynamic topological sort. the components found on both sides are on a
+       cycle closed by the new edge and are merged, and the region is reordered.
+    2. removing an edge (or a node) inside a component re-runs Tarjan's DFS on that component only, which may split it.
+    3. adding a node creates a new component of its own.
+    each index contains:
+    1. graph: the graph indexed.
+    2. comp(dict): {key: id of the node's component}.
+    3. members(dict): {component id: set of the keys in the component}.
+    4. ord(dict): {component id: a unique float, the position of the component in the topological order}.
+    5. top(float): an upper bound of all the positions in ord, where a new node's component is placed.
+    """
+
+    def __init__(self, graph):
+        """
+        This is the constructor of the index, it computes all the components of graph once and attaches to it.
+        """
+        self.graph = graph
+        self.next_id = 0
+        self._build()
+        graph.add_listener(self)
+
+    def _build(self) -> None:
+        """
+        Computes all the components (and their order) from scratch.
+        """
+        self.comp = {}
+        self.members = {}
+        self.ord = {}
+        self.used = set()
+        self.top = 0.0
+        low_link = {}
+        ids = {}
+        scc_set = set()
+        scc_list = []
+        itr = 0
+        for node in self.graph.get_all_v():
+            if node not in ids:
+                itr = depth_first_search(self.graph, node, low_link, ids, scc_list, scc_set, itr)
+        # Tarjan completes the components in reverse topological order
+        for i, scc in enumerate(scc_list):
+            self._new_component(scc, float(len(scc_list) - i))
+
+    def __len__(self):
+        """
+        Override method to define an index's size by the number of components.
+        """
+        return len(self.members)
+
+    def __str__(self):
+        """
+        Override method for string representation of an index.
+        """
+        return f"SCCIndex: |V|={len(self.comp)} , |SCC|={len(self.members)}"
+
+    def __repr__(self):
+        """
+        Override method for string representation of an index.
+        """
+        return str(self)
+
+    def detach(self) -> None:
+        """
+        Stops following the changes made on the graph.
+        """
+        self.graph.remove_listener(self)
+
+    def component_of(self, key) -> int:
+        """
+        Returns the id of the component of the given node in O(1).
+        the ids are unique, but the id of a component may change when it is merged or split.
+        @return: The component id, or None if the node is not in the graph
+        """
+        return self.comp.get(key)
+
+    def component(self, key) -> list:
+        """
+        Returns the list of the nodes in the same SCC as the given node, or [] if the node is not in the graph.
+        """
+        c = self.comp.get(key)
+        if c is None:
+            return []
+        return list(self.members[c])
+
+    def components(self) -> list:
+        """
+        Returns the list of all SCCs (each one is a list of node keys), in topological order.
+        """
+        return [list(self.members[c]) for c in sorted(self.members, key=self.ord.__getitem__)]
+
+    def _new_component(self, keys, order: float) -> int:
+        c = self.next_id
+        self.next_id += 1
+        members = set(keys)
+        self.members[c] = members
+        for key in members:
+            self.comp[key] = c
+        self.ord[c] = order
+        self.used.add(order)
+        if order > self.top:
+            self.top = order
+        return c
+
+    def _drop_component(self, c) -> set:
+        self.used.discard(self.ord.pop(c))
+        return self.members.pop(c)
+
+    def _split(self, c) -> None:
+        """
+        Recomputes the components inside the (former) component c, running Tarjan's DFS on its nodes only.
+        the new components are ordered between the components with edges into c and the ones with edges out of c.
+        """
+        order = self.ord[c]
+        within = self._drop_component(c)
+        low_link = {}
+        ids = {}
+        scc_set = set()
+        scc_list = []
+        itr = 0
+        for node in within:
+            if node not in ids:
+                itr = depth_first_search(self.graph, node, low_link, ids, scc_list, scc_set, itr, within)
+        lo = max((self.ord[self.comp[n]] for key in within for n in self.graph.all_in_edges_of_node(key)
+                  if n not in within), default=order - 1)
+        hi = min((self.ord[self.comp[n]] for key in within for n in self.graph.all_out_edges_of_node(key)
+                  if n not in within), default=order + 1)
+        k = len(scc_list)
+        orders = [lo + (hi - lo) * (k - i) / (k + 1) for i in range(k)]
+        if not all(lo < o < hi and o not in self.used for o in orders) or len(set(orders)) < k:
+            # the floats between lo and hi ran out, renumber everything
+            self._build()
+            return
+        for scc, o in zip(scc_list, orders):
+            self._new_component(scc, o)
+
+    def node_added(self, key) -> None:
+        self._new_component((key,), self.top + 1)
+
+    def node_removed(self, key) -> None:
+        c = self.comp.pop(key)
+        members = self.members[c]
+        members.discard(key)
+        if not members:
+            self._drop_component(c)
+        elif len(members) > 1:
+            self._split(c)
+
+    def edge_added(self, src, dest, weight) -> None:
+        comp = self.comp
+        order = self.ord
+        if comp[src] == comp[dest]:
+            return
+        lb = order[comp[dest]]
+        ub = order[comp[src]]
+        if ub < lb:
+            return
+        forward = {dest}
+        q = [dest]
+        out_keys = out_keys_of(self.graph)
+        for n in q:
+            for neighbor in out_keys(n):
+                if neighbor not in forward and order[comp[neighbor]] <= ub:
+                    forward.add(neighbor)
+                    q.append(neighbor)
+        backward = {src}
+        q = [src]
+        in_keys = in_keys_of(self.graph)
+        for n in q:
+            for neighbor in in_keys(n):
+                if neighbor not in backward and order[comp[neighbor]] >= lb:
+                    backward.add(neighbor)
+                    q.append(neighbor)
+        comps_f = {comp[key] for key in forward}
+        comps_b = {comp[key] for key in backward}
+        cycle = comps_f & comps_b
+        pool = sorted(order[c] for c in comps_f | comps_b)
+        before = sorted(comps_b - cycle, key=order.__getitem__)
+        after = sorted(comps_f - cycle, key=order.__getitem__)
+        if cycle:
+            largest = max(cycle, key=lambda c: len(self.members[c]))
+            members = self.members[largest]
+            for c in cycle:
+                if c != largest:
+                    for key in self._drop_component(c):
+                        comp[key] = largest
+                        members.add(key)
+            before.append(largest)
+        # the components before the new edge's dest take the lowest positions of the region, the ones after it the
+        # highest, so no component moves up (down) past a component outside the region it has an edge to (from).
+        # the positions are only permuted, so top stays an upper bound
+        self.used.difference_update(pool)
+        for c, o in zip(before, pool):
+            order[c] = o
+        for c, o in zip(after, pool[len(pool) - len(after):]):
+            order[c] = o
+        self.used.update(order[c] for c in before)
+        self.used.update(order[c] for c in after)
+
+    def edge_removed(self, src, dest) -> None:
+        c = self.comp[src]
+        if c == self.comp[dest]:
+            self._split(c)
@@ -0,0 +1,311 @@
+from heapq import heappush, heapreplace, nsmallest
+from math import floor, sqrt, isfinite, isqrt
+
+PER_CELL = 2
+
+
+class SpatialIndex:
+    """
+    This class is a uniform grid index over the (x, y) positions of the nodes of a graph, for range queries.
+    the plane is cut into square cells of side cell, sized so that a cell holds about PER_CELL nodes on average, and
+    each node is kept in the cell its position falls in. a query visits only the cells overlapping its box (or, for
+    nearest neighbours, the rings of cells around its point), so its cost depends on the size of the answer and not on
+    the size of the graph.
+    the index is maintained by DiGraph (see DiGraph.nodes_in_box), which adds and removes the nodes as they are added
+    to and removed from the graph. when the number of nodes grows or shrinks 4 times since the grid was sized, it is
+    rebuilt with a new cell size.
+    each index contains:
+    1. points(dict): {key: (x, y)} of all the nodes indexed.
+    2. cells(dict): {(column, row): {key: (x, y)}} of the non empty cells.
+    3. cell(float): the side of a cell.
+    4. lo, hi: the (x, y) lower and upper corners of the bounding box of the positions indexed so far.
+    5. arrays: the points sorted by cell as NumPy arrays, for nearest_batch (built on demand, None after a change).
+    """
+
+    def __init__(self, points=()):
+        """
+        This is the constructor of the index.
+        points: an iterable of (key, (x, y, ...)) pairs, only the first 2 coordinates of each position are used.
+        """
+        self.points = {key: (pos[0], pos[1]) for key, pos in points}
+        self.arrays = None
+        self._build()
+
+    @classmethod
+    def from_graph(cls, g):
+        """
+        Builds an index of the positions of all the nodes of a DiGraph.
+        """
+        return cls((key, n.pos) for key, n in g.get_all_v().items())
+
+    def _build(self) -> None:
+        """
+        Sizes the grid for the current points, and puts every point in its cell.
+        """
+        points = self.points
+        self.built = len(points)
+        if points:
+            xs = [p[0] for p in points.values()]
+            ys = [p[1] for p in points.values()]
+            self.lo = (min(xs), min(ys))
+            self.hi = (max(xs), max(ys))
+        else:
+            self.lo = (0.0, 0.0)
+            self.hi = (0.0, 0.0)
+        w = self.hi[0] - self.lo[0]
+        h = self.hi[1] - self.lo[1]
+        n = max(1, len(points))
+        if w > 0 and h > 0:
+            # at most about n cells along the longer side, or a thin set of points (say h much smaller than w) would
+            # get tiny cells, far more of them than points
+            self.cell = max(sqrt(w * h * PER_CELL / n), max(w, h) / n)
+        elif w > 0 or h > 0:
+            # all the points are on one line
+            self.cell = max(w, h) * PER_CELL / n
+        else:
+            self.cell = 1.0
+        self.cells = {}
+        self.arrays = None
+        cells = self.cells
+        cell = self.cell
+        for key, (x, y) in points.items():
+            c = (floor(x / cell), floor(y / cell))
+            bucket = cells.get(c)
+            if bucket is None:
+                cells[c] = {key: (x, y)}
+            else:
+                bucket[key] = (x, y)
+
+    def __len__(self):
+        """
+        Override method to define an index's size by the number of nodes in it.
+        """
+        return len(self.points)
+
+    def __contains__(self, key):
+        """
+        Override method to check if a node is in the index.
+        """
+        return key in self.points
+
+    def __str__(self):
+        """
+        Override method for string representation of an index.
+        """
+        return f"SpatialIndex: |V|={len(self.points)} , cells={len(self.cells)} , cell={self.cell}"
+
+    def __repr__(self):
+        """
+        Override method for string representation of an index.
+        """
+        return str(self)
+
+    def add(self, key, pos) -> None:
+        """
+        Adds a node (or moves it, if it is already in the index) at the position pos.
+        """
+        if key in self.points:
+            self.remove(key)
+        self.arrays = None
+        x, y = pos[0], pos[1]
+        if not (isfinite(x) and isfinite(y)):
+            return
+        self.points[key] = (x, y)
+        if len(self.points) > 4 * max(self.built, 16):
+            self._build()
+            return
+        self.lo = (min(self.lo[0], x), min(self.lo[1], y)) if len(self.points) > 1 else (x, y)
+        self.hi = (max(self.hi[0], x), max(self.hi[1], y)) if len(self.points) > 1 else (x, y)
+        c = (floor(x / self.cell), floor(y / self.cell))
+        bucket = self.cells.get(c)
+        if bucket is None:
+            self.cells[c] = {key: (x, y)}
+        else:
+            bucket[key] = (x, y)
+
+    def remove(self, key) -> None:
+        """
+        Removes a node from the index, nodes not in the index are ignored.
+        """
+        p = self.points.pop(key, None)
+        if p is None:
+            return
+        self.arrays = None
+        c = (floor(p[0] / self.cell), floor(p[1] / self.cell))
+        bucket = self.cells[c]
+        del bucket[key]
+        if not bucket:
+            del self.cells[c]
+        if 4 * len(self.points) < self.built and self.built > 64:
+            self._build()
+
+    def in_box(self, xmin: float, ymin: float, xmax: float, ymax: float) -> list:
+        """
+        Returns the keys of the nodes whose position is inside the box (borders included), in no specific order.
+        """
+        # the box is clipped to the bounding box of the points, so a huge box doesn't visit empty cells
+        xmin = max(xmin, self.lo[0])
+        ymin = max(ymin, self.lo[1])
+        xmax = min(xmax, self.hi[0])
+        ymax = min(ymax, self.hi[1])
+        if xmin > xmax or ymin > ymax or not self.points:
+            return []
+        cell = self.cell
+        c0, r0 = floor(xmin / cell), floor(ymin / cell)
+        c1, r1 = floor(xmax / cell), floor(ymax / cell)
+        cells = self.cells
+        if (c1 - c0 + 1) * (r1 - r0 + 1) > len(cells):
+            # more cells in the box than non empty cells, scan the non empty ones instead
+            visit = [(c, bucket) for c, bucket in cells.items() if c0 <= c[0] <= c1 and r0 <= c[1] <= r1]
+        else:
+            visit = [((c, r), cells[c, r]) for c in range(c0, c1 + 1) for r in range(r0, r1 + 1) if (c, r) in cells]
+        ans = []
+        for (c, r), bucket in visit:
+            if c0 < c < c1 and r0 < r < r1:
+                # an inner cell is entirely inside the box
+                ans.extend(bucket)
+            else:
+                ans.extend(key for key, (x, y) in bucket.items() if xmin <= x <= xmax and ymin <= y <= ymax)
+        return ans
+
+    def nearest(self, x: float, y: float, k: int = 1) -> list:
+        """
+        Returns the k nodes closest to the point (x, y), by euclidean distance.
+        the cells are visited in square rings around the point's cell, and the search stops once the k-th closest node
+        found is closer than any cell not visited yet.
+        @return: A list of (key, distance) pairs, the closest first (fewer than k if the index holds fewer nodes)
+        """
+        points = self.points
+        k = min(k, len(points))
+        if k <= 0:
+            return []
+        cell = self.cell
+        cells = self.cells
+        cx, cy = floor(x / cell), floor(y / cell)
+        c0, r0 = floor(self.lo[0] / cell), floor(self.lo[1] / cell)
+        c1, r1 = floor(self.hi[0] / cell), floor(self.hi[1] / cell)
+        # the rings closer than the bounding box are empty, the ones beyond it too
+        first = max(0, c0 - cx, cx - c1, r0 - cy, cy - r1)
+        last = max(cx - c0, c1 - cx, cy - r0, r1 - cy)
+        best = []
+        for r in range(first, last + 1):
+            if 8 * r > len(cells):
+                # a ring of more cells than the non empty ones, scanning all the points is cheaper
+                best = [(-(px - x) ** 2 - (py - y) ** 2, key) for key, (px, py) in points.items()]
+                break
+            for c in _ring(cx, cy, r):
+                bucket = cells.get(c)
+                if bucket is None:
+                    continue
+                for key, (px, py) in bucket.items():
+                    d2 = (px - x) ** 2 + (py - y) ** 2
+                    if len(best) < k:
+                        heappush(best, (-d2, key))
+                    elif d2 < -best[0][0]:
+                        heapreplace(best, (-d2, key))
+            if len(best) == k:
+                # the distance from the point to the outside of the rings visited so far
+                border = min(x - (cx - r) * cell, (cx + r + 1) * cell - x, y - (cy - r) * cell, (cy + r + 1) * cell - y)
+                if border >= 0 and -best[0][0] <= border * border:
+                    break
+        return [(key, sqrt(-d2)) for d2, key in nsmallest(k, best, key=lambda e: (-e[0], e[1]))]
+
+    def _arrays(self):
+        """
+        Returns the points as NumPy arrays sorted by cell: (keys, xy, starts, first column, first row, columns, rows),
+        where the points of the cell (column c0 + i, row r0 + j) are at starts[i * rows + j] up to (not including)
+        starts[i * rows + j + 1].
+        """
+        import numpy as np
+        c0, r0, nx, ny = self._extent()
+        if nx * ny > 4 * len(self.points) + 16:
+            # the positions spread since the grid was sized, a dense grid of cells would be too large. a freshly sized
+            # grid has at most about 2.5 cells per point, so one rebuild is enough
+            self._build()
+            c0, r0, nx, ny = self._extent()
+        if self.arrays is None:
+            keys = np.fromiter(self.points, dtype=np.int64, count=len(self.points))
+            xy = np.array(list(self.points.values()), dtype=float).reshape(-1, 2)
+            ids = (np.floor(xy[:, 0] / self.cell).astype(np.int64) - c0) * ny + \
+                  (np.floor(xy[:, 1] / self.cell).astype(np.int64) - r0)
+            order = np.argsort(ids, kind="stable")
+            starts = np.searchsorted(ids[order], np.arange(nx * ny + 1))
+            self.arrays = (keys[order], xy[order], starts, c0, r0, nx, ny)
+        return self.arrays
+
+    def _extent(self) -> (int, int, int, int):
+        """
+        Returns (first column, first row, columns, rows) of the grid of cells covering the bounding box.
+        """
+        c0, r0 = floor(self.lo[0] / self.cell), floor(self.lo[1] / self.cell)
+        return c0, r0, floor(self.hi[0] / self.cell) - c0 + 1, floor(self.hi[1] / self.cell) - r0 + 1
+
+    def nearest_batch(self, points, k: int = 1):
+        """
+        Returns the k nodes closest to each of many points, computed with NumPy for all the points at once.
+        the nodes of a fixed window of cells around each point are gathered into flat arrays, their distances computed
+        and sorted per point in one go. the (few) points for which the window doesn't prove the answer (not enough
+        nodes in it, or a closer node may lie outside it) are answered by nearest.
+        @param points: a Qx2 array (or a list of (x, y) pairs) of query points
+        @param k: the number of nodes per point (at most the number of nodes in the index)
+        @return: 2 Qxk arrays: the keys of the nodes, the closest first, and their distances
+        """
+        import numpy as np
+        q = np.asarray(points, dtype=float).reshape(-1, 2)
+        k = min(k, len(self.points))
+        n = len(q)
+        if k <= 0 or n == 0:
+            return np.zeros((n, 0), dtype=np.int64), np.zeros((n, 0))
+        keys, xy, starts, c0, r0, nx, ny = self._arrays()
+        cell = self.cell
+        # a window of (2R+1)^2 cells holds about 2k points on average
+        radius = 1 + isqrt(k // PER_CELL) // 2
+        span = np.arange(-radius, radius + 1)
+        qc = np.floor(q[:, 0] / cell).astype(np.int64) - c0
+        qr = np.floor(q[:, 1] / cell).astype(np.int64) - r0
+        cc = np.repeat(qc[:, None] + span, len(span), axis=1)
+        rr = np.tile(qr[:, None] + span, (1, len(span)))
+        valid = (cc >= 0) & (cc < nx) & (rr >= 0) & (rr < ny)
+        ids = np.where(valid, cc * ny + rr, 0)
+        counts = np.where(valid, starts[ids + 1] - starts[ids], 0).ravel()
+        first = starts[ids].ravel()
+        total = counts.reshape(n, -1).sum(axis=1)
+        # the index of every candidate point, and the query it belongs to
+        shift = np.cumsum(counts) - counts
+        cand = np.repeat(first - shift, counts) + np.arange(counts.sum())
+        query = np.repeat(np.arange(n), total)
+        d2 = ((xy[cand] - q[query]) ** 2).sum(axis=1)
+        order = np.lexsort((d2, query))
+        rank = np.arange(len(order)) - np.repeat(np.cumsum(total) - total, total)
+        enough = total >= k
+        chosen = order[(rank < k) & np.repeat(enough, total)]
+        ans_keys = np.zeros((n, k), dtype=np.int64)
+        ans_dist = np.full((n, k), np.inf)
+        ans_keys[enough] = keys[cand[chosen]].reshape(-1, k)
+        ans_dist[enough] = np.sqrt(d2[chosen]).reshape(-1, k)
+        lo_x = (qc + c0 - radius) * cell
+        lo_y = (qr + r0 - radius) * cell
+        hi_x = (qc + c0 + radius + 1) * cell
+        hi_y = (qr + r0 + radius + 1) * cell
+        border = np.minimum(np.minimum(q[:, 0] - lo_x, hi_x - q[:, 0]), np.minimum(q[:, 1] - lo_y, hi_y - q[:, 1]))
+        proven = enough & (border >= 0) & (ans_dist[:, -1] <= border)
+        for i in np.flatnonzero(~proven).tolist():
+            found = self.nearest(q[i, 0], q[i, 1], k)
+            ans_keys[i] = [key for key, _ in found]
+            ans_dist[i] = [d for _, d in found]
+        return ans_keys, ans_dist
+
+
+def _ring(cx: int, cy: int, r: int):
+    """
+    Yields the cells at Chebyshev distance r from the cell (cx, cy).
+    """
+    if r == 0:
+        yield cx, cy
+        return
+    for c in range(cx - r, cx + r + 1):
+        yield c, cy - r
+        yield c, cy + r
+    for row in range(cy - r + 1, cy + r):
+        yield cx - r, row
+        yield cx + r, row
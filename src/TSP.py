@@ -0,0 +1,92 @@
+"""
+This file holds the heuristic used by GraphAlgo.tsp to order the cities of a Travelling Salesman Problem, given the
+matrix of the shortest path distances between them (the graph is directed, so the matrix may not be symmetric).
+1. greedy: nearest neighbour tours are built from each start city and the cheapest one is kept.
+2. 2-opt: the tour is improved by reversing segments of it while that lowers its cost. the cost of each reversed
+   segment is read off prefix sums of the tour's costs in both directions, so each move is checked in O(1).
+the tour is an open path (it doesn't return to its first city).
+"""
+from math import inf
+
+MAX_STARTS = 64
+
+
+def tour_cost(d: list, order: list) -> float:
+    """
+    Returns the cost of visiting the cities in the given order (d is the distance matrix, by city index).
+    """
+    return sum(d[a][b] for a, b in zip(order, order[1:]))
+
+
+def nearest_neighbour(d: list, start: int) -> list:
+    """
+    Returns the greedy tour from start, which always moves to the nearest city not visited yet.
+    """
+    order = [start]
+    left = set(range(len(d))) - {start}
+    while left:
+        row = d[order[-1]]
+        nxt = min(left, key=row.__getitem__)
+        order.append(nxt)
+        left.discard(nxt)
+    return order
+
+
+def _prefix_costs(d: list, order: list) -> (list, list):
+    """
+    Returns fwd, bwd: fwd[t] is the cost of walking order[0..t], bwd[t] the cost of walking it backward.
+    """
+    fwd = [0.0] * len(order)
+    bwd = [0.0] * len(order)
+    for t in range(1, len(order)):
+        fwd[t] = fwd[t - 1] + d[order[t - 1]][order[t]]
+        bwd[t] = bwd[t - 1] + d[order[t]][order[t - 1]]
+    return fwd, bwd
+
+
+def two_opt(d: list, order: list) -> list:
+    """
+    Improves the tour by reversing the segments order[i..j] which lower its cost, until no such segment is left.
+    """
+    k = len(order)
+    improved = True
+    while improved:
+        improved = False
+        fwd, bwd = _prefix_costs(d, order)
+        for i in range(k - 1):
+            for j in range(i + 1, k):
+                # the reversed segment costs bwd instead of fwd, and its ends are connected the other way around
+                delta = (bwd[j] - bwd[i]) - (fwd[j] - fwd[i])
+                if i > 0:
+                    a = d[order[i - 1]]
+                    delta += a[order[j]] - a[order[i]]
+                if j + 1 < k:
+                    b = order[j + 1]
+                    delta += d[order[i]][b] - d[order[j]][b]
+                if delta < -1e-9:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    fwd, bwd = _prefix_costs(d, order)
+                    improved = True
+    return order
+
+
+def tsp_order(d: list) -> (list, float):
+    """
+    Orders the cities of the distance matrix d with the greedy + 2-opt heuristic.
+    @return: The order of the city indices and its cost, the cost is inf if no order with finite cost was found.
+    """
+    k = len(d)
+    if k == 0:
+        return [], inf
+    best = None
+    best_cost = inf
+    for start in range(min(k, MAX_STARTS)):
+        order = nearest_neighbour(d, start)
+        cost = tour_cost(d, order)
+        if cost < best_cost:
+            best = order
+            best_cost = cost
+    if best is None:
+        return list(range(k)), inf
+    best = two_opt(d, best)
+    return best, tour_cost(d, best)